@@ -1,4 +1,5 @@
 from .agents import *
+from .columns import *
 from .entities import *
 from .exceptions import *
 
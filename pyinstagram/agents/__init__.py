@@ -1,6 +1,28 @@
+from .agent_pool import AgentPool
 from .async_mobile_account_agent import AsyncMobileAccountAgent
 from .async_web_account_agent import AsyncWebAccountAgent
 from .async_web_agent import AsyncWebAgent
+from .checkpoints import (
+    CheckpointStore,
+    JSONCheckpointStore,
+    MemoryCheckpointStore,
+    SQLiteCheckpointStore,
+)
+from .connection_pool import ConnectionPool
 from .mobile_account_agent import MobileAccountAgent
 from .web_account_agent import WebAccountAgent
 from .web_agent import WebAgent
+from .pagination import Page
+from .proxies import ProxyRotator
+from .rate_limiter import (
+    Rate,
+    RateLimiter,
+)
+from .response_cache import (
+    MemoryResponseCacheBackend,
+    ResponseCache,
+    ResponseCacheBackend,
+    SQLiteResponseCacheBackend,
+)
+from .retry import RetryPolicy
+from .utils import LoopThread
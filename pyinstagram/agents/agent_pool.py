@@ -0,0 +1,241 @@
+import inspect
+import logging
+import math
+import time
+from typing import (
+    Iterable,
+    Optional,
+)
+
+import aiohttp
+
+from ..exceptions import (
+    CheckpointException,
+    NoAvailableAgentException,
+    RetryException,
+    UnexpectedResponse,
+)
+
+
+class AgentState:
+    __slots__ = ("agent", "active", "requests", "errors", "quarantined_until", "last_error")
+
+    def __init__(self, agent):
+        self.agent = agent
+        self.active = 0
+        self.requests = 0
+        self.errors = 0
+        self.quarantined_until = 0.0
+        self.last_error = None
+
+    @property
+    def healthy(self) -> bool:
+        return self.quarantined_until <= time.monotonic()
+
+    def stats(self) -> dict:
+        return {
+            "active": self.active,
+            "requests": self.requests,
+            "errors": self.errors,
+            "healthy": self.healthy,
+            "last_error": self.last_error,
+        }
+
+
+class AgentPool:
+    THROTTLING_STATUSES = (429,)
+
+    def __init__(self, agents: Iterable = (), checkpoint_quarantine: Optional[float] = None,
+                 throttle_quarantine: float = 300):
+        if not isinstance(checkpoint_quarantine, (int, float)) and \
+                checkpoint_quarantine is not None:
+            raise TypeError("'checkpoint_quarantine' must be int or float type or None")
+        if not isinstance(throttle_quarantine, (int, float)):
+            raise TypeError("'throttle_quarantine' must be int or float type")
+
+        self.checkpoint_quarantine = checkpoint_quarantine
+        self.throttle_quarantine = throttle_quarantine
+        self._states = []
+        self.logger = logging.getLogger(__name__)
+        for agent in agents:
+            self.add(agent)
+
+    def __len__(self):
+        return len(self._states)
+
+    @property
+    def agents(self) -> list:
+        return [state.agent for state in self._states]
+
+    def _get_state(self, agent) -> AgentState:
+        for state in self._states:
+            if state.agent is agent:
+                return state
+        raise ValueError("Agent '%s' is not in pool" % agent)
+
+    def add(self, agent):
+        if not inspect.iscoroutinefunction(getattr(agent, "update", None)):
+            raise TypeError("'agent' must have async 'update' method")
+        if any(state.agent is agent for state in self._states):
+            raise ValueError("Agent '%s' is already in pool" % agent)
+        self._states.append(AgentState(agent))
+
+    def remove(self, agent):
+        self._states.remove(self._get_state(agent))
+
+    def quarantine(self, agent, seconds: Optional[float] = None, error=None):
+        state = self._get_state(agent)
+        state.quarantined_until = math.inf if seconds is None else time.monotonic() + seconds
+        state.last_error = error
+        self.logger.warning("Agent '%s' quarantined: %r", agent, error)
+
+    def release(self, agent):
+        self._get_state(agent).quarantined_until = 0.0
+
+    def get_agent(self, method: str, exclude: Iterable = ()):
+        return self._select(method, exclude).agent
+
+    @staticmethod
+    def _accepts(agent, method: str, args: tuple, kwargs: Optional[dict]) -> bool:
+        function = getattr(agent, method, None)
+        if function is None:
+            return False
+        if kwargs is None:
+            return True
+        try:
+            inspect.signature(function).bind(*args, **kwargs)
+        except TypeError:
+            return False
+        return True
+
+    def _select(self, method: str, exclude: Iterable = (), args: tuple = (),
+                kwargs: Optional[dict] = None) -> AgentState:
+        exclude = tuple(exclude)
+        states = [
+            state for state in self._states
+            if state.healthy and self._accepts(state.agent, method, args, kwargs) and
+            all(state.agent is not agent for agent in exclude)
+        ]
+        if not states:
+            raise NoAvailableAgentException(method)
+        return min(states, key=lambda state: (state.active, state.requests))
+
+    @staticmethod
+    def _get_status(exception: Exception) -> Optional[int]:
+        while exception is not None:
+            if isinstance(exception, (RetryException, aiohttp.ClientResponseError)):
+                return exception.status
+            if isinstance(exception, UnexpectedResponse):
+                exception = exception.exception
+            else:
+                exception = exception.__cause__
+        return None
+
+    def _handle_error(self, state: AgentState, exception: Exception) -> bool:
+        state.errors += 1
+        if isinstance(exception, CheckpointException):
+            self.quarantine(state.agent, self.checkpoint_quarantine, exception)
+            return True
+        if self._get_status(exception) in self.THROTTLING_STATUSES:
+            self.quarantine(state.agent, self.throttle_quarantine, exception)
+            return True
+        state.last_error = exception
+        return False
+
+    def _next(self, method: str, tried: list, error: Optional[Exception], args: tuple = (),
+              kwargs: Optional[dict] = None) -> AgentState:
+        try:
+            state = self._select(method, exclude=tried, args=args, kwargs=kwargs)
+        except NoAvailableAgentException:
+            if error is not None:
+                raise error
+            raise
+        tried.append(state.agent)
+        state.active += 1
+        state.requests += 1
+        return state
+
+    async def call(self, method: str, *args, **kwargs):
+        tried = []
+        error = None
+        while True:
+            state = self._next(method, tried, error, args, kwargs)
+            try:
+                return await getattr(state.agent, method)(*args, **kwargs)
+            except Exception as exception:
+                if not self._handle_error(state, exception):
+                    raise
+                error = exception
+                self.logger.info("Retry '%s' on another agent", method)
+            finally:
+                state.active -= 1
+
+    async def iterate(self, method: str, *args, **kwargs):
+        tried = []
+        error = None
+        arguments = None
+        while True:
+            if arguments is None:
+                state = self._next(method, tried, error, args, kwargs)
+            else:
+                state = self._next(method, tried, error, kwargs=arguments)
+            try:
+                function = getattr(state.agent, method)
+                if arguments is None:
+                    bound = inspect.signature(function).bind(*args, **kwargs)
+                    bound.apply_defaults()
+                    arguments = bound.arguments
+                async for page in function(**arguments):
+                    yield page
+                    if page.pointer is None:
+                        return
+                    arguments["pointer"] = page.pointer
+                    arguments["count"] -= len(page)
+                return
+            except Exception as exception:
+                if not self._handle_error(state, exception):
+                    raise
+                error = exception
+                self.logger.info("Resume '%s' on another agent", method)
+            finally:
+                state.active -= 1
+
+    async def update(self, *args, **kwargs):
+        return await self.call("update", *args, **kwargs)
+
+    async def get_media(self, *args, **kwargs):
+        return await self.call("get_media", *args, **kwargs)
+
+    async def get_likes(self, *args, **kwargs):
+        return await self.call("get_likes", *args, **kwargs)
+
+    async def get_comments(self, *args, **kwargs):
+        return await self.call("get_comments", *args, **kwargs)
+
+    async def get_follows(self, *args, **kwargs):
+        return await self.call("get_follows", *args, **kwargs)
+
+    async def get_followers(self, *args, **kwargs):
+        return await self.call("get_followers", *args, **kwargs)
+
+    def iter_media(self, *args, **kwargs):
+        return self.iterate("iter_media", *args, **kwargs)
+
+    def iter_likes(self, *args, **kwargs):
+        return self.iterate("iter_likes", *args, **kwargs)
+
+    def iter_comments(self, *args, **kwargs):
+        return self.iterate("iter_comments", *args, **kwargs)
+
+    def iter_follows(self, *args, **kwargs):
+        return self.iterate("iter_follows", *args, **kwargs)
+
+    def iter_followers(self, *args, **kwargs):
+        return self.iterate("iter_followers", *args, **kwargs)
+
+    def stats(self) -> dict:
+        return {repr(state.agent): state.stats() for state in self._states}
+
+    async def close(self):
+        for state in self._states:
+            await state.agent.close()
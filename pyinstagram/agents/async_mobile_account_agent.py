@@ -1,9 +1,14 @@
+import asyncio
 import datetime
 import hashlib
 import hmac
 import json
 import random
-from typing import Optional
+import time
+from typing import (
+    Optional,
+    Union,
+)
 from urllib.parse import (
     urljoin,
     urlparse,
@@ -12,6 +17,12 @@ import uuid
 
 import aiohttp
 
+from . import decoders
+from .connection_pool import (
+    ConnectionPool,
+    create_session,
+)
+from .proxies import ProxyRotator
 from .utils import sync
 from ..entities import (
     Account,
@@ -66,8 +77,17 @@ class AsyncMobileAccountAgent(Account):
             phone_manufacturer: Optional[str] = None,
             phone_model: Optional[str] = None,
             phone_resoulution: Optional[str] = None,
+            session: Optional[aiohttp.ClientSession] = None,
+            connector: Union[aiohttp.BaseConnector, ConnectionPool, None] = None,
+            keep_alive: bool = False,
+            proxy: Union[str, ProxyRotator, None] = None,
     ):
-        self._session = aiohttp.ClientSession()
+        if not isinstance(keep_alive, bool):
+            raise TypeError("'keep_alive' must be bool type")
+        if not isinstance(proxy, (str, ProxyRotator)) and proxy is not None:
+            raise TypeError("'proxy' must be str or ProxyRotator type or None")
+
+        self._session, self._session_owner = create_session(session=session, connector=connector)
 
         self.username = username
         self._api_url = self.API_URL if api_url is None else api_url
@@ -93,6 +113,13 @@ class AsyncMobileAccountAgent(Account):
             self._phone_resolution = self.PHONE_RESOLUTION
         else:
             self._phone_resolution = phone_resoulution
+        self._keep_alive = keep_alive
+        self._proxy = proxy
+        self._static_headers = None
+
+    async def close(self):
+        if self._session_owner and not self._session.closed:
+            await self._session.close()
 
     def get_user_agent(self):
         return self.USER_AGENT_FORMAT.format(
@@ -108,22 +135,31 @@ class AsyncMobileAccountAgent(Account):
             version_code=self._version_code,
         )
 
+    def get_static_headers(self):
+        if self._static_headers is None:
+            self._static_headers = {
+                "User-Agent": self.get_user_agent(),
+                "Connection": "keep-alive" if self._keep_alive else "close",
+                "Accept": "*/*",
+                "Accept-Language": "en-US",
+                "Accept-Encoding": "gzip, deflate",
+                "X-IG-Capabilities": self._ig_capabilities,
+                "X-IG-Connection-Type": "WIFI",
+                "X-IG-App-ID": self._application_id,
+                "X-IG-Bandwidth-Speed-KBPS": "-1.000",
+                "X-IG-Bandwidth-TotalBytes-B": "0",
+                "X-IG-Bandwidth-TotalTime-MS": "0",
+                "X-FB-HTTP-Engine": self._fb_engine_http,
+            }
+        return self._static_headers
+
+    def reset_static_headers(self):
+        self._static_headers = None
+
     def get_default_headers(self):
-        return {
-            "User-Agent": self.get_user_agent(),
-            "Connection": "close",
-            "Accept": "*/*",
-            "Accept-Language": "en-US",
-            "Accept-Encoding": "gzip, deflate",
-            "X-IG-Capabilities": self._ig_capabilities,
-            "X-IG-Connection-Type": "WIFI",
-            "X-IG-Connection-Speed": "{0:d}kbps".format(random.randint(1000, 5000)),
-            "X-IG-App-ID": self._application_id,
-            "X-IG-Bandwidth-Speed-KBPS": "-1.000",
-            "X-IG-Bandwidth-TotalBytes-B": "0",
-            "X-IG-Bandwidth-TotalTime-MS": "0",
-            "X-FB-HTTP-Engine": self._fb_engine_http,
-        }
+        headers = self.get_static_headers().copy()
+        headers["X-IG-Connection-Speed"] = "{0:d}kbps".format(random.randint(1000, 5000))
+        return headers
 
     def get_cookie_value(self, key: str):
         now = int(datetime.datetime.now().timestamp())
@@ -182,9 +218,27 @@ class AsyncMobileAccountAgent(Account):
         headers = self.get_default_headers()
         headers.update(tmp)
 
-        response = await self._session.post(url=url, data=data, params=params, headers=headers,
-                                            *args, **kwargs)
-        return await response.json()
+        if "proxy" not in kwargs:
+            if isinstance(self._proxy, ProxyRotator):
+                kwargs["proxy"] = self._proxy.get(self.username)
+            elif self._proxy is not None:
+                kwargs["proxy"] = self._proxy
+
+        started_at = time.monotonic()
+        try:
+            response = await self._session.post(url=url, data=data, params=params,
+                                                headers=headers, *args, **kwargs)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            if isinstance(self._proxy, ProxyRotator):
+                self._proxy.report(kwargs["proxy"], time.monotonic() - started_at, error=True)
+            raise
+        if isinstance(self._proxy, ProxyRotator):
+            self._proxy.report(
+                kwargs["proxy"],
+                time.monotonic() - started_at,
+                error=response.status == 429 or response.status >= 500,
+            )
+        return await response.json(loads=decoders.loads)
 
     async def login(self, password: str):
         await self._request(
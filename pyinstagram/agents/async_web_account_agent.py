@@ -1,20 +1,74 @@
-import json
-from typing import Optional
+from typing import (
+    Optional,
+    Union,
+)
+from urllib.parse import urljoin
+
+import aiohttp
 
+from . import decoders
 from .async_web_agent import AsyncWebAgent
+from .checkpoints import (
+    CheckpointStore,
+    get_entity_key,
+)
+from .connection_pool import ConnectionPool
+from .proxies import ProxyRotator
+from .rate_limiter import RateLimiter
+from .response_cache import ResponseCache
+from .retry import RetryPolicy
+from .pagination import Pagination
+from ..columns import (
+    AccountColumns,
+    MediaColumns,
+)
 from ..entities import (
     Account,
+    Comment,
     HasMediaEntity,
+    Media,
+    Story,
+)
+from ..exceptions import (
+    AuthException,
+    CheckpointException,
+    UnexpectedResponse,
 )
 
 
 class AsyncWebAccountAgent(Account, AsyncWebAgent):
-    def __init__(self, username: str, cookies=None):
+    def __init__(self, username: str, cookies=None, prefetch: int = 0, stream: bool = False,
+                 session: Optional[aiohttp.ClientSession] = None,
+                 connector: Union[aiohttp.BaseConnector, ConnectionPool, None] = None,
+                 rate_limiter: Optional[RateLimiter] = None, ip: Optional[str] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 checkpoints: Optional[CheckpointStore] = None,
+                 response_cache: Optional[ResponseCache] = None,
+                 proxy: Union[str, ProxyRotator, None] = None,
+                 api_url: Optional[str] = None, lazy: bool = False):
         if not isinstance(username, str):
             raise TypeError("'username' must be str type")
 
         Account.__init__(self, username)
-        AsyncWebAgent.__init__(self, cookies=cookies)
+        AsyncWebAgent.__init__(
+            self,
+            cookies=cookies,
+            prefetch=prefetch,
+            stream=stream,
+            session=session,
+            connector=connector,
+            rate_limiter=rate_limiter,
+            ip=ip,
+            retry_policy=retry_policy,
+            checkpoints=checkpoints,
+            response_cache=response_cache,
+            proxy=proxy,
+            api_url=api_url,
+            lazy=lazy,
+        )
+
+    def _get_rate_limit_account(self) -> Optional[str]:
+        return self.username
 
     async def login(self, password: str, settings: Optional[dict] = None):
         if not isinstance(password, str):
@@ -39,13 +93,11 @@ class AsyncWebAccountAgent(Account, AsyncWebAgent):
             settings["data"] = {}
         settings["data"].update({"username": self.username, "password": password})
 
-        response = await self._post_request(
-            path="/accounts/login/ajax/",
-            **settings,
-        )
+        path = "/accounts/login/ajax/"
+        response = await self._post_request(path=path, **settings)
 
         try:
-            data = await response.json()
+            data = decoders.loads(response)
             if data.get("authenticated") is False:
                 raise AuthException(self.username)
             elif data.get("message") == "checkpoint_required":
@@ -61,19 +113,15 @@ class AsyncWebAccountAgent(Account, AsyncWebAgent):
                 )
         except (ValueError, KeyError) as exception:
             self.logger.exception("Auth was unsuccessfully")
-            raise UnexpectedResponse(exception, response.url)
+            raise UnexpectedResponse(exception, urljoin(self.API_URL, path))
         self.logger.debug("Auth was successfully")
 
     async def checkpoint_handle(self, path, settings=None):
         self.logger.debug("Handle checkpoint page for '%s' started", self)
 
-        response = await self.get_request(path=path, **settings)
+        response = await self._get_request(path=path, **settings)
         try:
-            match = re.search(
-                r"<script[^>]*>\s*window._sharedData\s*=\s*((?!<script>).*)\s*;\s*</script>",
-                await response.text(),
-            )
-            data = json.loads(match.group(1))
+            data = self._get_shared_data(response)
             data = data["entry_data"]["Challenge"][0]
 
             navigation = {
@@ -88,14 +136,14 @@ class AsyncWebAccountAgent(Account, AsyncWebAgent):
                 types.append({"label": d["label"].lower().split(":")[0], "value": d["value"]})
             self.logger.debug("Handle checkpoint page for '%s' was successfull")
             return {"navigation": navigation, "types": types}
-        except (AttributeError, KeyError, ValueError) as exception:
+        except (AttributeError, KeyError, TypeError, ValueError) as exception:
             self.logger.exception("Handle checkpoint page for '%s' was unsuccessfull", self)
-            raise UnexpectedResponse(exception, response.url)
+            raise UnexpectedResponse(exception, urljoin(self.API_URL, path))
 
     async def checkpoint_send(self, checkpoint_path, forward_path, choice, settings=None):
         self.logger.debug("Send verify code for '%s' started", self)
 
-        response = await self.action_request(
+        response = await self._action_request(
             path=forward_path,
             referer_path=checkpoint_path,
             data={"choice": choice},
@@ -103,37 +151,37 @@ class AsyncWebAccountAgent(Account, AsyncWebAgent):
         )
 
         try:
-            navigation = (await response.json())["navigation"]
+            navigation = decoders.loads(response)["navigation"]
             self.logger.debug("Send verify code for '%s' was successfully", self)
             return {
                 key: urljoin(self.API_URL, value) for key, value in navigation.items()
             }
         except (ValueError, KeyError) as exception:
             self.logger.exception("Send verify code by %s to '%s' was unsuccessfully", type, self)
-            raise UnexpectedResponse(exception, response.url)
+            raise UnexpectedResponse(exception, urljoin(self.API_URL, forward_path))
 
     async def checkpoint_replay(self, forward_path, replay_path, settings=None):
         self.logger.debug("Resend verify code for '%s' started", self)
 
-        response = await self.action_request(
+        response = await self._action_request(
             path=replay_path,
             referer_path=forward_path,
             settings=settings,
         )
         try:
-            navigation = (await response.json())["navigation"]
+            navigation = decoders.loads(response)["navigation"]
             self.logger.debug("Resend verify code for '%s' was successfull", self)
             return {
                 key: urljoin(self.API_URL, value) for key, value in navigation.items()
             }
         except (AttributeError, KeyError, ValueError) as exception:
             self.logger.exception("Resend verify code for '%s' was unsuccessfull", self)
-            raise UnexpectedResponse(exception, response.url)
+            raise UnexpectedResponse(exception, urljoin(self.API_URL, replay_path))
 
     async def checkpoint(self, path, code, settings=None):
         self.logger.debug("Verify account '%s' started", self)
 
-        response = await self.action_request(
+        response = await self._action_request(
             path=path,
             referer_path=path,
             data={"security_code": code},
@@ -141,97 +189,134 @@ class AsyncWebAccountAgent(Account, AsyncWebAgent):
         )
 
         try:
-            result = (await response.json())["status"] == "ok"
+            result = decoders.loads(response)["status"] == "ok"
             self.logger.debug("Verify account '%s' was successfull", self)
             return result
         except (AttributeError, KeyError, ValueError) as exception:
             self.logger.exception("Verify account '%s' was unsuccessfull", self)
-            raise UnexpectedResponse(exception, response.url)
+            raise UnexpectedResponse(exception, urljoin(self.API_URL, path))
 
-    async def update(self, entity=None, settings=None):
+    async def update(self, entity=None, settings=None, fields=None):
         if entity is None:
             entity = self
-        return await AsyncWebAgent.update(self, entity=entity, settings=settings)
+        return await AsyncWebAgent.update(self, entity=entity, settings=settings, fields=fields)
 
-    async def get_media(self, entity=None, pointer=None, count=12, limit=12, delay=0,
-                        settings=None):
+    async def iter_media(self, entity=None, pointer=None, count=12, limit=12, delay=0,
+                         settings=None, columnar=False, fields=None, records=False):
         if entity is None:
             entity = self
-        return await AsyncWebAgent.get_media(self, entity=entity, pointer=pointer, count=count,
-                                             limit=limit, delay=delay, settings=settings)
+        async for page in AsyncWebAgent.iter_media(self, entity=entity, pointer=pointer,
+                                                   count=count, limit=limit, delay=delay,
+                                                   settings=settings, columnar=columnar,
+                                                   fields=fields, records=records):
+            yield page
 
-    async def get_follows(self, account=None, pointer=None, count=20, limit=50, delay=0,
-                          settings=None):
-        if not isinstance(account, Account):
+    async def get_media(self, entity=None, pointer=None, count=12, limit=12, delay=0,
+                        settings=None, columnar=False, fields=None, records=False):
+        return await self._collect_pages(self.iter_media(
+            entity=entity,
+            pointer=pointer,
+            count=count,
+            limit=limit,
+            delay=delay,
+            settings=settings,
+            columnar=columnar,
+            fields=fields,
+            records=records,
+        ), result=MediaColumns() if columnar else None)
+
+    def _relations_pagination(self, account, query_hash, edge, relations, counter, fields=None,
+                              records=False):
+        def variables(after, first):
+            if after is None:
+                return '{{"id":"{id}","first":{first}}}'.format(id=account.id, first=first)
+            return '{{"id":"{id}","first":{first},"after":"{after}"}}'.format(
+                id=account.id,
+                first=first,
+                after=after,
+            )
+
+        parse_account = self._get_account_parser(fields, records)
+
+        def parse(node):
+            a = parse_account(node)
+            relations.add(a)
+            return a
+
+        def on_data(data):
+            setattr(account, counter, data["count"])
+
+        return Pagination(
+            query_hash=query_hash,
+            variables=variables,
+            referer_path=urljoin(account.web_base_path, getattr(account, account.primary_key)),
+            data_path=("data", "user", edge),
+            parse=parse,
+            on_data=on_data,
+            columns=AccountColumns,
+            key=get_entity_key(account),
+            records=Account,
+        )
+
+    async def iter_follows(self, account=None, pointer=None, count=20, limit=50, delay=0,
+                           settings=None, columnar=False, fields=None, records=False):
+        if not isinstance(account, Account) and account is not None:
             raise TypeError("'account' must be Account type or None")
         if not isinstance(pointer, str) and pointer is not None:
             raise TypeError("'pointer' must be str type or None")
         if not isinstance(count, int):
             raise TypeError("'count' must be int type")
-        if not isinstance(count, int):
+        if not isinstance(limit, int):
             raise TypeError("'limit' must be int type")
         if not isinstance(delay, (int, float)):
             raise TypeError("'delay' must be int or float type")
-
-        self.logger.debug("Get '%s' follows started", account)
+        if not isinstance(columnar, bool):
+            raise TypeError("'columnar' must be bool type")
 
         if account is None:
             account = self
+
+        self.logger.debug("Get '%s' follows started", account)
+
         if account.id is None:
             await self.update(account, settings=settings)
 
-        if pointer is None:
-            variables_string = '{{"id":"{id}","first":{first}}}'
-        else:
-            variables_string = '{{"id":"{id}","first":{first},"after":"{after}"}}'
-        follows = []
-
-        while True:
-            data = {"first": min(limit, count), "id": account.id}
-            if pointer is not None:
-                data["after"] = pointer
-
-            response = await self.graphql_request(
-                query_hash="58712303d941c6855d4e888c5f0cd22f",
-                variables=variables_string.format(**data),
-                referer_path=urljoin(account.web_base_path, getattr(account, account.primary_key)),
-                settings=settings,
-            )
+        pagination = self._relations_pagination(
+            account=account,
+            query_hash="58712303d941c6855d4e888c5f0cd22f",
+            edge="edge_follow",
+            relations=account.follows,
+            counter="follows_count",
+            fields=fields,
+            records=records,
+        )
+        async for page in self._iter_pages(pagination, pointer=pointer, count=count,
+                                           limit=limit, delay=delay, settings=settings,
+                                           columnar=columnar, fields=fields,
+                                           records=records):
+            yield page
 
-            try:
-                data = json.loads(response)["data"]["user"]["edge_follow"]
-                edges = data["edges"]
-                page_info = data["page_info"]
-                account.follows_count = data["count"]
-
-                for index in range(min(len(edges), count)):
-                    node = edges[index]["node"]
-                    a = Account(node["username"])
-                    a.id = node["id"]
-                    a.profile_pic_url = node["profile_pic_url"]
-                    a.is_verified = node["is_verified"]
-                    a.full_name = node["full_name"]
-                    account.follows.add(a)
-                    follows.append(a)
-
-                pointer = page_info["end_cursor"] if page_info["has_next_page"] else None
-
-                if len(edges) < count and page_info["has_next_page"]:
-                    count = count - len(edges)
-                    variables_string = '{{"id":"{id}","first":{first},"after":"{after}"}}'
-                    await asyncio.sleep(delay)
-                else:
-                    self.logger.debug("Get '%s' follows was successfully", account)
-                    return follows, pointer
-            except (ValueError, KeyError) as exception:
-                self.logger.exception("Get '%s' follows was unsuccessfully", account)
-                raise UnexpectedResponse(exception, response.url)
+        self.logger.debug("Get '%s' follows was successfully", account)
 
-    async def get_followers(self, account=None, pointer=None, count=20, limit=50, delay=0,
-                            settings=None):
-        if not isinstance(account, Account):
+    async def get_follows(self, account=None, pointer=None, count=20, limit=50, delay=0,
+                          settings=None, columnar=False, fields=None, records=False):
+        return await self._collect_pages(self.iter_follows(
+            account=account,
+            pointer=pointer,
+            count=count,
+            limit=limit,
+            delay=delay,
+            settings=settings,
+            columnar=columnar,
+            fields=fields,
+            records=records,
+        ), result=AccountColumns() if columnar else None)
+
+    async def iter_followers(self, account=None, pointer=None, count=20, limit=50, delay=0,
+                             settings=None, columnar=False, fields=None, records=False):
+        if not isinstance(account, Account) and account is not None:
             raise TypeError("'account' must be Account type or None")
-        if not isinstance(pointer, str) and not pointer is None:
+        if not isinstance(pointer, str) and pointer is not None:
             raise TypeError("'pointer' must be str type or None")
         if not isinstance(count, int):
             raise TypeError("'count' must be int type")
@@ -239,63 +324,50 @@ class AsyncWebAccountAgent(Account, AsyncWebAgent):
             raise TypeError("'limit' must be int type")
         if not isinstance(delay, (int, float)):
             raise TypeError("'delay' must be int or float type")
-
-        self.logger.debug("Get '%s' followers started", account)
+        if not isinstance(columnar, bool):
+            raise TypeError("'columnar' must be bool type")
 
         if account is None:
             account = self
+
+        self.logger.debug("Get '%s' followers started", account)
+
         if account.id is None:
             await self.update(account, settings=settings)
 
-        if pointer is None:
-            variables_string = '{{"id":"{id}","first":{first}}}'
-        else:
-            variables_string = '{{"id":"{id}","first":{first},"after":"{after}"}}'
-        followers = []
-
-        while True:
-            data = {"first": min(limit, count), "id": account.id}
-            if pointer is not None:
-                data["after"] = pointer
-
-            response = await self.graphql_request(
-                query_hash="37479f2b8209594dde7facb0d904896a",
-                variables=variables_string.format(**data),
-                referer_path=urljoin(account.web_base_path, getattr(account, account.primary_key)),
-                settings=settings,
-            )
+        pagination = self._relations_pagination(
+            account=account,
+            query_hash="37479f2b8209594dde7facb0d904896a",
+            edge="edge_followed_by",
+            relations=account.followers,
+            counter="followers_count",
+            fields=fields,
+            records=records,
+        )
+        async for page in self._iter_pages(pagination, pointer=pointer, count=count,
+                                           limit=limit, delay=delay, settings=settings,
+                                           columnar=columnar, fields=fields,
+                                           records=records):
+            yield page
 
-            try:
-                data = (await response.json())["data"]["user"]["edge_followed_by"]
-                edges = data["edges"]
-                page_info = data["page_info"]
-                account.followers_count = data["count"]
-
-                for index in range(min(len(edges), count)):
-                    node = edges[index]["node"]
-                    a = Account(node["username"])
-                    a.id = node["id"]
-                    a.profile_pic_url = node["profile_pic_url"]
-                    a.is_verified = node["is_verified"]
-                    a.full_name = node["full_name"]
-                    account.followers.add(a)
-                    followers.append(a)
-
-                pointer = page_info["end_cursor"] if page_info["has_next_page"] else None
-
-                if len(edges) < count and page_info["has_next_page"]:
-                    count = count - len(edges)
-                    variables_string = '{{"id":"{id}","first":{first},"after":"{after}"}}'
-                    await asyncio.sleep(delay)
-                else:
-                    self.logger.debug("Get '%s' followers was successfully", account)
-                    return followers, pointer
-            except (ValueError, KeyError) as exception:
-                self.logger.exception("Get '%s' followers was unsuccessfully", account)
-                raise UnexpectedResponse(exception, response.url)
+        self.logger.debug("Get '%s' followers was successfully", account)
+
+    async def get_followers(self, account=None, pointer=None, count=20, limit=50, delay=0,
+                            settings=None, columnar=False, fields=None, records=False):
+        return await self._collect_pages(self.iter_followers(
+            account=account,
+            pointer=pointer,
+            count=count,
+            limit=limit,
+            delay=delay,
+            settings=settings,
+            columnar=columnar,
+            fields=fields,
+            records=records,
+        ), result=AccountColumns() if columnar else None)
 
     async def stories(self, settings=None):
-        response = await self.graphql_request(
+        response = await self._graphql_request(
             query_hash="60b755363b5c230111347a7a4e242001",
             variables='{"only_stories":true}',
             referer_path=urljoin(self.web_base_path, getattr(self, self.primary_key)),
@@ -304,17 +376,19 @@ class AsyncWebAccountAgent(Account, AsyncWebAgent):
 
         self.logger.debug("Get stories started")
 
+        path = "/graphql/query/"
         try:
-            data = (await response.json())["data"]["user"]["feed_reels_tray"]
+            data = decoders.loads(response)["data"]["user"]["feed_reels_tray"]
             data = data["edge_reels_tray_to_reel"]
             result = [Story(edge["node"]["id"]) for edge in data["edges"]]
             self.logger.debug("Get stories was successfully")
             return result
         except (ValueError, KeyError) as exception:
             self.logger.exception("Get stories was unsuccessfully")
-            raise UnexpectedResponse(exception, response.url)
+            raise UnexpectedResponse(exception, urljoin(self.API_URL, path))
 
-    async def feed(self, pointer=None, count=12, limit=50, delay=0, settings=None):
+    async def iter_feed(self, pointer=None, count=12, limit=50, delay=0, settings=None,
+                        columnar=False, fields=None, records=False):
         if not isinstance(pointer, str) and pointer is not None:
             raise TypeError("'pointer' must be str type or None")
         if not isinstance(count, int):
@@ -323,50 +397,54 @@ class AsyncWebAccountAgent(Account, AsyncWebAgent):
             raise TypeError("'limit' must be int type")
         if not isinstance(delay, (int, float)):
             raise TypeError("'delay' must be int or float type")
+        if not isinstance(columnar, bool):
+            raise TypeError("'columnar' must be bool type")
+
+        if fields is not None and not records:
+            fields = Media.get_web_fields(fields)
 
         self.logger.debug("Get feed started")
 
         variables_string = '{{"fetch_media_item_count":{first},"fetch_media_item_cursor":"{after}",\
             "fetch_comment_count":4,"fetch_like":10,"has_stories":false}}'
-        feed = []
-
-        while True:
-            response = await self.graphql_request(
-                query_hash="485c25657308f08317c1e4b967356828",
-                variables=variables_string.format(
-                    after=pointer,
-                    first=min(limit, count),
-                ) if pointer else "{}",
-                referer_path=urljoin(self.web_base_path, getattr(self, self.post_request)),
-                settings=settings,
-            )
 
-            try:
-                data = (await response.json())["data"]["user"]["edge_web_feed_timeline"]
-                edges = data["edges"]
-                page_info = data["page_info"]
-                length = len(edges)
-
-                for index in range(min(length, count)):
-                    node = edges[index]["node"]
-                    if "shortcode" not in node:
-                        length -= 1
-                        continue
-                    m = Media(node["shortcode"])
-                    m.set_web_data(node)
-                    feed.append(m)
-
-                pointer = page_info["end_cursor"] if page_info["has_next_page"] else None
-
-                if length < count and page_info["has_next_page"]:
-                    count -= length
-                    await asyncio.sleep(delay)
-                else:
-                    self.logger.debug("Get feed was successfully")
-                    return feed, pointer
-            except (ValueError, KeyError) as exception:
-                self.logger.exception("Get feed was unsuccessfully")
-                raise UnexpectedResponse(exception, response.url)
+        def parse(node):
+            return Media.from_web_data(node, lazy=self.lazy, fields=fields)
+
+        pagination = Pagination(
+            query_hash="485c25657308f08317c1e4b967356828",
+            variables=lambda after, first: variables_string.format(
+                after=after,
+                first=first,
+            ) if after else "{}",
+            referer_path=urljoin(self.web_base_path, getattr(self, self.primary_key)),
+            data_path=("data", "user", "edge_web_feed_timeline"),
+            parse=parse,
+            node_filter=lambda node: "shortcode" in node,
+            columns=MediaColumns,
+            key=get_entity_key(self),
+            records=Media,
+        )
+        async for page in self._iter_pages(pagination, pointer=pointer, count=count,
+                                           limit=limit, delay=delay, settings=settings,
+                                           columnar=columnar, fields=fields,
+                                           records=records):
+            yield page
+
+        self.logger.debug("Get feed was successfully")
+
+    async def feed(self, pointer=None, count=12, limit=50, delay=0, settings=None,
+                   columnar=False, fields=None, records=False):
+        return await self._collect_pages(self.iter_feed(
+            pointer=pointer,
+            count=count,
+            limit=limit,
+            delay=delay,
+            settings=settings,
+            columnar=columnar,
+            fields=fields,
+            records=records,
+        ), result=MediaColumns() if columnar else None)
 
     async def like(self, media, settings=None):
         if not isinstance(media, Media):
@@ -377,19 +455,20 @@ class AsyncWebAccountAgent(Account, AsyncWebAgent):
         if media.id is None:
             await self.update(media, settings=settings)
 
-        response = await self.action_request(
-            path=f"/web/likes/{media.id}/like/",
+        path = f"/web/likes/{media.id}/like/"
+        response = await self._action_request(
+            path=path,
             referer_path=urljoin(media.web_base_path, media.code),
             settings=settings,
         )
 
         try:
-            result = (await response.json())["status"] == "ok"
+            result = decoders.loads(response)["status"] == "ok"
             self.logger.debug("Like '%s' was successfully", media)
             return result
         except (ValueError, KeyError) as exception:
             self.logger.exception("Like '%s' was unsuccessfully", media)
-            raise UnexpectedResponse(exception, response.url)
+            raise UnexpectedResponse(exception, urljoin(self.API_URL, path))
 
     async def unlike(self, media, settings=None):
         if not isinstance(media, Media):
@@ -400,19 +479,20 @@ class AsyncWebAccountAgent(Account, AsyncWebAgent):
         if media.id is None:
             await self.update(media, settings=settings)
 
-        response = await self.action_request(
-            path=f"/web/likes/{media.id}/unlike/",
+        path = f"/web/likes/{media.id}/unlike/"
+        response = await self._action_request(
+            path=path,
             referer_path=urljoin(media.web_base_path, media.code),
             settings=settings,
         )
 
         try:
-            result = (await response.json())["status"] == "ok"
+            result = decoders.loads(response)["status"] == "ok"
             self.logger.debug("Like '%s' was successfully", media)
             return result
         except (ValueError, KeyError) as exception:
             self.logger.exception("Like '%s' was unsuccessfully", media)
-            raise UnexpectedResponse(exception, response.url)
+            raise UnexpectedResponse(exception, urljoin(self.API_URL, path))
 
     async def save(self, media, settings=None):
         if not isinstance(media, Media):
@@ -423,19 +503,20 @@ class AsyncWebAccountAgent(Account, AsyncWebAgent):
         if media.id is None:
             await self.update(media, settings=settings)
 
-        response = await self.action_request(
-            path=f"/web/save/{media.id}/save/",
+        path = f"/web/save/{media.id}/save/"
+        response = await self._action_request(
+            path=path,
             referer_path=urljoin(media.web_base_path, media.code),
             settings=settings,
         )
 
         try:
-            result = (await response.json())["status"] == "ok"
+            result = decoders.loads(response)["status"] == "ok"
             self.logger.debug("Save '%s' was successfully", media)
             return result
         except (ValueError, KeyError) as exception:
             self.logger.exception("Save '%s' was unsuccessfully", media)
-            raise UnexpectedResponse(exception, response.url)
+            raise UnexpectedResponse(exception, urljoin(self.API_URL, path))
 
     async def unsave(self, media, settings=None):
         if not isinstance(media, Media):
@@ -446,19 +527,20 @@ class AsyncWebAccountAgent(Account, AsyncWebAgent):
         if media.id is None:
             await self.update(media, settings=settings)
 
-        response = await self.action_request(
+        path = f"/web/save/{media.id}/unsave/"
+        response = await self._action_request(
             referer_path=urljoin(media.web_base_path, media.code),
-            path=f"/web/save/{media.id}/unsave/",
+            path=path,
             settings=settings,
         )
 
         try:
-            result = (await response.json())["status"] == "ok"
+            result = decoders.loads(response)["status"] == "ok"
             self.logger.debug("Unsave '%s' was successfully", media)
             return result
         except (ValueError, KeyError) as exception:
             self.logger.exception("Unsave '%s' was unsuccessfully", media)
-            raise UnexpectedResponse(exception, response.url)
+            raise UnexpectedResponse(exception, urljoin(self.API_URL, path))
 
     async def add_comment(self, media, text, settings=None):
         if not isinstance(media, Media):
@@ -471,15 +553,16 @@ class AsyncWebAccountAgent(Account, AsyncWebAgent):
         if media.id is None:
             await self.update(media, settings=settings)
 
-        response = await self.action_request(
+        path = f"/web/comments/{media.id}/add/"
+        response = await self._action_request(
             referer_path=urljoin(media.web_base_path, media.code),
-            path=f"/web/comments/{media.id}/add/",
+            path=path,
             data={"comment_text": text},
             settings=settings,
         )
 
         try:
-            data = await response.json()
+            data = decoders.loads(response)
             if data["status"] == "ok":
                 comment = Comment(
                     data["id"],
@@ -494,7 +577,7 @@ class AsyncWebAccountAgent(Account, AsyncWebAgent):
             return comment
         except (ValueError, KeyError) as exception:
             self.logger.exception("Comment '%s' was unsuccessfully", media)
-            raise UnexpectedResponse(exception, response.url)
+            raise UnexpectedResponse(exception, urljoin(self.API_URL, path))
 
     async def delete_comment(self, comment, settings=None):
         if not isinstance(comment, Comment):
@@ -505,21 +588,22 @@ class AsyncWebAccountAgent(Account, AsyncWebAgent):
         if comment.media.id is None:
             await self.update(comment.media, settings=settings)
 
-        response = await self.action_request(
+        path = f"/web/comments/{comment.media.id}/delete/{comment.id}/"
+        response = await self._action_request(
             referer_path=urljoin(comment.media.web_base_path, comment.media.code),
-            path=f"/web/comments/{comment.media.id}/delete/{comment.id}/",
+            path=path,
             settings=settings,
         )
 
         try:
-            result = (await response.json())["status"] == "ok"
+            result = decoders.loads(response)["status"] == "ok"
             if result:
                 del comment
             self.logger.debug("Delete comment '%s' was successfully", comment)
             return result
         except (ValueError, KeyError) as exception:
             self.logger.exception("Delete comment '%s' was unsuccessfully", comment)
-            raise UnexpectedResponse(exception, response.url)
+            raise UnexpectedResponse(exception, urljoin(self.API_URL, path))
 
     async def follow(self, account, settings=None):
         if not isinstance(account, Account):
@@ -530,19 +614,21 @@ class AsyncWebAccountAgent(Account, AsyncWebAgent):
         if account.id is None:
             await self.update(account, settings=settings)
 
-        response = await self.action_request(
-            path=f"/web/friendships/{account.id}/follow/",
+        path = f"/web/friendships/{account.id}/follow/"
+        response = await self._action_request(
+            path=path,
             referer_path=urljoin(account.web_base_path, account.username),
             settings=settings,
         )
+        self.invalidate(self)
 
         try:
-            result = (await response.json())["status"] == "ok"
+            result = decoders.loads(response)["status"] == "ok"
             self.logger.debug("Follow to '%s' was successfully", account)
             return result
         except (ValueError, KeyError) as exception:
             self.logger.exception("Follow to '%s' was unsuccessfully", account)
-            raise UnexpectedResponse(exception, response.url)
+            raise UnexpectedResponse(exception, urljoin(self.API_URL, path))
 
     async def unfollow(self, account, settings=None):
         if not isinstance(account, Account):
@@ -553,16 +639,18 @@ class AsyncWebAccountAgent(Account, AsyncWebAgent):
         if account.id is None:
             await self.update(account, settings=settings)
 
-        response = await self.action_request(
-            path=f"/web/friendships/{account.id}/unfollow/",
+        path = f"/web/friendships/{account.id}/unfollow/"
+        response = await self._action_request(
+            path=path,
             referer_path=urljoin(account.web_base_path, account.username),
             settings=settings,
         )
+        self.invalidate(self)
 
         try:
-            result = (await response.json())["status"] == "ok"
+            result = decoders.loads(response)["status"] == "ok"
             self.logger.debug("Unfollow to '%s' was successfully", account)
             return result
         except (ValueError, KeyError) as exception:
             self.logger.exception("Unfollow to '%s' was unsuccessfully", account)
-            raise UnexpectedResponse(exception, response.url)
+            raise UnexpectedResponse(exception, urljoin(self.API_URL, path))
@@ -1,17 +1,54 @@
 import asyncio
+import codecs
 import hashlib
-import json
 import logging
-import re
+import time
 from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
     List,
     Optional,
+    Tuple,
+    Union,
 )
 from urllib.parse import urljoin
 
 import aiohttp
 
-from .utils import sync
+from . import decoders
+from .checkpoints import (
+    CheckpointStore,
+    get_entity_key,
+)
+from .connection_pool import (
+    ConnectionPool,
+    create_session,
+)
+from .pagination import (
+    Page,
+    Pagination,
+    prefetch,
+)
+from .proxies import ProxyRotator
+from .rate_limiter import RateLimiter
+from .response_cache import ResponseCache
+from .retry import RetryPolicy
+from .shared_data import (
+    SharedDataReader,
+    find_shared_data,
+)
+from .utils import (
+    bounded,
+    sync,
+)
+from ..columns import (
+    AccountColumns,
+    MediaColumns,
+)
+from ..records import Projection
 from ..entities import (
     Account,
     Comment,
@@ -20,51 +57,314 @@ from ..entities import (
     Tag,
     UpdatableEntity,
 )
+from ..exceptions import (
+    RetryException,
+    UnexpectedResponse,
+)
 
 
 class AsyncWebAgent:
     API_URL = "https://www.instagram.com/"
+    STREAM_CHUNK_SIZE = 16384
+
+    def __init__(self, cookies=None, prefetch: int = 0, stream: bool = False,
+                 session: Optional[aiohttp.ClientSession] = None,
+                 connector: Union[aiohttp.BaseConnector, ConnectionPool, None] = None,
+                 rate_limiter: Optional[RateLimiter] = None, ip: Optional[str] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 checkpoints: Optional[CheckpointStore] = None,
+                 response_cache: Optional[ResponseCache] = None,
+                 proxy: Union[str, ProxyRotator, None] = None,
+                 api_url: Optional[str] = None, lazy: bool = False):
+        if not isinstance(prefetch, int):
+            raise TypeError("'prefetch' must be int type")
+        if not isinstance(stream, bool):
+            raise TypeError("'stream' must be bool type")
+        if not isinstance(rate_limiter, RateLimiter) and rate_limiter is not None:
+            raise TypeError("'rate_limiter' must be RateLimiter type or None")
+        if not isinstance(ip, str) and ip is not None:
+            raise TypeError("'ip' must be str type or None")
+        if not isinstance(retry_policy, RetryPolicy) and retry_policy is not None:
+            raise TypeError("'retry_policy' must be RetryPolicy type or None")
+        if not isinstance(checkpoints, CheckpointStore) and checkpoints is not None:
+            raise TypeError("'checkpoints' must be CheckpointStore type or None")
+        if not isinstance(response_cache, ResponseCache) and response_cache is not None:
+            raise TypeError("'response_cache' must be ResponseCache type or None")
+        if not isinstance(proxy, (str, ProxyRotator)) and proxy is not None:
+            raise TypeError("'proxy' must be str or ProxyRotator type or None")
+        if not isinstance(api_url, str) and api_url is not None:
+            raise TypeError("'api_url' must be str type or None")
+        if not isinstance(lazy, bool):
+            raise TypeError("'lazy' must be bool type")
 
-    def __init__(self, cookies=None):
         self.rhx_gis = None
         self.csrf_token = None
-        self.session = aiohttp.ClientSession(cookies=cookies)
+        self.prefetch = prefetch
+        self.stream = stream
+        self.rate_limiter = rate_limiter
+        self.ip = ip
+        self.retry_policy = retry_policy
+        self.checkpoints = checkpoints
+        self.response_cache = response_cache
+        self.proxy = proxy
+        self.lazy = lazy
+        if api_url is not None:
+            self.API_URL = api_url
+        self._in_flight = {}
+        self.session, self._session_owner = create_session(
+            cookies=cookies,
+            session=session,
+            connector=connector,
+        )
         self.logger = logging.getLogger(__name__)
 
+    async def close(self):
+        if self._session_owner and not self.session.closed:
+            await self.session.close()
+
     @staticmethod
     def _get_shared_data(content: str):
-        match = re.search(
-            r"<script[^>]*>\s*window._sharedData\s*=\s*((?!<script>).*)\s*;\s*</script>",
-            content,
+        return find_shared_data(content)
+
+    @staticmethod
+    def _get_media_from_node(parent: HasMediaEntity, node: dict, lazy: bool = False,
+                             fields: Optional[tuple] = None) -> Media:
+        media = Media.from_web_data(node, lazy=lazy, fields=fields)
+        if isinstance(parent, Account):
+            media.owner = parent
+        parent.media.add(media)
+        return media
+
+    @classmethod
+    def _get_medias_from_edges(cls, parent: HasMediaEntity, edges: list, count: int,
+                               lazy: bool = False):
+        return [
+            cls._get_media_from_node(parent=parent, node=edges[index]["node"], lazy=lazy)
+            for index in range(min(len(edges), count))
+        ]
+
+    @staticmethod
+    def _get_account_parser(fields: Optional[Iterable[str]],
+                            records: bool = False) -> Callable[[dict], Account]:
+        if fields is None or records:
+            def parse(node):
+                account = Account(node["username"])
+                account.id = node["id"]
+                account.profile_pic_url = node["profile_pic_url"]
+                account.is_verified = node["is_verified"]
+                account.full_name = node["full_name"]
+                return account
+            return parse
+
+        projection = Projection(Account, fields)
+
+        def parse(node):
+            account = Account(node["username"])
+            account.id = node["id"]
+            return projection.apply(account, node)
+        return parse
+
+    def _get_cached(self, kind: Optional[str], path: str, query_hash: str = "",
+                    variables: str = "") -> Optional[str]:
+        if self.response_cache is None or kind is None:
+            return None
+        return self.response_cache.get(
+            kind,
+            urljoin(self.API_URL, path),
+            query_hash=query_hash,
+            variables=variables,
         )
-        if match:
-            return json.loads(match.group(1))
+
+    def _set_cached(self, kind: Optional[str], path: str, content: str, query_hash: str = "",
+                    variables: str = ""):
+        if self.response_cache is not None and kind is not None:
+            self.response_cache.set(
+                kind,
+                urljoin(self.API_URL, path),
+                content,
+                query_hash=query_hash,
+                variables=variables,
+            )
+
+    def invalidate(self, entity: UpdatableEntity) -> int:
+        if not isinstance(entity, UpdatableEntity):
+            raise TypeError("'entity' must be UpdatableEntity type")
+        if self.response_cache is None:
+            return 0
+        return self.response_cache.invalidate(urljoin(self.API_URL, entity.get_web_path()))
+
+    def _get_rate_limit_account(self) -> Optional[str]:
+        return None
+
+    def _get_proxy(self) -> Optional[str]:
+        if isinstance(self.proxy, ProxyRotator):
+            return self.proxy.get(self._get_rate_limit_account())
+        return self.proxy
+
+    def _report_proxy(self, proxy: Optional[str], started_at: float, error: bool):
+        if isinstance(self.proxy, ProxyRotator):
+            self.proxy.report(proxy, time.monotonic() - started_at, error=error)
+
+    async def _rate_limit(self, endpoint: str, ip: Optional[str] = None):
+        if self.rate_limiter is not None:
+            delay = await self.rate_limiter.acquire(
+                endpoint,
+                account=self._get_rate_limit_account(),
+                ip=ip,
+            )
+            if delay:
+                self.logger.debug("Request to '%s' delayed by %.3f s", endpoint, delay)
+
+    @staticmethod
+    async def _read_text(response: aiohttp.ClientResponse) -> str:
+        return await response.text()
+
+    async def _send(self, method: str, path: str, endpoint: str, *args,
+                    read: Optional[Callable[[aiohttp.ClientResponse], Awaitable[Any]]] = None,
+                    **kwargs) -> Any:
+        if read is None:
+            read = self._read_text
+        url = urljoin(self.API_URL, path)
+        policy = self.retry_policy
+        attempts = 1
+        errors = (aiohttp.ClientError, asyncio.TimeoutError)
+        if policy is not None:
+            errors += policy.exceptions
+            if policy.is_retryable(endpoint):
+                attempts = policy.attempts
+
+        kwargs_proxy = kwargs.pop("proxy", None)
+        for attempt in range(1, attempts + 1):
+            proxy = kwargs_proxy or self._get_proxy()
+            ip = self.ip or proxy
+            await self._rate_limit(endpoint, ip=ip)
+
+            retry_after = None
+            started_at = time.monotonic()
+            try:
+                response = await self.session.request(method, url, *args, proxy=proxy, **kwargs)
+                if policy is None and not isinstance(self.proxy, ProxyRotator):
+                    return await read(response)
+                status = response.status
+                if policy is None or not policy.is_retryable_status(status):
+                    content = await read(response)
+                    self._report_proxy(proxy, started_at, error=status == 429 or status >= 500)
+                    return content
+            except errors as exception:
+                self._report_proxy(proxy, started_at, error=True)
+                if policy is None or not isinstance(exception, policy.exceptions):
+                    raise
+                reason = exception
+                status = None
+            else:
+                self._report_proxy(proxy, started_at, error=status == 429 or status >= 500)
+                reason = "status %d" % status
+                retry_after = policy.parse_retry_after(response.headers.get("Retry-After"))
+                response.release()
+
+            delay = policy.get_delay(attempt - 1, retry_after)
+            throttled = False
+            if status == 429 and self.rate_limiter is not None:
+                throttled = self.rate_limiter.penalize(
+                    delay,
+                    endpoint,
+                    account=self._get_rate_limit_account(),
+                    ip=ip,
+                    slowdown=policy.slowdown,
+                )
+            if attempt == attempts:
+                raise RetryException(url, attempts, reason, status=status)
+            self.logger.warning(
+                "Request to '%s' failed (%s), retry %d/%d in %.2f s",
+                url, reason, attempt, attempts - 1, delay,
+            )
+            if not throttled:
+                await asyncio.sleep(delay)
+
+    async def _single_flight(self, key: tuple, request: Callable[[], Awaitable[str]]) -> str:
+        flight = self._in_flight.get(key)
+        if flight is None:
+            flight = {"future": asyncio.ensure_future(request()), "waiters": 0}
+            self._in_flight[key] = flight
+
+            def done(future):
+                if self._in_flight.get(key) is flight:
+                    del self._in_flight[key]
+                if not future.cancelled():
+                    future.exception()
+
+            flight["future"].add_done_callback(done)
+        else:
+            self.logger.debug("Join in-flight request to '%s'", key[1])
+
+        flight["waiters"] += 1
+        try:
+            return await asyncio.shield(flight["future"])
+        finally:
+            flight["waiters"] -= 1
+            if not flight["waiters"] and not flight["future"].done():
+                self.logger.debug("Cancel in-flight request to '%s' without waiters", key[1])
+                if self._in_flight.get(key) is flight:
+                    del self._in_flight[key]
+                flight["future"].cancel()
 
     @staticmethod
-    def _get_medias_from_edges(parent: HasMediaEntity, edges: list, count: int):
-        medias = []
-        for index in range(min(len(edges), count)):
-            node = edges[index]["node"]
-            media = Media(node["shortcode"])
-            media.set_web_data(node)
-            if isinstance(parent, Account):
-                media.owner = parent
-            medias.append(media)
-            parent.media.add(media)
-        return medias
-
-    async def _get_request(self, path: str, *args, **kwargs) -> str:
+    def _get_flight_key(method: str, path: str, endpoint: str, args: tuple,
+                        kwargs: dict) -> tuple:
+        return (
+            method,
+            path,
+            endpoint,
+            repr(args),
+            repr(sorted((key, value) for key, value in kwargs.items() if key != "headers")),
+        )
+
+    async def _get_request(self, path: str, *args, endpoint: str = "page", **kwargs) -> str:
         if not isinstance(path, str):
             raise TypeError("'path' must be str type")
-        print("URL:", urljoin(self.API_URL, path))
-        response = await self.session.get(url=urljoin(self.API_URL, path), *args, **kwargs)
-        return await response.text()
 
-    async def _post_request(self, path: str, *args, **kwargs) -> str:
+        async def request():
+            return await self._send("GET", path, endpoint, *args, **kwargs)
+
+        return await self._single_flight(
+            self._get_flight_key("GET", path, endpoint, args, kwargs),
+            request,
+        )
+
+    async def _read_shared_data_prefix(self, response: aiohttp.ClientResponse,
+                                       ) -> Tuple[str, Optional[dict]]:
+        try:
+            decoder = codecs.getincrementaldecoder(response.charset or "utf-8")(errors="replace")
+            reader = SharedDataReader()
+            async for chunk in response.content.iter_chunked(self.STREAM_CHUNK_SIZE):
+                if reader.feed(decoder.decode(chunk)):
+                    self.logger.debug("Stop reading '%s' after shared data", response.url)
+                    response.close()
+                    return reader.content, reader.data
+            reader.feed(decoder.decode(b"", final=True))
+            return reader.content, reader.data
+        finally:
+            response.release()
+
+    async def _get_page_request(self, path: str, *args, **kwargs) -> Tuple[str, Optional[dict]]:
+        if not self.stream:
+            return await self._get_request(path, *args, **kwargs), None
         if not isinstance(path, str):
             raise TypeError("'path' must be str type")
-        response = await self.session.post(url=urljoin(self.API_URL, path), *args, **kwargs)
-        return await response.text()
+
+        async def request():
+            return await self._send("GET", path, "page", *args,
+                                    read=self._read_shared_data_prefix, **kwargs)
+
+        return await self._single_flight(
+            self._get_flight_key("GET", path, "page-stream", args, kwargs),
+            request,
+        )
+
+    async def _post_request(self, path: str, *args, endpoint: str = "action", **kwargs) -> str:
+        if not isinstance(path, str):
+            raise TypeError("'path' must be str type")
+        return await self._send("POST", path, endpoint, *args, **kwargs)
 
     async def _graphql_request(self, query_hash: str, variables: str, referer_path: str,
                                settings: Optional[dict] = None) -> str:
@@ -93,7 +393,11 @@ class AsyncWebAgent:
             "Referer": urljoin(self.API_URL, referer_path),
         })
 
-        return await self._get_request(path="/graphql/query/", **settings)
+        return await self._get_request(
+            path="/graphql/query/",
+            endpoint="graphql:%s" % query_hash,
+            **settings,
+        )
 
     async def _action_request(self, path: str, referer_path: str, data: Optional[dict] = None,
                               settings: Optional[dict] = None) -> str:
@@ -119,41 +423,315 @@ class AsyncWebAgent:
             "X-Requested-With": "XMLHttpRequest",
         })
 
-        return await self._post_request(path=path, **settings)
+        response = await self._post_request(path=path, **settings)
+        if self.response_cache is not None:
+            self.response_cache.invalidate(urljoin(self.API_URL, referer_path))
+        return response
 
     async def update(self, entity: Optional[UpdatableEntity] = None,
-                     settings: Optional[dict] = None) -> dict:
+                     settings: Optional[dict] = None,
+                     fields: Optional[Iterable[str]] = None) -> dict:
         if not isinstance(entity, UpdatableEntity) and entity is not None:
             raise TypeError("'entity' must be UpdatableEntity type or None")
         if not isinstance(settings, dict) and settings is not None:
             raise TypeError("'settings' must be dict type or None")
+        if fields is not None:
+            if entity is None:
+                raise ValueError("'fields' can not be used without 'entity'")
+            fields = entity.get_web_fields(fields)
 
         settings = {} if settings is None else settings.copy()
 
         self.logger.debug("Update '%s' started", entity)
 
         path = "" if entity is None else entity.get_web_path()
-        print("PATH:", path)
-        content = await self._get_request(path=path, **settings)
-        print("CONTENT:", content[:500])
-        data = self._get_shared_data(content=content)
-
-        self.rhx_gis = data.get("rhx_gis", "")
-        self.csrf_token = data["config"]["csrf_token"]
+        kind = None
+        if entity is not None and entity is not self and self.response_cache is not None:
+            kind = self.response_cache.get_kind(entity)
+        data = None
+        content = self._get_cached(kind, path)
+        cached = content is not None
+        if not cached:
+            content, data = await self._get_page_request(path=path, **settings)
+        if data is None:
+            data = self._get_shared_data(content=content)
+
+        if not cached:
+            self.rhx_gis = data.get("rhx_gis", "")
+            self.csrf_token = data["config"]["csrf_token"]
 
         if entity is None:
             return data
 
         data = entity.get_from_web_entry_data_path(data["entry_data"])
-        entity.set_web_data(data)
+        if fields is None:
+            entity.set_web_data(data)
+        else:
+            entity.set_web_data(data, fields=fields)
+        entity.updated_at = time.time()
+        if not cached:
+            self._set_cached(kind, path, content)
 
         self.logger.debug("Update '%s' was successfull", entity)
 
         return data
 
-    async def get_media(self, entity: HasMediaEntity, pointer: Optional[str] = None,
-                        count: int = 12, limit: int = 50, delay: float = 0,
-                        settings: Optional[dict] = None) -> (List[Media], str):
+    async def update_many(self, entities: Iterable[UpdatableEntity], concurrency: int = 10,
+                          fresh: Optional[float] = None, settings: Optional[dict] = None,
+                          ) -> AsyncIterator[Tuple[UpdatableEntity, Optional[dict],
+                                                   Optional[Exception]]]:
+        if not isinstance(concurrency, int):
+            raise TypeError("'concurrency' must be int type")
+        if not isinstance(fresh, (int, float)) and fresh is not None:
+            raise TypeError("'fresh' must be int or float type or None")
+        if not isinstance(settings, dict) and settings is not None:
+            raise TypeError("'settings' must be dict type or None")
+        if concurrency < 1:
+            raise ValueError("'concurrency' must be positive")
+
+        self.logger.info("Update many started")
+
+        def is_fresh(entity) -> bool:
+            updated_at = getattr(entity, "updated_at", None)
+            return fresh is not None and updated_at is not None and \
+                time.time() - updated_at < fresh
+
+        async def update(entity):
+            try:
+                return entity, await self.update(entity, settings=settings), None
+            except Exception as exception:
+                self.logger.warning("Update '%s' was unsuccessfull: %r", entity, exception)
+                return entity, None, exception
+
+        def stale(entities):
+            for entity in entities:
+                if is_fresh(entity):
+                    self.logger.debug("Update '%s' skipped, entity is fresh", entity)
+                    continue
+                yield entity
+
+        tasks = bounded(update, stale(entities), concurrency)
+        try:
+            async for _, task in tasks:
+                yield task.result()
+        finally:
+            await tasks.aclose()
+
+        self.logger.info("Update many was successfull")
+
+    async def _map(self, function: Callable[..., Awaitable], items: Iterable, workers: int,
+                   return_exceptions: bool) -> list:
+        if not isinstance(workers, int):
+            raise TypeError("'workers' must be int type")
+        if not isinstance(return_exceptions, bool):
+            raise TypeError("'return_exceptions' must be bool type")
+        if workers < 1:
+            raise ValueError("'workers' must be positive")
+
+        results = {}
+        tasks = bounded(function, items, workers)
+        try:
+            async for index, task in tasks:
+                try:
+                    results[index] = task.result()
+                except Exception as exception:
+                    if not return_exceptions:
+                        raise
+                    results[index] = exception
+        finally:
+            await tasks.aclose()
+        return [results[index] for index in range(len(results))]
+
+    async def map_update(self, entities: Iterable[UpdatableEntity], workers: int = 10,
+                         settings: Optional[dict] = None,
+                         return_exceptions: bool = False,
+                         fields: Optional[Iterable[str]] = None) -> List[Optional[dict]]:
+        self.logger.info("Map update started")
+        fields = None if fields is None else tuple(fields)
+        result = await self._map(
+            lambda entity: self.update(entity, settings=settings, fields=fields),
+            entities,
+            workers=workers,
+            return_exceptions=return_exceptions,
+        )
+        self.logger.info("Map update was successfull")
+        return result
+
+    async def map_get_media(self, entities: Iterable[HasMediaEntity], count: int = 12,
+                            limit: int = 50, delay: float = 0, workers: int = 10,
+                            settings: Optional[dict] = None, columnar: bool = False,
+                            return_exceptions: bool = False,
+                            fields: Optional[Iterable[str]] = None,
+                            records: bool = False) -> list:
+        self.logger.info("Map get media started")
+        fields = None if fields is None else tuple(fields)
+        result = await self._map(
+            lambda entity: self.get_media(
+                entity,
+                count=count,
+                limit=limit,
+                delay=delay,
+                settings=settings,
+                columnar=columnar,
+                fields=fields,
+                records=records,
+            ),
+            entities,
+            workers=workers,
+            return_exceptions=return_exceptions,
+        )
+        self.logger.info("Map get media was successfull")
+        return result
+
+    async def _get_raw_page(self, pagination: Pagination, pointer: Optional[str], count: int,
+                            limit: int, settings: Optional[dict], first: bool,
+                            kind: Optional[str]) -> tuple:
+        if first and pagination.first_page is not None:
+            data = await pagination.first_page()
+        else:
+            variables = pagination.variables(pointer, min(limit, count))
+            content = self._get_cached(
+                kind,
+                pagination.referer_path,
+                query_hash=pagination.query_hash,
+                variables=variables,
+            )
+            cached = content is not None
+            if not cached:
+                content = await self._graphql_request(
+                    query_hash=pagination.query_hash,
+                    variables=variables,
+                    referer_path=pagination.referer_path,
+                    settings=settings,
+                )
+            try:
+                data = pagination.get_from_data_path(decoders.loads(content))
+            except (ValueError, KeyError, TypeError) as exception:
+                raise UnexpectedResponse(exception, urljoin(self.API_URL, "/graphql/query/"))
+            if not cached:
+                self._set_cached(
+                    kind,
+                    pagination.referer_path,
+                    content,
+                    query_hash=pagination.query_hash,
+                    variables=variables,
+                )
+
+        try:
+            page_info = data["page_info"]
+            nodes = pagination.get_nodes(data, count)
+            pointer = page_info["end_cursor"] if page_info["has_next_page"] else None
+        except (ValueError, KeyError, TypeError) as exception:
+            raise UnexpectedResponse(exception, urljoin(self.API_URL, "/graphql/query/"))
+        return data, nodes, pointer
+
+    async def _iter_raw_pages(self, pagination: Pagination, pointer: Optional[str] = None,
+                              count: int = 12, limit: int = 50, delay: float = 0,
+                              settings: Optional[dict] = None,
+                              fetch_ahead: bool = False) -> AsyncIterator[tuple]:
+        if count <= 0:
+            return
+        first = pointer is None
+        if not first and pagination.prepare is not None:
+            await pagination.prepare()
+        kind = None if pagination.key is None else pagination.key.split(":", 1)[0]
+
+        async def fetch(pointer, count, first):
+            if not first and delay:
+                await asyncio.sleep(delay)
+            return await self._get_raw_page(pagination, pointer, count, limit, settings, first,
+                                            kind)
+
+        next_page = fetch(pointer, count, first)
+        try:
+            while next_page is not None:
+                data, nodes, pointer = await next_page
+                count -= len(nodes)
+                next_page = None
+                if pointer is not None and count > 0:
+                    next_page = fetch(pointer, count, False)
+                    if fetch_ahead:
+                        next_page = asyncio.ensure_future(next_page)
+                yield data, nodes, pointer
+        finally:
+            if isinstance(next_page, asyncio.Future):
+                next_page.cancel()
+                await asyncio.gather(next_page, return_exceptions=True)
+            elif next_page is not None:
+                next_page.close()
+
+    async def _iter_pages(self, pagination: Pagination, pointer: Optional[str] = None,
+                          count: int = 12, limit: int = 50, delay: float = 0,
+                          settings: Optional[dict] = None, columnar: bool = False,
+                          fields: Optional[Iterable[str]] = None,
+                          records: bool = False) -> AsyncIterator[Page]:
+        if not isinstance(records, bool):
+            raise TypeError("'records' must be bool type")
+        if columnar and pagination.columns is None:
+            raise TypeError("Pagination for '%s' has no columnar representation" %
+                            pagination.query_hash)
+        if columnar and (records or fields is not None):
+            raise ValueError("'columnar' can not be used with 'records' or 'fields'")
+        projection = None
+        if records:
+            if pagination.records is None:
+                raise TypeError("Pagination for '%s' has no record representation" %
+                                pagination.query_hash)
+            projection = Projection(pagination.records, fields)
+
+        checkpoints = None if pagination.key is None else self.checkpoints
+        if checkpoints is not None and pointer is None:
+            pointer = checkpoints.get(pagination.key, pagination.query_hash)
+            if pointer is not None:
+                self.logger.info("Resume '%s' from checkpoint '%s'", pagination.key, pointer)
+
+        pages = self._iter_raw_pages(pagination, pointer=pointer, count=count, limit=limit,
+                                     delay=delay, settings=settings,
+                                     fetch_ahead=self.prefetch > 0)
+        if self.prefetch > 1:
+            pages = prefetch(pages, depth=self.prefetch - 1)
+
+        interrupted = False
+        try:
+            async for data, nodes, pointer in pages:
+                try:
+                    if pagination.on_data is not None:
+                        pagination.on_data(data)
+                    if columnar:
+                        page = pagination.columns(nodes, pointer=pointer)
+                    elif projection is not None:
+                        page = Page((projection.record(node) for node in nodes), pointer=pointer)
+                    else:
+                        page = Page((pagination.parse(node) for node in nodes), pointer=pointer)
+                except (ValueError, KeyError, TypeError) as exception:
+                    raise UnexpectedResponse(exception, urljoin(self.API_URL, "/graphql/query/"))
+                yield page
+
+                if checkpoints is not None and pointer is not None:
+                    checkpoints.set(pagination.key, pagination.query_hash, pointer)
+        except GeneratorExit:
+            raise
+        except BaseException:
+            interrupted = True
+            raise
+        finally:
+            if checkpoints is not None and not interrupted:
+                checkpoints.delete(pagination.key, pagination.query_hash)
+
+    @staticmethod
+    async def _collect_pages(pages: AsyncIterator[Page], result=None) -> (list, Optional[str]):
+        result = [] if result is None else result
+        pointer = None
+        async for page in pages:
+            result.extend(page)
+            pointer = page.pointer
+        return result, pointer
+
+    async def iter_media(self, entity: HasMediaEntity, pointer: Optional[str] = None,
+                         count: int = 12, limit: int = 50, delay: float = 0,
+                         settings: Optional[dict] = None, columnar: bool = False,
+                         fields: Optional[Iterable[str]] = None,
+                         records: bool = False) -> AsyncIterator[Page]:
         if not isinstance(entity, HasMediaEntity):
             raise TypeError("'entity' must be HasMediaEntity type")
         if not isinstance(pointer, str) and pointer is not None:
@@ -164,61 +742,78 @@ class AsyncWebAgent:
             raise TypeError("'limit' must be int type")
         if not isinstance(delay, (int, float)):
             raise TypeError("'delay' must be int or float type")
+        if not isinstance(columnar, bool):
+            raise TypeError("'columnar' must be bool type")
 
-        self.logger.info("Get media '%s' started", entity)
+        if fields is not None and not records:
+            fields = Media.get_web_fields(fields)
 
-        if pointer is None:
-            data = await self.update(entity=entity, settings=settings)
-            data = data[entity.web_media_path[-1]]
-
-            page_info = data["page_info"]
-            edges = data["edges"]
-
-            medias = self._get_medias_from_edges(parent=entity, edges=edges, count=count)
-
-            pointer = page_info["end_cursor"] if page_info["has_next_page"] else None
-
-            if len(medias) < count and page_info["has_next_page"]:
-                count -= len(edges)
-            else:
-                self.logger.debug("Get media '%s' was successfull", entity)
-                return medias, pointer
-
-        variables_string = '{{"{name}":"{name_value}","first":{first},"after":"{after}"}}'
+        self.logger.info("Get media '%s' started", entity)
 
-        while True:
-            data = {"after": pointer, "first": min(limit, count)}
-            if isinstance(entity, Tag):
-                data["name"] = "tag_name"
-                data["name_value"] = entity.name
-            else:
-                data["name"] = "id"
-                data["name_value"] = entity.id
+        if isinstance(entity, Tag):
+            variables_string = '{{"tag_name":"{name}","first":{first},"after":"{after}"}}'
+        else:
+            variables_string = '{{"id":"{name}","first":{first},"after":"{after}"}}'
 
-            content = await self._graphql_request(
-                query_hash=entity.web_media_query_hash,
-                variables=variables_string.format(**data),
-                referer_path=urljoin(entity.web_base_path, getattr(entity, entity.primary_key)),
-                settings=settings,
-            )
-            data = json.loads(content)
-            data = entity.get_from_web_media_path(data["data"])
-            page_info = data["page_info"]
-            edges = data["edges"]
+        async def prepare():
+            if not isinstance(entity, Tag) and entity.id is None:
+                await self.update(entity=entity, settings=settings)
 
-            medias = self._get_medias_from_edges(parent=entity, edges=edges, count=count)
+        async def first_page():
+            data = await self.update(entity=entity, settings=settings)
+            return data[entity.web_media_path[-1]]
+
+        pagination = Pagination(
+            query_hash=entity.web_media_query_hash,
+            variables=lambda after, first: variables_string.format(
+                name=entity.name if isinstance(entity, Tag) else entity.id,
+                first=first,
+                after=after,
+            ),
+            referer_path=urljoin(entity.web_base_path, str(getattr(entity, entity.primary_key))),
+            data_path=("data",) + tuple(entity.web_media_path),
+            parse=lambda node: self._get_media_from_node(
+                parent=entity,
+                node=node,
+                lazy=self.lazy,
+                fields=fields,
+            ),
+            first_page=first_page,
+            columns=MediaColumns,
+            key=get_entity_key(entity),
+            prepare=prepare,
+            records=Media,
+        )
 
-            pointer = page_info["end_cursor"] if page_info["has_next_page"] else None
+        async for page in self._iter_pages(pagination, pointer=pointer, count=count,
+                                           limit=limit, delay=delay, settings=settings,
+                                           columnar=columnar, fields=fields,
+                                           records=records):
+            yield page
 
-            if len(edges) < count and page_info["has_next_page"]:
-                count -= len(edges)
-                await asyncio.sleep(delay)
-            else:
-                self.logger.debug("Get media '%s' was successfull", entity)
-                return medias, pointer
+        self.logger.debug("Get media '%s' was successfull", entity)
 
-    async def get_likes(self, media: Media, pointer: Optional[str] = None, count: int = 20,
-                        limit: int = 50, delay: float = 0, settings: Optional[dict] = None):
+    async def get_media(self, entity: HasMediaEntity, pointer: Optional[str] = None,
+                        count: int = 12, limit: int = 50, delay: float = 0,
+                        settings: Optional[dict] = None, columnar: bool = False,
+                        fields: Optional[Iterable[str]] = None,
+                        records: bool = False) -> (List[Media], str):
+        return await self._collect_pages(self.iter_media(
+            entity=entity,
+            pointer=pointer,
+            count=count,
+            limit=limit,
+            delay=delay,
+            settings=settings,
+            columnar=columnar,
+            fields=fields,
+            records=records,
+        ), result=MediaColumns() if columnar else None)
+
+    async def iter_likes(self, media: Media, pointer: Optional[str] = None, count: int = 20,
+                         limit: int = 50, delay: float = 0, settings: Optional[dict] = None,
+                         columnar: bool = False, fields: Optional[Iterable[str]] = None,
+                         records: bool = False) -> AsyncIterator[Page]:
         if not isinstance(media, Media):
             raise TypeError("'media' must be Media type")
         if not isinstance(pointer, str) and pointer is not None:
@@ -229,65 +824,80 @@ class AsyncWebAgent:
             raise TypeError("'limit' must be int type")
         if not isinstance(delay, (int, float)):
             raise TypeError("'delay' must be int or float type")
+        if not isinstance(columnar, bool):
+            raise TypeError("'columnar' must be bool type")
 
         self.logger.debug("Get likes '%s' started", media)
 
         if media.id is None:
             await self.update(entity=media, settings=settings)
 
-        if pointer:
-            variables_string = '{{"shortcode":"{shortcode}","first":{first},"after":"{after}"}}'
-        else:
-            variables_string = '{{"shortcode":"{shortcode}","first":{first}}}'
-        likes = []
-
-        while True:
-            data = {"shortcode": media.code, "first": min(limit, count)}
-            if pointer:
-                data["after"] = pointer
-
-            response = await self._graphql_request(
-                query_hash="1cb6ec562846122743b61e492c85999f",
-                variables=variables_string.format(**data),
-                referer_path=urljoin(
-                    urljoin(self.API_URL, media.web_base_path),
-                    getattr(media, media.primary_key),
-                ),
-                settings=settings,
+        def variables(after, first):
+            if after:
+                return '{{"shortcode":"{shortcode}","first":{first},"after":"{after}"}}'.format(
+                    shortcode=media.code,
+                    first=first,
+                    after=after,
+                )
+            return '{{"shortcode":"{shortcode}","first":{first}}}'.format(
+                shortcode=media.code,
+                first=first,
             )
 
-            try:
-                data = json.loads(response)["data"]["shortcode_media"]["edge_liked_by"]
-                edges = data["edges"]
-                page_info = data["page_info"]
-                media.likes_count = data["count"]
-
-                for index in range(min(len(edges), count)):
-                    node = edges[index]["node"]
-                    account = Account(node["username"])
-                    account.id = node["id"]
-                    account.profile_pic_url = node["profile_pic_url"]
-                    account.is_verified = node["is_verified"]
-                    account.full_name = node["full_name"]
-                    media.likes.add(account)
-                    likes.append(account)
-
-                pointer = page_info["end_cursor"] if page_info["has_next_page"] else None
-
-                if len(edges) < count and page_info["has_next_page"]:
-                    count = count - len(edges)
-                    variables_string = \
-                        '{{"shortcode":"{shortcode}","first":{first},"after":"{after}"}}'
-                    await asyncio.sleep(delay)
-                else:
-                    self.logger.debug("Get likes '%s' was successfull", media)
-                    return likes, pointer
-            except (ValueError, KeyError) as exception:
-                self.logger.exception("Get likes '%s' was unsuccessfull", media)
-                raise UnexpectedResponse(exception, response.url)
+        parse_account = self._get_account_parser(fields, records)
+
+        def parse(node):
+            account = parse_account(node)
+            media.likes.add(account)
+            return account
+
+        def on_data(data):
+            media.likes_count = data["count"]
+
+        pagination = Pagination(
+            query_hash="1cb6ec562846122743b61e492c85999f",
+            variables=variables,
+            referer_path=urljoin(
+                urljoin(self.API_URL, media.web_base_path),
+                getattr(media, media.primary_key),
+            ),
+            data_path=("data", "shortcode_media", "edge_liked_by"),
+            parse=parse,
+            on_data=on_data,
+            columns=AccountColumns,
+            key=get_entity_key(media),
+            records=Account,
+        )
 
-    async def get_comments(self, media: Media, pointer: Optional[str] = None, count: int = 35,
-                           limit: int = 32, delay: float = 0, settings: Optional[dict] = None):
+        async for page in self._iter_pages(pagination, pointer=pointer, count=count,
+                                           limit=limit, delay=delay, settings=settings,
+                                           columnar=columnar, fields=fields,
+                                           records=records):
+            yield page
+
+        self.logger.debug("Get likes '%s' was successfull", media)
+
+    async def get_likes(self, media: Media, pointer: Optional[str] = None, count: int = 20,
+                        limit: int = 50, delay: float = 0, settings: Optional[dict] = None,
+                        columnar: bool = False, fields: Optional[Iterable[str]] = None,
+                        records: bool = False):
+        return await self._collect_pages(self.iter_likes(
+            media=media,
+            pointer=pointer,
+            count=count,
+            limit=limit,
+            delay=delay,
+            settings=settings,
+            columnar=columnar,
+            fields=fields,
+            records=records,
+        ), result=AccountColumns() if columnar else None)
+
+    async def iter_comments(self, media: Media, pointer: Optional[str] = None, count: int = 35,
+                            limit: int = 32, delay: float = 0,
+                            settings: Optional[dict] = None,
+                            fields: Optional[Iterable[str]] = None,
+                            records: bool = False) -> AsyncIterator[Page]:
         if not isinstance(media, Media):
             raise TypeError("'media' must be Media type")
         if not isinstance(pointer, str) and pointer is not None:
@@ -301,76 +911,76 @@ class AsyncWebAgent:
 
         self.logger.debug("Get comments '%s' started", media)
 
-        comments = []
-
-        if pointer is None:
-            try:
-                data = await self.update(entity=media, settings=settings)
-                if "edge_media_to_comment" in data:
-                    data = data["edge_media_to_comment"]
-                else:
-                    data = data["edge_media_to_parent_comment"]
-                edges = data["edges"]
-                page_info = data["page_info"]
-
-                for index in range(min(len(edges), count)):
-                    node = edges[index]["node"]
-                    c = Comment(node["id"], media=media,
-                                owner=Account(node["owner"]["username"]),
-                                text=node["text"],
-                                created_at=node["created_at"])
-                    media.comments.add(c)
-                    comments.append(c)
-
-                pointer = page_info["end_cursor"] if page_info["has_next_page"] else None
-
-                if len(edges) < count and pointer is not None:
-                    count = count - len(edges)
-                else:
-                    self.logger.debug("Get comments '%s' was successfull", media)
-                    return comments, pointer
-            except (ValueError, KeyError) as exception:
-                self.logger.exception("Get comments '%s' was unsuccessfull", media)
-                raise UnexpectedResponse(exception, media)
-
-        variables_string = '{{"shortcode":"{code}","first":{first},"after":"{after}"}}'
-        while True:
-            data = {"after": pointer, "code": media.code, "first": min(limit, count)}
-
-            response = await self._graphql_request(
-                query_hash="f0986789a5c5d17c2400faebf16efd0d",
-                variables=variables_string.format(**data),
-                referer_path=urljoin(
-                    urljoin(self.API_URL, media.web_base_path),
-                    getattr(media, media.primary_key),
+        async def first_page():
+            data = await self.update(entity=media, settings=settings)
+            if "edge_media_to_comment" in data:
+                return data["edge_media_to_comment"]
+            return data["edge_media_to_parent_comment"]
+
+        projection = None
+        if fields is not None and not records:
+            projection = Projection(Comment, fields)
+
+        def parse(node):
+            if projection is None:
+                comment = Comment(
+                    node["id"],
+                    media=media,
+                    owner=Account(node["owner"]["username"]),
+                    text=node["text"],
+                    created_at=node["created_at"],
+                )
+            else:
+                comment = Comment(
+                    node["id"],
+                    media=media,
+                    owner=Account(node["owner"]["username"]) if "owner" in projection else None,
+                    text=node["text"] if "text" in projection else None,
+                    created_at=node["created_at"] if "created_at" in projection else None,
+                )
+            media.comments.add(comment)
+            return comment
+
+        def on_data(data):
+            media.comments_count = data["count"]
+
+        pagination = Pagination(
+            query_hash="f0986789a5c5d17c2400faebf16efd0d",
+            variables=lambda after, first: \
+                '{{"shortcode":"{code}","first":{first},"after":"{after}"}}'.format(
+                    code=media.code,
+                    first=first,
+                    after=after,
                 ),
-                settings=settings,
-            )
+            referer_path=urljoin(
+                urljoin(self.API_URL, media.web_base_path),
+                getattr(media, media.primary_key),
+            ),
+            data_path=("data", "shortcode_media", "edge_media_to_comment"),
+            parse=parse,
+            first_page=first_page,
+            on_data=on_data,
+            key=get_entity_key(media),
+            records=Comment,
+        )
 
-            try:
-                data = json.loads(response)["data"]["shortcode_media"]["edge_media_to_comment"]
-                media.comments_count = data["count"]
-                edges = data["edges"]
-                page_info = data["page_info"]
-
-                for index in range(min(len(edges), count)):
-                    node = edges[index]["node"]
-                    c = Comment(node["id"],
-                                media=media,
-                                owner=Account(node["owner"]["username"]),
-                                text=node["text"],
-                                created_at=node["created_at"])
-                    media.comments.add(c)
-                    comments.append(c)
-
-                pointer = page_info["end_cursor"] if page_info["has_next_page"] else None
-
-                if len(edges) < count and page_info["has_next_page"]:
-                    count = count - len(edges)
-                    await asyncio.sleep(delay)
-                else:
-                    self.logger.debug("Get comments '%s' was successfull", media)
-                    return comments, pointer
-            except (ValueError, KeyError) as exception:
-                self.logger.error("Get comments '%s' was unsuccessfull", media)
-                raise UnexpectedResponse(exception, response.url)
+        async for page in self._iter_pages(pagination, pointer=pointer, count=count,
+                                           limit=limit, delay=delay, settings=settings,
+                                           fields=fields, records=records):
+            yield page
+
+        self.logger.debug("Get comments '%s' was successfull", media)
+
+    async def get_comments(self, media: Media, pointer: Optional[str] = None, count: int = 35,
+                           limit: int = 32, delay: float = 0, settings: Optional[dict] = None,
+                           fields: Optional[Iterable[str]] = None, records: bool = False):
+        return await self._collect_pages(self.iter_comments(
+            media=media,
+            pointer=pointer,
+            count=count,
+            limit=limit,
+            delay=delay,
+            settings=settings,
+            fields=fields,
+            records=records,
+        ))
@@ -0,0 +1,137 @@
+import json
+import os
+import sqlite3
+import tempfile
+import time
+from typing import Optional
+
+from ..entities import Entity
+
+
+def get_entity_key(entity: Entity) -> str:
+    if not isinstance(entity, Entity):
+        raise TypeError("'entity' must be Entity type")
+    cls = next(cls for cls in type(entity).__mro__ if "primary_key" in cls.__dict__)
+    return "%s:%s" % (cls.__name__, getattr(entity, entity.primary_key))
+
+
+class CheckpointStore:
+    def get(self, key: str, query_hash: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def set(self, key: str, query_hash: str, pointer: str):
+        raise NotImplementedError
+
+    def delete(self, key: str, query_hash: str):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class MemoryCheckpointStore(CheckpointStore):
+    def __init__(self):
+        self._data = {}
+
+    def get(self, key: str, query_hash: str) -> Optional[str]:
+        return self._data.get((key, query_hash))
+
+    def set(self, key: str, query_hash: str, pointer: str):
+        self._data[(key, query_hash)] = pointer
+
+    def delete(self, key: str, query_hash: str):
+        self._data.pop((key, query_hash), None)
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class JSONCheckpointStore(CheckpointStore):
+    def __init__(self, path: str):
+        if not isinstance(path, str):
+            raise TypeError("'path' must be str type")
+
+        self.path = path
+        self._data = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self._data = json.load(f)
+
+    def _dump(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(self._data, f)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def get(self, key: str, query_hash: str) -> Optional[str]:
+        return self._data.get(key, {}).get(query_hash)
+
+    def set(self, key: str, query_hash: str, pointer: str):
+        self._data.setdefault(key, {})[query_hash] = pointer
+        self._dump()
+
+    def delete(self, key: str, query_hash: str):
+        pointers = self._data.get(key, {})
+        if query_hash in pointers:
+            del pointers[query_hash]
+            if not pointers:
+                del self._data[key]
+            self._dump()
+
+    def clear(self):
+        self._data = {}
+        self._dump()
+
+
+class SQLiteCheckpointStore(CheckpointStore):
+    def __init__(self, path: str):
+        if not isinstance(path, str):
+            raise TypeError("'path' must be str type")
+
+        self.path = path
+        self._connection = sqlite3.connect(path)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS checkpoints ("
+            "key TEXT NOT NULL, query_hash TEXT NOT NULL, pointer TEXT NOT NULL, "
+            "updated_at REAL NOT NULL, PRIMARY KEY (key, query_hash))"
+        )
+        self._connection.commit()
+
+    def get(self, key: str, query_hash: str) -> Optional[str]:
+        row = self._connection.execute(
+            "SELECT pointer FROM checkpoints WHERE key = ? AND query_hash = ?",
+            (key, query_hash),
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def set(self, key: str, query_hash: str, pointer: str):
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?)",
+                (key, query_hash, pointer, time.time()),
+            )
+
+    def delete(self, key: str, query_hash: str):
+        with self._connection:
+            self._connection.execute(
+                "DELETE FROM checkpoints WHERE key = ? AND query_hash = ?",
+                (key, query_hash),
+            )
+
+    def clear(self):
+        with self._connection:
+            self._connection.execute("DELETE FROM checkpoints")
+
+    def close(self):
+        self._connection.close()
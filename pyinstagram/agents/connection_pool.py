@@ -0,0 +1,93 @@
+from typing import (
+    Optional,
+    Tuple,
+    Union,
+)
+
+import aiohttp
+
+
+class ConnectionPool:
+    def __init__(self, limit: int = 100, limit_per_host: int = 10,
+                 keepalive_timeout: float = 30.0, ttl_dns_cache: Optional[int] = 300,
+                 **kwargs):
+        if not isinstance(limit, int):
+            raise TypeError("'limit' must be int type")
+        if not isinstance(limit_per_host, int):
+            raise TypeError("'limit_per_host' must be int type")
+        if not isinstance(keepalive_timeout, (int, float)):
+            raise TypeError("'keepalive_timeout' must be int or float type")
+        if not isinstance(ttl_dns_cache, (int, type(None))):
+            raise TypeError("'ttl_dns_cache' must be int type or None")
+
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.ttl_dns_cache = ttl_dns_cache
+        self.kwargs = kwargs
+        self._connector = None
+
+    @property
+    def connector(self) -> aiohttp.TCPConnector:
+        if self._connector is None or self._connector.closed:
+            self._connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                use_dns_cache=self.ttl_dns_cache is not None,
+                ttl_dns_cache=self.ttl_dns_cache,
+                **self.kwargs,
+            )
+        return self._connector
+
+    def session(self, cookies=None, **kwargs) -> aiohttp.ClientSession:
+        return aiohttp.ClientSession(
+            connector=self.connector,
+            connector_owner=False,
+            cookie_jar=aiohttp.CookieJar(),
+            cookies=cookies,
+            **kwargs,
+        )
+
+    @property
+    def closed(self) -> bool:
+        return self._connector is None or self._connector.closed
+
+    async def close(self):
+        if self._connector is not None:
+            await self._connector.close()
+            self._connector = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+
+def create_session(
+        cookies=None,
+        session: Optional[aiohttp.ClientSession] = None,
+        connector: Union[aiohttp.BaseConnector, ConnectionPool, None] = None,
+) -> Tuple[aiohttp.ClientSession, bool]:
+    if session is not None:
+        if not isinstance(session, aiohttp.ClientSession):
+            raise TypeError("'session' must be ClientSession type")
+        if connector is not None:
+            raise ValueError("'session' and 'connector' can not be used together")
+        if cookies is not None:
+            raise ValueError("'session' and 'cookies' can not be used together")
+        return session, False
+
+    if connector is None:
+        return aiohttp.ClientSession(cookies=cookies), True
+    if isinstance(connector, ConnectionPool):
+        return connector.session(cookies=cookies), True
+    if isinstance(connector, aiohttp.BaseConnector):
+        return aiohttp.ClientSession(
+            connector=connector,
+            connector_owner=False,
+            cookie_jar=aiohttp.CookieJar(),
+            cookies=cookies,
+        ), True
+    raise TypeError("'connector' must be BaseConnector or ConnectionPool type")
@@ -0,0 +1,45 @@
+import json
+from typing import (
+    Callable,
+    Union,
+)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+BACKENDS = {"json": json.loads}
+if ujson is not None:
+    BACKENDS["ujson"] = ujson.loads
+if orjson is not None:
+    BACKENDS["orjson"] = orjson.loads
+
+
+def get_default_backend() -> str:
+    for name in ("orjson", "ujson", "json"):
+        if name in BACKENDS:
+            return name
+
+
+backend = get_default_backend()
+loads = BACKENDS[backend]
+
+
+def set_backend(decoder: Union[str, Callable[[Union[str, bytes]], object]]):
+    global backend, loads
+
+    if isinstance(decoder, str):
+        if decoder not in BACKENDS:
+            raise ValueError("JSON backend '%s' is not available" % decoder)
+        backend, loads = decoder, BACKENDS[decoder]
+    elif callable(decoder):
+        backend, loads = getattr(decoder, "__module__", None) or repr(decoder), decoder
+    else:
+        raise TypeError("'decoder' must be str type or callable")
@@ -1,5 +1,10 @@
 from .async_mobile_account_agent import AsyncMobileAccountAgent
+from .utils import (
+    SyncAgent,
+    sync,
+)
 
 
-class MobileAccountAgent(AsyncMobileAccountAgent):
-    pass
+class MobileAccountAgent(SyncAgent, AsyncMobileAccountAgent):
+    login = sync(AsyncMobileAccountAgent.login)
+    update = sync(AsyncMobileAccountAgent.update)
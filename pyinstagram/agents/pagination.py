@@ -0,0 +1,95 @@
+import asyncio
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Optional,
+)
+
+
+class Page(list):
+    def __init__(self, items: Iterable[Any] = (), pointer: Optional[str] = None):
+        super().__init__(items)
+        self.pointer = pointer
+
+    def __repr__(self):
+        return "Page(%s, pointer=%r)" % (super().__repr__(), self.pointer)
+
+
+class Pagination:
+    def __init__(self, query_hash: str, variables: Callable[[Optional[str], int], str],
+                 referer_path: str, data_path: Iterable[Any], parse: Callable[[dict], Any],
+                 first_page: Optional[Callable[[], Awaitable[dict]]] = None,
+                 on_data: Optional[Callable[[dict], None]] = None,
+                 node_filter: Optional[Callable[[dict], bool]] = None,
+                 columns: Optional[type] = None, key: Optional[str] = None,
+                 prepare: Optional[Callable[[], Awaitable[None]]] = None,
+                 records: Optional[type] = None):
+        self.query_hash = query_hash
+        self.variables = variables
+        self.referer_path = referer_path
+        self.data_path = tuple(data_path)
+        self.parse = parse
+        self.first_page = first_page
+        self.on_data = on_data
+        self.node_filter = node_filter
+        self.columns = columns
+        self.key = key
+        self.prepare = prepare
+        self.records = records
+
+    def get_from_data_path(self, data: dict) -> dict:
+        for key in self.data_path:
+            data = data[key]
+        return data
+
+    def get_nodes(self, data: dict, count: int) -> list:
+        nodes = (edge["node"] for edge in data["edges"])
+        if self.node_filter is not None:
+            nodes = filter(self.node_filter, nodes)
+        result = []
+        for node in nodes:
+            if len(result) >= count:
+                break
+            result.append(node)
+        return result
+
+
+async def prefetch(pages: AsyncIterator[Any], depth: int = 1) -> AsyncIterator[Any]:
+    slots = asyncio.Semaphore(depth)
+    queue = asyncio.Queue()
+    done = object()
+
+    async def produce():
+        try:
+            while True:
+                await slots.acquire()
+                try:
+                    item = await pages.__anext__()
+                except StopAsyncIteration:
+                    queue.put_nowait((done, None))
+                    return
+                queue.put_nowait((item, None))
+        except Exception as exception:
+            queue.put_nowait((done, exception))
+
+    producer = asyncio.ensure_future(produce())
+    try:
+        while True:
+            item, exception = await queue.get()
+            if exception is not None:
+                raise exception
+            if item is done:
+                return
+            slots.release()
+            yield item
+    finally:
+        producer.cancel()
+        try:
+            await producer
+        except asyncio.CancelledError:
+            if not producer.cancelled():
+                raise
+        await pages.aclose()
@@ -0,0 +1,100 @@
+import itertools
+import time
+from typing import (
+    Iterable,
+    Optional,
+)
+
+
+class ProxyStats:
+    __slots__ = ("requests", "errors", "consecutive_errors", "latency", "evicted_until")
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.consecutive_errors = 0
+        self.latency = 0.0
+        self.evicted_until = 0.0
+
+    @property
+    def healthy(self) -> bool:
+        return self.evicted_until <= time.monotonic()
+
+    def to_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "error_rate": self.errors / self.requests if self.requests else 0.0,
+            "average_latency": self.latency / self.requests if self.requests else 0.0,
+            "healthy": self.healthy,
+        }
+
+
+class ProxyRotator:
+    def __init__(self, proxies: Iterable[str], max_errors: int = 5, eviction: float = 300):
+        proxies = list(proxies)
+        if not all(isinstance(proxy, str) for proxy in proxies):
+            raise TypeError("'proxies' must contain str items")
+        if not proxies:
+            raise ValueError("'proxies' must not be empty")
+        if not isinstance(max_errors, int):
+            raise TypeError("'max_errors' must be int type")
+        if not isinstance(eviction, (int, float)):
+            raise TypeError("'eviction' must be int or float type")
+
+        self.proxies = proxies
+        self.max_errors = max_errors
+        self.eviction = eviction
+        self._stats = {proxy: ProxyStats() for proxy in proxies}
+        self._assignments = {}
+        self._cycle = itertools.cycle(proxies)
+
+    def _healthy(self) -> list:
+        return [proxy for proxy in self.proxies if self._stats[proxy].healthy]
+
+    def get(self, key: Optional[str] = None) -> str:
+        healthy = self._healthy()
+        if not healthy:
+            healthy = [min(self.proxies, key=lambda proxy: self._stats[proxy].evicted_until)]
+
+        if key is None:
+            for proxy in self._cycle:
+                if proxy in healthy:
+                    return proxy
+
+        proxy = self._assignments.get(key)
+        if proxy in healthy:
+            return proxy
+        loads = {proxy: 0 for proxy in healthy}
+        for assigned in self._assignments.values():
+            if assigned in loads:
+                loads[assigned] += 1
+        proxy = min(healthy, key=lambda proxy: (loads[proxy], self._stats[proxy].errors))
+        self._assignments[key] = proxy
+        return proxy
+
+    def report(self, proxy: str, latency: float, error: bool = False):
+        stats = self._stats.get(proxy)
+        if stats is None:
+            return
+        stats.requests += 1
+        stats.latency += latency
+        if not error:
+            stats.consecutive_errors = 0
+            return
+        stats.errors += 1
+        stats.consecutive_errors += 1
+        if stats.consecutive_errors >= self.max_errors:
+            stats.evicted_until = time.monotonic() + self.eviction
+            stats.consecutive_errors = 0
+
+    def evict(self, proxy: str, seconds: Optional[float] = None):
+        self._stats[proxy].evicted_until = time.monotonic() + (
+            self.eviction if seconds is None else seconds
+        )
+
+    def restore(self, proxy: str):
+        self._stats[proxy].evicted_until = 0.0
+
+    def stats(self) -> dict:
+        return {proxy: self._stats[proxy].to_dict() for proxy in self.proxies}
@@ -0,0 +1,153 @@
+import asyncio
+import time
+from typing import (
+    Dict,
+    Optional,
+    Tuple,
+    Union,
+)
+
+
+class Rate:
+    def __init__(self, count: Union[int, float], period: Union[int, float] = 1,
+                 burst: Optional[Union[int, float]] = None):
+        if not isinstance(count, (int, float)):
+            raise TypeError("'count' must be int or float type")
+        if not isinstance(period, (int, float)):
+            raise TypeError("'period' must be int or float type")
+        if not isinstance(burst, (int, float)) and burst is not None:
+            raise TypeError("'burst' must be int or float type or None")
+        if count <= 0 or period <= 0:
+            raise ValueError("'count' and 'period' must be positive")
+
+        self.count = count
+        self.period = period
+        self.burst = 1 if burst is None else burst
+
+    @property
+    def per_second(self) -> float:
+        return self.count / self.period
+
+    def __repr__(self):
+        return "Rate(%r, %r, burst=%r)" % (self.count, self.period, self.burst)
+
+
+class TokenBucket:
+    MIN_FACTOR = 0.1
+    RECOVERY = 0.01
+
+    def __init__(self, rate: Rate):
+        if not isinstance(rate, Rate):
+            raise TypeError("'rate' must be Rate type")
+
+        self.rate = rate
+        self.tokens = float(rate.burst)
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self.factor = 1.0
+
+    @property
+    def per_second(self) -> float:
+        return self.rate.per_second * self.factor
+
+    def _refill(self) -> float:
+        now = time.monotonic()
+        start = max(self.updated_at, self.blocked_until)
+        if now > start:
+            self.tokens = min(float(self.rate.burst), self.tokens + (now - start) * self.per_second)
+            self.factor = min(1.0, self.factor + (now - start) * self.RECOVERY)
+        self.updated_at = now
+        return now
+
+    def reserve(self, tokens: float = 1) -> float:
+        now = self._refill()
+        self.tokens -= tokens
+        delay = max(self.blocked_until - now, 0)
+        if self.tokens < 0:
+            delay += -self.tokens / self.per_second
+        return delay
+
+    def penalize(self, seconds: float, slowdown: float = 1.0):
+        now = self._refill()
+        self.tokens = min(self.tokens, 1)
+        self.blocked_until = max(self.blocked_until, now + seconds)
+        self.factor = max(self.MIN_FACTOR, self.factor * slowdown)
+
+
+class RateLimiter:
+    def __init__(self, account: Optional[Rate] = None, ip: Optional[Rate] = None,
+                 endpoints: Optional[Dict[str, Rate]] = None):
+        if not isinstance(account, Rate) and account is not None:
+            raise TypeError("'account' must be Rate type or None")
+        if not isinstance(ip, Rate) and ip is not None:
+            raise TypeError("'ip' must be Rate type or None")
+        if not isinstance(endpoints, dict) and endpoints is not None:
+            raise TypeError("'endpoints' must be dict type or None")
+
+        self.account = account
+        self.ip = ip
+        self.endpoints = {} if endpoints is None else endpoints.copy()
+        self._buckets = {}
+        self.requests = 0
+        self.delayed = 0
+        self.wait_time = 0.0
+
+    def get_endpoint_key(self, endpoint: str) -> str:
+        if endpoint in self.endpoints:
+            return endpoint
+        return endpoint.split(":", 1)[0]
+
+    def _get_bucket(self, key: Tuple, rate: Optional[Rate]) -> Optional[TokenBucket]:
+        if rate is None:
+            return None
+        bucket = self._buckets.get(key)
+        if bucket is None or bucket.rate is not rate:
+            bucket = self._buckets[key] = TokenBucket(rate)
+        return bucket
+
+    def get_buckets(self, endpoint: str, account: Optional[str] = None,
+                    ip: Optional[str] = None) -> list:
+        endpoint = self.get_endpoint_key(endpoint)
+        buckets = (
+            self._get_bucket(("account", account), self.account),
+            self._get_bucket(("ip", ip), self.ip),
+            self._get_bucket(("endpoint", account, endpoint), self.endpoints.get(endpoint)),
+        )
+        return [bucket for bucket in buckets if bucket is not None]
+
+    async def acquire(self, endpoint: str, account: Optional[str] = None,
+                      ip: Optional[str] = None) -> float:
+        if not isinstance(endpoint, str):
+            raise TypeError("'endpoint' must be str type")
+
+        delay = max(
+            (bucket.reserve() for bucket in self.get_buckets(endpoint, account, ip)),
+            default=0,
+        )
+        self.requests += 1
+        if delay > 0:
+            self.delayed += 1
+            self.wait_time += delay
+            await asyncio.sleep(delay)
+        return delay
+
+    def penalize(self, seconds: float, endpoint: str, account: Optional[str] = None,
+                 ip: Optional[str] = None, slowdown: float = 1.0) -> bool:
+        if not isinstance(seconds, (int, float)):
+            raise TypeError("'seconds' must be int or float type")
+        if not isinstance(slowdown, (int, float)):
+            raise TypeError("'slowdown' must be int or float type")
+
+        blocked = False
+        for bucket in self.get_buckets(endpoint, account, ip):
+            bucket.penalize(seconds, slowdown)
+            blocked = True
+        return blocked
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "delayed": self.delayed,
+            "wait_time": self.wait_time,
+            "buckets": len(self._buckets),
+        }
@@ -0,0 +1,184 @@
+from collections import OrderedDict
+import sqlite3
+import time
+from typing import (
+    Dict,
+    Optional,
+)
+
+
+class ResponseCacheBackend:
+    def get(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: str, ttl: float):
+        raise NotImplementedError
+
+    def delete_prefix(self, prefix: str) -> int:
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class MemoryResponseCacheBackend(ResponseCacheBackend):
+    def __init__(self, max_size: int = 1024):
+        if not isinstance(max_size, int):
+            raise TypeError("'max_size' must be int type")
+
+        self.max_size = max_size
+        self._data = OrderedDict()
+
+    def get(self, key: str) -> Optional[str]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: str, ttl: float):
+        self._data[key] = (value, time.monotonic() + ttl)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def delete_prefix(self, prefix: str) -> int:
+        keys = [key for key in self._data if key.startswith(prefix)]
+        for key in keys:
+            del self._data[key]
+        return len(keys)
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SQLiteResponseCacheBackend(ResponseCacheBackend):
+    def __init__(self, path: str):
+        if not isinstance(path, str):
+            raise TypeError("'path' must be str type")
+
+        self.path = path
+        self._connection = sqlite3.connect(path)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._connection.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        row = self._connection.execute(
+            "SELECT value FROM responses WHERE key = ? AND expires_at > ?",
+            (key, time.time()),
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def set(self, key: str, value: str, ttl: float):
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?)",
+                (key, value, time.time() + ttl),
+            )
+
+    def delete_prefix(self, prefix: str) -> int:
+        with self._connection:
+            cursor = self._connection.execute(
+                "DELETE FROM responses WHERE substr(key, 1, ?) = ?",
+                (len(prefix), prefix),
+            )
+        return cursor.rowcount
+
+    def clear(self):
+        with self._connection:
+            self._connection.execute("DELETE FROM responses")
+
+    def close(self):
+        self._connection.close()
+
+
+class ResponseCache:
+    TTLS = {
+        "Account": 300,
+        "Media": 120,
+        "Location": 600,
+        "Tag": 60,
+    }
+
+    def __init__(self, backend: Optional[ResponseCacheBackend] = None,
+                 ttls: Optional[Dict[str, float]] = None, default_ttl: float = 60):
+        if not isinstance(backend, ResponseCacheBackend) and backend is not None:
+            raise TypeError("'backend' must be ResponseCacheBackend type or None")
+        if not isinstance(ttls, dict) and ttls is not None:
+            raise TypeError("'ttls' must be dict type or None")
+        if not isinstance(default_ttl, (int, float)):
+            raise TypeError("'default_ttl' must be int or float type")
+
+        self.backend = MemoryResponseCacheBackend() if backend is None else backend
+        self.ttls = dict(self.TTLS)
+        if ttls is not None:
+            self.ttls.update(ttls)
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def get_key(owner: str, query_hash: str = "", variables: str = "") -> str:
+        return "%s|%s|%s" % (owner.rstrip("/"), query_hash, variables)
+
+    def get_kind(self, entity) -> str:
+        for cls in type(entity).__mro__:
+            if cls.__name__ in self.ttls:
+                return cls.__name__
+        return type(entity).__name__
+
+    def get_ttl(self, kind: str) -> float:
+        return self.ttls.get(kind, self.default_ttl)
+
+    def get(self, kind: str, owner: str, query_hash: str = "",
+            variables: str = "") -> Optional[str]:
+        if self.get_ttl(kind) <= 0:
+            return None
+        value = self.backend.get(self.get_key(owner, query_hash, variables))
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, kind: str, owner: str, value: str, query_hash: str = "",
+            variables: str = ""):
+        ttl = self.get_ttl(kind)
+        if ttl > 0:
+            self.backend.set(self.get_key(owner, query_hash, variables), value, ttl)
+
+    def invalidate(self, owner: str) -> int:
+        count = self.backend.delete_prefix(owner.rstrip("/") + "|")
+        self.invalidations += count
+        return count
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+            "invalidations": self.invalidations,
+        }
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
@@ -0,0 +1,70 @@
+import asyncio
+from email.utils import parsedate_to_datetime
+import random
+import time
+from typing import (
+    Iterable,
+    Optional,
+)
+
+import aiohttp
+
+
+class RetryPolicy:
+    STATUSES = (429, 500, 502, 503, 504)
+    EXCEPTIONS = (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError)
+
+    def __init__(self, attempts: int = 5, backoff: float = 1.0, max_backoff: float = 60.0,
+                 jitter: float = 0.5, statuses: Optional[Iterable[int]] = None,
+                 exceptions: Optional[Iterable[type]] = None, retry_actions: bool = False,
+                 slowdown: float = 0.5):
+        if not isinstance(attempts, int):
+            raise TypeError("'attempts' must be int type")
+        if not isinstance(backoff, (int, float)):
+            raise TypeError("'backoff' must be int or float type")
+        if not isinstance(max_backoff, (int, float)):
+            raise TypeError("'max_backoff' must be int or float type")
+        if not isinstance(jitter, (int, float)):
+            raise TypeError("'jitter' must be int or float type")
+        if not isinstance(retry_actions, bool):
+            raise TypeError("'retry_actions' must be bool type")
+        if not isinstance(slowdown, (int, float)):
+            raise TypeError("'slowdown' must be int or float type")
+        if attempts < 1:
+            raise ValueError("'attempts' must be positive")
+        if not 0 <= jitter <= 1:
+            raise ValueError("'jitter' must be between 0 and 1")
+
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.statuses = frozenset(self.STATUSES if statuses is None else statuses)
+        self.exceptions = tuple(self.EXCEPTIONS if exceptions is None else exceptions)
+        self.retry_actions = retry_actions
+        self.slowdown = slowdown
+
+    def is_retryable(self, endpoint: str) -> bool:
+        return self.retry_actions or not endpoint.startswith("action")
+
+    def is_retryable_status(self, status: int) -> bool:
+        return status in self.statuses
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        if not value:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        try:
+            return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+        except (TypeError, ValueError):
+            return None
+
+    def get_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        if retry_after is not None:
+            return retry_after
+        delay = min(self.max_backoff, self.backoff * 2 ** attempt)
+        return delay * (1 - self.jitter * random.random())
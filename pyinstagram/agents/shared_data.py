@@ -0,0 +1,103 @@
+import json
+import re
+from typing import Optional
+
+from . import decoders
+
+
+SHARED_DATA_MARKER = "window._sharedData"
+SHARED_DATA_REGEX = re.compile(
+    r"<script[^>]*>\s*window._sharedData\s*=\s*((?!<script>).*)\s*;\s*</script>",
+)
+SCRIPT_END = "</script>"
+
+_json_decoder = json.JSONDecoder()
+
+
+def find_shared_data_regex(content: str) -> Optional[dict]:
+    match = SHARED_DATA_REGEX.search(content)
+    if match:
+        return decoders.loads(match.group(1))
+
+
+def find_shared_data_start(content: str, start: int = 0) -> int:
+    index = content.find(SHARED_DATA_MARKER, start)
+    if index == -1:
+        return -1
+    index = content.find("=", index + len(SHARED_DATA_MARKER))
+    if index == -1:
+        return -1
+    return content.find("{", index + 1)
+
+
+def find_shared_data(content: str) -> Optional[dict]:
+    start = find_shared_data_start(content)
+    if start == -1:
+        return find_shared_data_regex(content)
+
+    end = content.find(SCRIPT_END, start)
+    if end != -1:
+        try:
+            return decoders.loads(content[start:end].rstrip().rstrip(";"))
+        except ValueError:
+            pass
+
+    try:
+        return _json_decoder.raw_decode(content, start)[0]
+    except ValueError:
+        return find_shared_data_regex(content)
+
+
+class SharedDataReader:
+    def __init__(self):
+        self.chunks = []
+        self.length = 0
+        self.window = ""
+        self.start = -1
+        self.position = 0
+        self.data = None
+
+    @property
+    def content(self) -> str:
+        if len(self.chunks) > 1:
+            self.chunks = ["".join(self.chunks)]
+        return self.chunks[0] if self.chunks else ""
+
+    def _move(self, position: int):
+        self.window = self.window[position - self.position:]
+        self.position = position
+
+    def feed(self, text: str) -> bool:
+        if self.data is not None:
+            return True
+        self.chunks.append(text)
+        self.length += len(text)
+        self.window += text
+
+        if self.start == -1:
+            marker = self.window.find(SHARED_DATA_MARKER)
+            if marker == -1:
+                self._move(max(self.length - len(SHARED_DATA_MARKER), self.position))
+                return False
+            start = find_shared_data_start(self.window, marker)
+            if start == -1:
+                self._move(self.position + marker)
+                return False
+            self.start = self.position + start
+            self._move(self.start)
+
+        while True:
+            end = self.window.find(SCRIPT_END)
+            if end == -1:
+                self._move(max(self.length - len(SCRIPT_END), self.position))
+                return False
+            end += self.position
+            self._move(end + len(SCRIPT_END))
+            content = self.content
+            try:
+                self.data = decoders.loads(content[self.start:end].rstrip().rstrip(";"))
+            except ValueError:
+                continue
+            self.chunks = [content[:self.position]]
+            self.window = ""
+            return True
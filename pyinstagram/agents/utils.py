@@ -1,11 +1,118 @@
 import asyncio
+import concurrent.futures
+import functools
+import threading
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Optional,
+    Tuple,
+)
+
+
+class LoopThread:
+    def __init__(self, name: str = "pyinstagram-loop"):
+        if not isinstance(name, str):
+            raise TypeError("'name' must be str type")
+
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    @property
+    def closed(self) -> bool:
+        return self.loop.is_closed()
+
+    def in_thread(self) -> bool:
+        return threading.current_thread() is self._thread
+
+    def submit(self, coroutine: Awaitable) -> concurrent.futures.Future:
+        if self.closed:
+            coroutine.close()
+            raise RuntimeError("Loop thread is closed")
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def run(self, coroutine: Awaitable):
+        if self.in_thread():
+            coroutine.close()
+            raise RuntimeError("Can not wait for result inside loop thread")
+        return self.submit(coroutine).result()
+
+    def call(self, function: Callable, *args, **kwargs):
+        async def call():
+            return function(*args, **kwargs)
+        return self.run(call())
+
+    def stop(self):
+        if self.closed:
+            return
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+        self.loop.close()
+
+
+class SyncAgent:
+    def __init__(self, *args, loop_thread: Optional[LoopThread] = None, **kwargs):
+        if not isinstance(loop_thread, LoopThread) and loop_thread is not None:
+            raise TypeError("'loop_thread' must be LoopThread type or None")
+
+        self._loop_thread_owner = loop_thread is None
+        self.loop_thread = LoopThread() if loop_thread is None else loop_thread
+        try:
+            self.loop_thread.call(super().__init__, *args, **kwargs)
+        except BaseException:
+            if self._loop_thread_owner:
+                self.loop_thread.stop()
+            raise
+
+    def close(self):
+        try:
+            self.loop_thread.run(super().close())
+        finally:
+            if self._loop_thread_owner:
+                self.loop_thread.stop()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+async def bounded(function: Callable[[Any], Awaitable], items: Iterable, limit: int,
+                  ) -> AsyncIterator[Tuple[int, asyncio.Future]]:
+    items = enumerate(items)
+    pending = {}
+    try:
+        while True:
+            for index, item in items:
+                pending[asyncio.ensure_future(function(item))] = index
+                if len(pending) >= limit:
+                    break
+            if not pending:
+                break
+            finished, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in finished:
+                yield pending.pop(task), task
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
 
 
 def sync(coroutine):
-    def wrapper(*args, **kwargs):
-        loop = asyncio.get_event_loop()
-        future = coroutine(*args, **kwargs)
-        if not loop.is_running():
-            return loop.run_until_complete(future)
-        return future
+    @functools.wraps(coroutine)
+    def wrapper(self, *args, **kwargs):
+        future = coroutine(self, *args, **kwargs)
+        if self.loop_thread.in_thread():
+            return future
+        return self.loop_thread.run(future)
     return wrapper
@@ -1,15 +1,20 @@
 from .async_web_account_agent import AsyncWebAccountAgent
-from .utils import sync
+from .utils import (
+    SyncAgent,
+    sync,
+)
 
 
-class WebAccountAgent(AsyncWebAccountAgent):
+class WebAccountAgent(SyncAgent, AsyncWebAccountAgent):
     login = sync(AsyncWebAccountAgent.login)
     checkpoint_handle = sync(AsyncWebAccountAgent.checkpoint_handle)
     checkpoint_send = sync(AsyncWebAccountAgent.checkpoint_send)
     checkpoint_replay = sync(AsyncWebAccountAgent.checkpoint_replay)
     checkpoint = sync(AsyncWebAccountAgent.checkpoint)
     update = sync(AsyncWebAccountAgent.update)
+    map_update = sync(AsyncWebAccountAgent.map_update)
     get_media = sync(AsyncWebAccountAgent.get_media)
+    map_get_media = sync(AsyncWebAccountAgent.map_get_media)
     get_follows = sync(AsyncWebAccountAgent.get_follows)
     get_followers = sync(AsyncWebAccountAgent.get_followers)
     stories = sync(AsyncWebAccountAgent.stories)
@@ -1,9 +1,14 @@
 from .async_web_agent import AsyncWebAgent
-from .utils import sync
+from .utils import (
+    SyncAgent,
+    sync,
+)
 
 
-class WebAgent(AsyncWebAgent):
+class WebAgent(SyncAgent, AsyncWebAgent):
     update = sync(AsyncWebAgent.update)
+    map_update = sync(AsyncWebAgent.map_update)
     get_media = sync(AsyncWebAgent.get_media)
+    map_get_media = sync(AsyncWebAgent.map_get_media)
     get_likes = sync(AsyncWebAgent.get_likes)
     get_comments = sync(AsyncWebAgent.get_comments)
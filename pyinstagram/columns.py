@@ -0,0 +1,140 @@
+from array import array
+import sys
+from typing import (
+    Iterable,
+    Optional,
+)
+
+from .entities import (
+    Account,
+    Media,
+)
+
+
+class Columns:
+    int_columns = ()
+    bool_columns = ()
+    str_columns = ()
+
+    def __init__(self, nodes: Iterable[dict] = (), pointer: Optional[str] = None):
+        for name in self.int_columns:
+            setattr(self, name, array("q"))
+        for name in self.bool_columns:
+            setattr(self, name, array("b"))
+        for name in self.str_columns:
+            setattr(self, name, [])
+        self.pointer = pointer
+        self.extend(nodes)
+
+    @staticmethod
+    def _to_int(value) -> int:
+        return -1 if value is None else int(value)
+
+    @staticmethod
+    def _from_int(value: int) -> Optional[int]:
+        return None if value == -1 else value
+
+    @staticmethod
+    def _to_bool(value) -> int:
+        return -1 if value is None else int(value)
+
+    @staticmethod
+    def _from_bool(value: int) -> Optional[bool]:
+        return None if value == -1 else bool(value)
+
+    def append(self, node: dict):
+        raise NotImplementedError
+
+    def extend(self, nodes):
+        if isinstance(nodes, Columns):
+            if not isinstance(nodes, self.__class__):
+                raise TypeError("'nodes' must be %s type" % self.__class__.__name__)
+            for name in self.int_columns + self.bool_columns + self.str_columns:
+                getattr(self, name).extend(getattr(nodes, name))
+            return
+        for node in nodes:
+            self.append(node)
+
+    def materialize(self, index: int):
+        raise NotImplementedError
+
+    def __len__(self):
+        return len(getattr(self, self.str_columns[0]))
+
+    def __getitem__(self, index: int):
+        if not isinstance(index, int):
+            raise TypeError("'index' must be int type")
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("%s index out of range" % self.__class__.__name__)
+        return self.materialize(index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __repr__(self):
+        return "%s(%d rows, pointer=%r)" % (self.__class__.__name__, len(self), self.pointer)
+
+
+class AccountColumns(Columns):
+    int_columns = ("id",)
+    bool_columns = ("is_verified",)
+    str_columns = ("username", "full_name", "profile_pic_url")
+
+    def append(self, node: dict):
+        self.id.append(self._to_int(node.get("id")))
+        self.username.append(sys.intern(node["username"]))
+        self.full_name.append(node.get("full_name"))
+        self.profile_pic_url.append(node.get("profile_pic_url"))
+        self.is_verified.append(self._to_bool(node.get("is_verified")))
+
+    def materialize(self, index: int) -> Account:
+        account = Account(self.username[index])
+        account_id = self._from_int(self.id[index])
+        account.id = None if account_id is None else str(account_id)
+        account.full_name = self.full_name[index]
+        account.profile_pic_url = self.profile_pic_url[index]
+        account.is_verified = self._from_bool(self.is_verified[index])
+        return account
+
+
+class MediaColumns(Columns):
+    int_columns = ("id", "owner_id", "date", "likes_count", "comments_count")
+    bool_columns = ("is_video",)
+    str_columns = ("code", "display_url")
+
+    def append(self, node: dict):
+        if "edge_media_preview_like" in node:
+            likes_count = node["edge_media_preview_like"]["count"]
+        elif "edge_liked_by" in node:
+            likes_count = node["edge_liked_by"]["count"]
+        else:
+            likes_count = None
+        if "edge_media_to_comment" in node:
+            comments_count = node["edge_media_to_comment"]["count"]
+        elif "edge_media_to_parent_comment" in node:
+            comments_count = node["edge_media_to_parent_comment"]["count"]
+        else:
+            comments_count = None
+
+        self.id.append(self._to_int(node.get("id")))
+        self.owner_id.append(self._to_int(node.get("owner", {}).get("id")))
+        self.date.append(self._to_int(node.get("taken_at_timestamp")))
+        self.likes_count.append(self._to_int(likes_count))
+        self.comments_count.append(self._to_int(comments_count))
+        self.is_video.append(self._to_bool(node.get("is_video")))
+        self.code.append(sys.intern(node["shortcode"]))
+        self.display_url.append(node.get("display_url"))
+
+    def materialize(self, index: int) -> Media:
+        media = Media(self.code[index])
+        media_id = self._from_int(self.id[index])
+        media.id = None if media_id is None else str(media_id)
+        media.date = self._from_int(self.date[index])
+        media.likes_count = self._from_int(self.likes_count[index])
+        media.comments_count = self._from_int(self.comments_count[index])
+        media.is_video = self._from_bool(self.is_video[index])
+        media.display_url = self.display_url[index]
+        return media
@@ -1,30 +1,200 @@
+from collections import OrderedDict
+from collections.abc import MutableMapping
+import time
 from typing import (
     Any,
     Dict,
     Iterable,
+    Optional,
 )
 from urllib.parse import urljoin
+import weakref
+
+
+class EntityCache(MutableMapping):
+    def __init__(self):
+        self._data = self._create_storage()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _create_storage(self):
+        return dict()
+
+    def lookup(self, key: str):
+        value = self._data.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __getitem__(self, key: str):
+        return self._data[key]
+
+    def __setitem__(self, key: str, value):
+        self._data[key] = value
+
+    def __delitem__(self, key: str):
+        del self._data[key]
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def clear(self):
+        self._data.clear()
+
+    def __repr__(self):
+        return "%s(%s)" % (self.__class__.__name__, self.stats())
+
+
+class LRUEntityCache(EntityCache):
+    def __init__(self, max_size: int):
+        if not isinstance(max_size, int):
+            raise TypeError("'max_size' must be int type")
+        if max_size <= 0:
+            raise ValueError("'max_size' must be greater than 0")
+
+        super().__init__()
+        self.max_size = max_size
+
+    def _create_storage(self):
+        return OrderedDict()
+
+    def lookup(self, key: str):
+        value = super().lookup(key)
+        if value is not None:
+            self._data.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: str, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+
+class TTLEntityCache(EntityCache):
+    def __init__(self, ttl: float, max_size: Optional[int] = None):
+        if not isinstance(ttl, (int, float)):
+            raise TypeError("'ttl' must be int or float type")
+        if not isinstance(max_size, int) and max_size is not None:
+            raise TypeError("'max_size' must be int type or None")
+
+        super().__init__()
+        self.ttl = ttl
+        self.max_size = max_size
+
+    def _create_storage(self):
+        return OrderedDict()
+
+    def _expire(self):
+        now = time.monotonic()
+        while self._data:
+            key, (value, expires_at) = next(iter(self._data.items()))
+            if expires_at > now:
+                break
+            del self._data[key]
+            self.evictions += 1
+
+    def lookup(self, key: str):
+        self._expire()
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return item[0]
+
+    def __getitem__(self, key: str):
+        self._expire()
+        return self._data[key][0]
+
+    def __setitem__(self, key: str, value):
+        self._expire()
+        self._data[key] = (value, time.monotonic() + self.ttl)
+        self._data.move_to_end(key)
+        if self.max_size is not None:
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def __contains__(self, key):
+        self._expire()
+        return key in self._data
+
+    def __len__(self):
+        self._expire()
+        return len(self._data)
+
+
+class WeakEntityCache(EntityCache):
+    def _create_storage(self):
+        return weakref.WeakValueDictionary()
+
+
+class LazySet:
+    def __set_name__(self, owner, name):
+        self.name = "_" + name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = getattr(instance, self.name, None)
+        if value is None:
+            value = set()
+            setattr(instance, self.name, value)
+        return value
+
+    def __set__(self, instance, value):
+        setattr(instance, self.name, value)
 
 
 class EntityConstructor(type):
     def __new__(cls, name: str, classes: Iterable[type], fields: Dict[str, Any]):
-        fields["cache"] = dict()
+        if "cache" not in fields:
+            fields["cache"] = EntityCache()
 
         return super().__new__(cls, name, classes, fields)
 
 
 class Entity(metaclass=EntityConstructor):
+    __slots__ = ("__weakref__",)
+
     def __new__(cls, key, *args, **kwargs):
-        if not str(key) in cls.cache:
-            cls.cache[str(key)] = super().__new__(cls)
+        key = str(key)
+        instance = cls.cache.lookup(key)
+        if instance is None:
+            instance = super().__new__(cls)
+            cls.cache[key] = instance
 
-        return cls.cache[str(key)]
+        return instance
 
     def __repr__(self):
         return str(self.__getattribute__(self.primary_key))
 
     def delete(self):
-        key = self.__getattribute__(self.primary_key)
+        key = str(self.__getattribute__(self.primary_key))
         if key in self.cache:
             del self.cache[key]
 
@@ -32,12 +202,37 @@ class Entity(metaclass=EntityConstructor):
     def clear_cache(cls):
         cls.cache.clear()
 
+    @classmethod
+    def set_cache(cls, cache: EntityCache):
+        if not isinstance(cache, EntityCache):
+            raise TypeError("'cache' must be EntityCache type")
+
+        for key, value in list(cls.cache.items()):
+            cache[key] = value
+        cls.cache = cache
+
     @property
     def primary_key(self):
         raise NotImplementedError
 
+    web_fields = ()
+
+    @classmethod
+    def get_web_fields(cls, fields: Iterable[str]) -> tuple:
+        if isinstance(fields, str) or not isinstance(fields, Iterable):
+            raise TypeError("'fields' must be iterable of str")
+        fields = tuple(fields)
+        unknown = [name for name in fields if name not in cls.web_fields]
+        if unknown:
+            raise ValueError("Unknown %s fields: %s" % (
+                cls.__name__, ", ".join(map(repr, unknown)),
+            ))
+        return fields
+
 
 class UpdatableEntity(Entity):
+    __slots__ = ("updated_at",)
+
     def get_web_path(self):
         return urljoin(self.web_base_path, str(getattr(self, self.primary_key)))
 
@@ -55,7 +250,15 @@ class UpdatableEntity(Entity):
     def web_base_path(self):
         raise NotImplementedError
 
-    def set_web_data(self, data):
+    web_decoders = {}
+
+    def set_web_fields(self, data, fields: Iterable[str]):
+        decoders = self.web_decoders
+        for name in fields:
+            if name in decoders:
+                setattr(self, name, decoders[name](self, data))
+
+    def set_web_data(self, data, fields=None):
         raise NotImplementedError
 
     def set_mobile_data(self, data):
@@ -63,6 +266,8 @@ class UpdatableEntity(Entity):
 
 
 class HasMediaEntity(UpdatableEntity):
+    __slots__ = ()
+
     @classmethod
     def get_from_web_media_path(cls, data):
         for key in cls.web_media_path:
@@ -79,6 +284,11 @@ class HasMediaEntity(UpdatableEntity):
 
 
 class Account(HasMediaEntity):
+    __slots__ = (
+        "id", "username", "full_name", "profile_pic_url", "profile_pic_url_hd", "fb_page",
+        "biography", "follows_count", "followers_count", "media_count", "is_private",
+        "is_verified", "country_block", "_media", "_follows", "_followers",
+    )
     primary_key = "username"
     web_entry_data_path = ("ProfilePage", 0, "graphql", "user")
     web_base_path = ""
@@ -86,6 +296,7 @@ class Account(HasMediaEntity):
     web_media_query_hash = "c6809c9c025875ac6f02619eae97a80e"
 
     def __init__(self, username):
+        self.updated_at = None
         self.id = None
         self.username = username
         self.full_name = None
@@ -100,12 +311,39 @@ class Account(HasMediaEntity):
         self.is_verified = None
         self.country_block = None
 
-        self.media = set()
-        self.follows = set()
-        self.followers = set()
-
-    def set_web_data(self, data):
+        self._media = None
+        self._follows = None
+        self._followers = None
+
+    media = LazySet()
+    follows = LazySet()
+    followers = LazySet()
+
+    web_fields = (
+        "id", "username", "full_name", "profile_pic_url", "profile_pic_url_hd", "fb_page",
+        "biography", "follows_count", "followers_count", "media_count", "is_private",
+        "is_verified", "country_block",
+    )
+    web_decoders = {
+        "id": lambda self, data: data["id"],
+        "full_name": lambda self, data: data["full_name"],
+        "profile_pic_url": lambda self, data: data["profile_pic_url"],
+        "profile_pic_url_hd": lambda self, data: data["profile_pic_url_hd"],
+        "fb_page": lambda self, data: data["connected_fb_page"],
+        "biography": lambda self, data: data["biography"],
+        "follows_count": lambda self, data: data["edge_follow"]["count"],
+        "followers_count": lambda self, data: data["edge_followed_by"]["count"],
+        "media_count": lambda self, data: data["edge_owner_to_timeline_media"]["count"],
+        "is_private": lambda self, data: data["is_private"],
+        "is_verified": lambda self, data: data["is_verified"],
+        "country_block": lambda self, data: data["country_block"],
+    }
+
+    def set_web_data(self, data, fields=None):
         self.id = data["id"]
+        if fields is not None:
+            self.set_web_fields(data, fields)
+            return
         self.full_name = data["full_name"]
         self.profile_pic_url = data["profile_pic_url"]
         self.profile_pic_url_hd = data["profile_pic_url_hd"]
@@ -134,11 +372,17 @@ class Account(HasMediaEntity):
 
 
 class Media(UpdatableEntity):
+    __slots__ = (
+        "id", "code", "caption", "owner", "date", "location", "likes_count", "comments_count",
+        "comments_disabled", "is_video", "video_url", "is_ad", "display_url", "resources",
+        "is_album", "_album", "_likes", "_comments", "_web_data", "_web_fields",
+    )
     primary_key = "code"
     web_entry_data_path = ("PostPage", 0, "graphql", "shortcode_media")
     web_base_path = "p/"
 
     def __init__(self, code):
+        self.updated_at = None
         self.id = None
         self.code = code
         self.caption = None
@@ -155,30 +399,187 @@ class Media(UpdatableEntity):
         self.resources = None
         self.is_album = None
 
-        self.album = set()
-        self.likes = set()
-        self.comments = set()
+        self._album = None
+        self._likes = None
+        self._comments = None
+        self._web_data = None
+        self._web_fields = None
 
-    def set_web_data(self, data):
+    album = LazySet()
+    likes = LazySet()
+    comments = LazySet()
+
+    def _decode_caption(self, data):
+        if data["edge_media_to_caption"]["edges"]:
+            return data["edge_media_to_caption"]["edges"][0]["node"]["text"]
+        return None
+
+    def _decode_owner(self, data):
+        if "username" in data["owner"]:
+            return Account(data["owner"]["username"])
+        return None
+
+    def _decode_date(self, data):
+        return data["taken_at_timestamp"]
+
+    def _decode_location(self, data):
+        if "location" in data and data["location"] and "id" in data["location"]:
+            return Location(data["location"]["id"])
+        return None
+
+    def _decode_likes_count(self, data):
+        if "edge_media_preview_like" in data:
+            return data["edge_media_preview_like"]["count"]
+        return data["edge_liked_by"]
+
+    def _decode_comments_count(self, data):
+        if "edge_media_to_comment" in data:
+            return data["edge_media_to_comment"]["count"]
+        return data["edge_media_to_parent_comment"]["count"]
+
+    def _decode_comments_disabled(self, data):
+        return data["comments_disabled"]
+
+    def _decode_is_video(self, data):
+        return data["is_video"]
+
+    def _decode_video_url(self, data):
+        return data.get("video_url") if data["is_video"] else None
+
+    def _decode_is_ad(self, data):
+        return data.get("is_ad")
+
+    def _decode_display_url(self, data):
+        return data["display_url"]
+
+    def _decode_resources(self, data):
+        if "display_resources" in data:
+            return [resource["src"] for resource in data["display_resources"]]
+        return [resource["src"] for resource in data["thumbnail_resources"]]
+
+    def _decode_is_album(self, data):
+        return data.get("__typename") == "GraphSidecar"
+
+    def _decode_album(self, data):
+        if "edge_sidecar_to_children" not in data:
+            return None
+        album = set()
+        for edge in data["edge_sidecar_to_children"]["edges"]:
+            if edge["node"].get("shortcode", self.code) != self.code:
+                child = Media(edge["node"]["shortcode"])
+                child.id = edge["node"]["id"]
+                child.is_video = edge["node"]["is_video"]
+                if child.is_video and "video_url" in edge["node"]:
+                    child.video_url = edge["node"]["video_url"]
+                child.display_url = edge["node"]["display_url"]
+                if "display_resources" in edge["node"]:
+                    child.resources = [resource["src"] for resource in edge["node"]["display_resources"]]
+                elif "thumbnail_resources" in edge["node"]:
+                    child.resources = [resource["src"] for resource in edge["node"]["thumbnail_resources"]]
+                child.is_album = False
+                album.add(child)
+        return album
+
+    web_fields = (
+        "id", "code", "caption", "owner", "date", "location", "likes_count", "comments_count",
+        "comments_disabled", "is_video", "video_url", "is_ad", "display_url", "resources",
+        "is_album", "album",
+    )
+    web_decoders = {
+        "id": lambda self, data: data["id"],
+        "caption": _decode_caption,
+        "owner": _decode_owner,
+        "date": _decode_date,
+        "location": _decode_location,
+        "likes_count": _decode_likes_count,
+        "comments_count": _decode_comments_count,
+        "comments_disabled": _decode_comments_disabled,
+        "is_video": _decode_is_video,
+        "video_url": _decode_video_url,
+        "is_ad": _decode_is_ad,
+        "display_url": _decode_display_url,
+        "resources": _decode_resources,
+        "is_album": _decode_is_album,
+        "_album": _decode_album,
+        "album": _decode_album,
+    }
+
+    def __getattr__(self, name):
+        decoder = Media.web_decoders.get(name)
+        data = None if decoder is None else self._web_data
+        if data is None:
+            raise AttributeError("'%s' object has no attribute '%s'" % (type(self).__name__, name))
+        fields = self._web_fields
+        value = decoder(self, data) if fields is None or name in fields else None
+        setattr(self, name, value)
+        return value
+
+    def _get_web_slots(self, data):
+        fields = [
+            "caption", "date", "likes_count", "comments_count", "comments_disabled",
+            "is_video", "display_url", "resources", "is_album", "_album",
+        ]
+        if "username" in data["owner"]:
+            fields.append("owner")
+        if "location" in data and data["location"] and "id" in data["location"]:
+            fields.append("location")
+        if data["is_video"] and "video_url" in data:
+            fields.append("video_url")
+        if "is_ad" in data:
+            fields.append("is_ad")
+        return fields
+
+    @classmethod
+    def from_web_data(cls, data, lazy: bool = False, fields=None):
+        if not lazy:
+            media = cls(data["shortcode"])
+            media.set_web_data(data, fields=fields)
+            return media
+        key = str(data["shortcode"])
+        media = cls.cache.lookup(key)
+        if media is not None:
+            media.set_web_data(data, lazy=True, fields=fields)
+            return media
+        media = object.__new__(cls)
+        media.updated_at = None
+        media.id = data["id"]
+        media.code = data["shortcode"]
+        media._likes = None
+        media._comments = None
+        media._web_data = data
+        media._web_fields = None if fields is None else cls._get_web_slot_names(fields)
+        cls.cache[key] = media
+        return media
+
+    @staticmethod
+    def _get_web_slot_names(fields) -> frozenset:
+        fields = frozenset(fields)
+        return fields | {"_album"} if "album" in fields else fields
+
+    def set_web_data(self, data, lazy: bool = False, fields=None):
         self.id = data["id"]
         self.code = data["shortcode"]
-        if data["edge_media_to_caption"]["edges"]:
-            self.caption = data["edge_media_to_caption"]["edges"][0]["node"]["text"]
-        else:
-            self.caption = None
+        if lazy:
+            self._set_lazy_web_data(data, fields)
+            return
+        if fields is not None:
+            if self._web_data is not None:
+                self._web_data = data
+            self.set_web_fields(data, fields)
+            return
+        if self._web_data is not None:
+            for name in ("owner", "location", "video_url", "is_ad"):
+                getattr(self, name)
+            self._web_data = None
+            self._web_fields = None
+        self.caption = self._decode_caption(data)
         if "username" in data["owner"]:
             self.owner = Account(data["owner"]["username"])
         self.date = data["taken_at_timestamp"]
         if "location" in data and data["location"] and "id" in data["location"]:
             self.location = Location(data["location"]["id"])
-        if "edge_media_preview_like" in data:
-            self.likes_count = data["edge_media_preview_like"]["count"]
-        elif "edge_liked_by":
-            self.likes_count = data["edge_liked_by"]
-        if "edge_media_to_comment" in data:
-            self.comments_count = data["edge_media_to_comment"]["count"]
-        else:
-            self.comments_count = data["edge_media_to_parent_comment"]["count"]
+        self.likes_count = self._decode_likes_count(data)
+        self.comments_count = self._decode_comments_count(data)
         self.comments_disabled = data["comments_disabled"]
         self.is_video = data["is_video"]
         if self.is_video and "video_url" in data:
@@ -186,30 +587,40 @@ class Media(UpdatableEntity):
         if "is_ad" in data:
             self.is_ad = data["is_ad"]
         self.display_url = data["display_url"]
-        if "display_resources" in data:
-            self.resources = [resource["src"] for resource in data["display_resources"]]
-        else:
-            self.resources = [resource["src"] for resource in data["thumbnail_resources"]]
-        self.album = set()
+        self.resources = self._decode_resources(data)
         self.is_album = data.get("__typename") == "GraphSidecar"
-        if "edge_sidecar_to_children" in data:
-            for edge in data["edge_sidecar_to_children"]["edges"]:
-                if edge["node"].get("shortcode", self.code) != self.code:
-                    child = Media(edge["node"]["shortcode"])
-                    child.id = edge["node"]["id"]
-                    child.is_video = edge["node"]["is_video"]
-                    if child.is_video and "video_url" in edge["node"]:
-                        child.video_url = edge["node"]["video_url"]
-                    child.display_url = edge["node"]["display_url"]
-                    if "display_resources" in edge["node"]:
-                        child.resources = [resource["src"] for resource in edge["node"]["display_resources"]]
-                    elif "thumbnail_resources" in edge["node"]:
-                        child.resources = [resource["src"] for resource in edge["node"]["thumbnail_resources"]]
-                    child.is_album = False
-                    self.album.add(child)
+        self._album = self._decode_album(data)
+
+    def _set_lazy_web_data(self, data, fields=None):
+        names = self._get_web_slots(data)
+        if fields is None:
+            self._web_fields = None
+        else:
+            fields = self._get_web_slot_names(fields)
+            names = [name for name in names if name in fields]
+            if self._web_data is None:
+                self._web_fields = fields
+            elif self._web_fields is not None:
+                self._web_fields = self._web_fields | fields
+        self._web_data = data
+        for name in names:
+            try:
+                delattr(self, name)
+            except AttributeError:
+                pass
+
+    def hydrate(self):
+        if self._web_data is None:
+            return
+        for name in Media.web_decoders:
+            if name != "album":
+                getattr(self, name)
+        self._web_data = None
+        self._web_fields = None
 
 
 class Story(Entity):
+    __slots__ = ("id",)
     primary_key = "id"
 
     def __init__(self, id):
@@ -217,6 +628,10 @@ class Story(Entity):
 
 
 class Location(HasMediaEntity):
+    __slots__ = (
+        "id", "slug", "name", "has_public_page", "directory", "coordinates", "media_count",
+        "_media", "_top_posts",
+    )
     primary_key = "id"
     web_entry_data_path = ("LocationsPage", 0, "graphql", "location")
     web_base_path = "explore/locations/"
@@ -224,6 +639,7 @@ class Location(HasMediaEntity):
     web_media_query_hash = "ac38b90f0f3981c42092016a37c59bf7"
 
     def __init__(self, id):
+        self.updated_at = None
         self.id = id
         self.slug = None
         self.name = None
@@ -232,11 +648,34 @@ class Location(HasMediaEntity):
         self.coordinates = None
         self.media_count = None
 
-        self.media = set()
-        self.top_posts = set()
-
-    def set_web_data(self, data):
+        self._media = None
+        self._top_posts = None
+
+    media = LazySet()
+    top_posts = LazySet()
+
+    web_fields = (
+        "id", "slug", "name", "has_public_page", "directory", "coordinates", "media_count",
+        "top_posts",
+    )
+    web_decoders = {
+        "id": lambda self, data: data["id"],
+        "slug": lambda self, data: data["slug"],
+        "name": lambda self, data: data["name"],
+        "has_public_page": lambda self, data: data["has_public_page"],
+        "directory": lambda self, data: data.get("directory", self.directory),
+        "coordinates": lambda self, data: (data["lat"], data["lng"]),
+        "media_count": lambda self, data: data["edge_location_to_media"]["count"],
+        "top_posts": lambda self, data: self.top_posts.union(
+            Media(node["node"]["shortcode"]) for node in data["edge_location_to_top_posts"]["edges"]
+        ),
+    }
+
+    def set_web_data(self, data, fields=None):
         self.id = data["id"]
+        if fields is not None:
+            self.set_web_fields(data, fields)
+            return
         self.slug = data["slug"]
         self.name = data["name"]
         self.has_public_page = data["has_public_page"]
@@ -249,6 +688,7 @@ class Location(HasMediaEntity):
 
 
 class Tag(HasMediaEntity):
+    __slots__ = ("name", "media_count", "_media", "_top_posts")
     primary_key = "name"
     web_entry_data_path = ("TagPage", 0, "graphql", "hashtag")
     web_base_path = "explore/tags/"
@@ -256,21 +696,38 @@ class Tag(HasMediaEntity):
     web_media_query_hash = "ded47faa9a1aaded10161a2ff32abb6b"
 
     def __init__(self, name):
+        self.updated_at = None
         self.name = name
         self.media_count = None
 
-        self.media = set()
-        self.top_posts = set()
+        self._media = None
+        self._top_posts = None
+
+    media = LazySet()
+    top_posts = LazySet()
+
+    web_fields = ("name", "media_count", "top_posts")
+    web_decoders = {
+        "media_count": lambda self, data: data["edge_hashtag_to_media"]["count"],
+        "top_posts": lambda self, data: self.top_posts.union(
+            Media(node["node"]["shortcode"]) for node in data["edge_hashtag_to_top_posts"]["edges"]
+        ),
+    }
 
-    def set_web_data(self, data):
+    def set_web_data(self, data, fields=None):
         self.name = data["name"]
+        if fields is not None:
+            self.set_web_fields(data, fields)
+            return
         self.media_count = data["edge_hashtag_to_media"]["count"]
         for node in data["edge_hashtag_to_top_posts"]["edges"]:
             self.top_posts.add(Media(node["node"]["shortcode"]))
 
 
 class Comment(Entity):
+    __slots__ = ("id", "media", "owner", "text", "created_at")
     primary_key = "id"
+    web_fields = ("id", "owner", "text", "created_at")
 
     def __init__(self, id, media, owner, text, created_at):
         self.id = id
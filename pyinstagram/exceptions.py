@@ -30,3 +30,25 @@ class NotUpdatedElement(InstagramException):
             element.__repr__(),
             argument,
         ))
+
+
+class UnexpectedResponse(InstagramException):
+    def __init__(self, exception, url):
+        super().__init__("Get unexpected response from '%s': %s" % (url, exception))
+        self.exception = exception
+        self.url = url
+
+
+class RetryException(InstagramException):
+    def __init__(self, url, attempts, reason, status=None):
+        super().__init__("Request to '%s' failed after %d attempts: %s" % (url, attempts, reason))
+        self.url = url
+        self.attempts = attempts
+        self.reason = reason
+        self.status = status
+
+
+class NoAvailableAgentException(InstagramException):
+    def __init__(self, method):
+        super().__init__("No healthy agent is available for '%s'" % method)
+        self.method = method
@@ -0,0 +1,111 @@
+from collections.abc import Iterable
+from typing import Optional
+
+from .entities import (
+    Account,
+    Comment,
+    Media,
+)
+
+
+def _caption(node: dict) -> Optional[str]:
+    edges = node.get("edge_media_to_caption", {}).get("edges")
+    return edges[0]["node"]["text"] if edges else None
+
+
+def _count(node: dict, *keys: str) -> Optional[int]:
+    for key in keys:
+        if key in node:
+            return node[key]["count"]
+    return None
+
+
+def _resources(node: dict) -> Optional[list]:
+    resources = node.get("display_resources", node.get("thumbnail_resources"))
+    return None if resources is None else [resource["src"] for resource in resources]
+
+
+def _album(node: dict) -> Optional[list]:
+    if "edge_sidecar_to_children" not in node:
+        return None
+    return [
+        edge["node"]["shortcode"] for edge in node["edge_sidecar_to_children"]["edges"]
+        if edge["node"].get("shortcode", node["shortcode"]) != node["shortcode"]
+    ]
+
+
+ACCOUNT_FIELDS = {
+    "id": lambda node: node["id"],
+    "username": lambda node: node["username"],
+    "full_name": lambda node: node.get("full_name"),
+    "profile_pic_url": lambda node: node.get("profile_pic_url"),
+    "is_verified": lambda node: node.get("is_verified"),
+}
+
+MEDIA_FIELDS = {
+    "id": lambda node: node["id"],
+    "code": lambda node: node["shortcode"],
+    "caption": _caption,
+    "owner": lambda node: node.get("owner", {}).get("username"),
+    "date": lambda node: node.get("taken_at_timestamp"),
+    "location": lambda node: (node.get("location") or {}).get("id"),
+    "likes_count": lambda node: _count(node, "edge_media_preview_like", "edge_liked_by"),
+    "comments_count": lambda node: _count(
+        node, "edge_media_to_comment", "edge_media_to_parent_comment",
+    ),
+    "comments_disabled": lambda node: node.get("comments_disabled"),
+    "is_video": lambda node: node.get("is_video"),
+    "video_url": lambda node: node.get("video_url"),
+    "is_ad": lambda node: node.get("is_ad"),
+    "display_url": lambda node: node.get("display_url"),
+    "resources": _resources,
+    "is_album": lambda node: node.get("__typename") == "GraphSidecar",
+    "album": _album,
+}
+
+COMMENT_FIELDS = {
+    "id": lambda node: node["id"],
+    "text": lambda node: node.get("text"),
+    "created_at": lambda node: node.get("created_at"),
+    "owner": lambda node: node.get("owner", {}).get("username"),
+}
+
+RECORD_FIELDS = {
+    Account: ACCOUNT_FIELDS,
+    Media: MEDIA_FIELDS,
+    Comment: COMMENT_FIELDS,
+}
+
+
+class Projection:
+    def __init__(self, entity: type, fields: Optional[Iterable[str]] = None):
+        if not isinstance(entity, type) or entity not in RECORD_FIELDS:
+            raise TypeError("'entity' must be Account, Media or Comment type")
+
+        decoders = RECORD_FIELDS[entity]
+        if fields is None:
+            fields = tuple(decoders)
+        else:
+            fields = entity.get_web_fields(fields)
+            unavailable = [name for name in fields if name not in decoders]
+            if unavailable:
+                raise ValueError("Fields are not available in %s nodes: %s" % (
+                    entity.__name__, ", ".join(map(repr, unavailable)),
+                ))
+        self.entity = entity
+        self.fields = fields
+        self._decoders = tuple((name, decoders[name]) for name in fields)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.fields
+
+    def record(self, node: dict) -> dict:
+        return {name: decoder(node) for name, decoder in self._decoders}
+
+    def apply(self, target, node: dict):
+        for name, decoder in self._decoders:
+            setattr(target, name, decoder(node))
+        return target
+
+    def __repr__(self):
+        return "Projection(%s: %s)" % (self.entity.__name__, ", ".join(self.fields))
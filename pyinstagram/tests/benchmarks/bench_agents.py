@@ -0,0 +1,64 @@
+import asyncio
+import sys
+import time
+
+from pyinstagram.agents import (
+    AsyncWebAccountAgent,
+    AsyncWebAgent,
+)
+from pyinstagram.entities import (
+    Account,
+    Media,
+)
+from pyinstagram.tests.server import FakeInstagramServer
+
+
+async def pages_per_second(iterator) -> float:
+    pages = 0
+    start = time.perf_counter()
+    async for _ in iterator:
+        pages += 1
+    return pages / (time.perf_counter() - start)
+
+
+async def bench_pages(pages=50, first=50, padding=300000):
+    total = pages * first
+    result = {}
+    async with FakeInstagramServer(padding=padding, media=total, followers=total) as server:
+        agent = AsyncWebAgent(api_url=server.url)
+        account_agent = AsyncWebAccountAgent("viewer", api_url=server.url)
+        try:
+            start = time.perf_counter()
+            await agent.update(Media("Bcode"))
+            result["update/page"] = time.perf_counter() - start
+            account = Account("target")
+            result["get_media/pages_per_s"] = await pages_per_second(
+                agent.iter_media(account, count=total, limit=first),
+            )
+            await account_agent.update(account)
+            result["get_followers/pages_per_s"] = await pages_per_second(
+                account_agent.iter_followers(account, count=total, limit=first),
+            )
+            result["get_followers_records/pages_per_s"] = await pages_per_second(
+                account_agent.iter_followers(account, count=total, limit=first,
+                                             fields=("username", "id"), records=True),
+            )
+        finally:
+            await agent.close()
+            await account_agent.close()
+    Account.clear_cache()
+    Media.clear_cache()
+    return result
+
+
+def collect(pages=50):
+    return asyncio.run(bench_pages(pages))
+
+
+def main(pages=50):
+    for name, value in collect(pages).items():
+        print("%-34s %10.2f" % (name, value))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
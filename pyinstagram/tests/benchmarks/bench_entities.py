@@ -0,0 +1,108 @@
+import random
+import sys
+import timeit
+
+from pyinstagram.agents import AsyncWebAgent
+from pyinstagram.entities import (
+    Account,
+    EntityCache,
+    LRUEntityCache,
+    Media,
+    TTLEntityCache,
+    WeakEntityCache,
+)
+from pyinstagram.tests import payloads
+
+
+def bench_set_web_data(count=1000, number=5):
+    medias = [payloads.media_node(index) for index in range(count)]
+    users = [payloads.profile_user("user%d" % index, first=0) for index in range(count)]
+
+    def clear():
+        Media.clear_cache()
+        Account.clear_cache()
+
+    def set_media():
+        for node in medias:
+            Media(node["shortcode"]).set_web_data(node)
+
+    def set_media_lazy():
+        for node in medias:
+            media = Media.from_web_data(node, lazy=True)
+            media.code
+            media.date
+
+    def set_account():
+        for user in users:
+            Account(user["username"]).set_web_data(user)
+
+    result = {}
+    for name, function in (("media", set_media), ("media_lazy", set_media_lazy),
+                           ("account", set_account)):
+        seconds = min(timeit.repeat(function, setup=clear, number=1, repeat=number))
+        result["set_web_data/%s" % name] = seconds / count
+    Media.clear_cache()
+    Account.clear_cache()
+    return result
+
+
+def bench_medias_from_edges(count=1000, number=5):
+    edges = payloads.account_media_page(0, count, count)["data"]["user"][
+        "edge_owner_to_timeline_media"]["edges"]
+
+    def run(lazy):
+        Media.clear_cache()
+        account = Account("user0")
+        account.media.clear()
+        AsyncWebAgent._get_medias_from_edges(account, edges, count, lazy=lazy)
+
+    result = {}
+    for name, lazy in (("medias_from_edges/1k", False), ("medias_from_edges_lazy/1k", True)):
+        seconds = min(timeit.repeat(lambda: run(lazy), number=number, repeat=3)) / number
+        result[name] = seconds * 1000 / count
+    Media.clear_cache()
+    Account.clear_cache()
+    return result
+
+
+def bench_cache_churn(keys=20000, size=2000, number=100000):
+    rng = random.Random(0)
+    usernames = ["user%d" % rng.randrange(keys) for _ in range(number)]
+    caches = {
+        "dict": EntityCache,
+        "lru": lambda: LRUEntityCache(size),
+        "ttl": lambda: TTLEntityCache(60, max_size=size),
+        "weak": WeakEntityCache,
+    }
+    original = Account.cache
+    result = {}
+    try:
+        for name, factory in caches.items():
+            Account.cache = factory()
+
+            def run():
+                for username in usernames:
+                    Account(username)
+
+            seconds = min(timeit.repeat(run, number=1, repeat=3))
+            result["cache_churn/%s" % name] = seconds / number
+    finally:
+        Account.cache = original
+        Account.clear_cache()
+    return result
+
+
+def collect(count=1000):
+    result = bench_set_web_data(count)
+    result.update(bench_medias_from_edges(count))
+    result.update(bench_cache_churn())
+    return result
+
+
+def main(count=1000):
+    for name, seconds in collect(count).items():
+        print("%-24s %8.2f us" % (name, seconds * 10 ** 6))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
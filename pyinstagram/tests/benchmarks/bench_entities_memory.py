@@ -0,0 +1,75 @@
+import gc
+import sys
+import tracemalloc
+
+from pyinstagram.entities import Account
+
+
+class DictAccount:
+    def __init__(self, username):
+        self.id = None
+        self.username = username
+        self.full_name = None
+        self.profile_pic_url = None
+        self.profile_pic_url_hd = None
+        self.fb_page = None
+        self.biography = None
+        self.follows_count = None
+        self.followers_count = None
+        self.media_count = None
+        self.is_private = None
+        self.is_verified = None
+        self.country_block = None
+
+        self.media = set()
+        self.follows = set()
+        self.followers = set()
+
+
+def create_accounts(cls, count):
+    cache = {}
+    for index in range(count):
+        account = cls("user%d" % index)
+        account.id = str(10 ** 9 + index)
+        account.full_name = "User %d" % index
+        account.profile_pic_url = "https://example.com/%d.jpg" % index
+        account.is_verified = False
+        cache[account.username] = account
+    return cache
+
+
+def measure(cls, count):
+    Account.clear_cache()
+    gc.collect()
+    tracemalloc.start()
+    accounts = create_accounts(cls, count)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del accounts
+    Account.clear_cache()
+    return size
+
+
+def bench_account_memory(count=100000):
+    return {
+        "dict": measure(DictAccount, count),
+        "slots": measure(Account, count),
+    }
+
+
+def collect(count=100000):
+    return {
+        "%s/bytes_per_account" % name: size / count
+        for name, size in bench_account_memory(count).items()
+    }
+
+
+def main(count=100000):
+    result = bench_account_memory(count)
+    for name, size in result.items():
+        print("%-6s %10.1f MiB %8.1f bytes/account" % (name, size / 2 ** 20, size / count))
+    print("saving %.1f%%" % (100 - 100 * result["slots"] / result["dict"]))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,36 @@
+import json
+import sys
+import timeit
+
+from pyinstagram.agents import decoders
+from pyinstagram.tests import payloads
+
+
+def get_pages(size=50):
+    return {
+        "media": json.dumps(payloads.account_media_page(0, size, 10 * size)),
+        "followers": json.dumps(payloads.followers_page(0, size, 10 * size)),
+    }
+
+
+def bench_decoders(size=50, number=200):
+    result = {}
+    for page, content in get_pages(size).items():
+        for name, loads in decoders.BACKENDS.items():
+            seconds = min(timeit.repeat(lambda: loads(content), number=number, repeat=5))
+            result["%s/%s" % (page, name)] = seconds / number
+    return result
+
+
+def collect(size=50):
+    return bench_decoders(size)
+
+
+def main(size=50):
+    print("default backend: %s" % decoders.backend)
+    for name, seconds in bench_decoders(size).items():
+        print("%-20s %8.1f us/page" % (name, seconds * 10 ** 6))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
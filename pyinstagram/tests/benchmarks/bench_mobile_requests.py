@@ -0,0 +1,80 @@
+import asyncio
+import sys
+import time
+
+from aiohttp import web
+
+from pyinstagram.agents import AsyncMobileAccountAgent
+
+
+async def handler(request):
+    await request.read()
+    return web.json_response({"status": "ok"})
+
+
+async def start_server():
+    app = web.Application()
+    app.router.add_route("POST", "/{tail:.*}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, "http://127.0.0.1:%d/api/" % port
+
+
+async def bench_agent(api_url, keep_alive, number):
+    agent = AsyncMobileAccountAgent("user0", api_url=api_url, keep_alive=keep_alive)
+    try:
+        start = time.perf_counter()
+        for _ in range(number):
+            await agent._request("accounts/current_user/", data={"_uuid": "0"})
+        return (time.perf_counter() - start) / number
+    finally:
+        await agent.close()
+
+
+async def bench_headers(number=100000):
+    agent = AsyncMobileAccountAgent("user0")
+    try:
+        start = time.perf_counter()
+        for _ in range(number):
+            agent.reset_static_headers()
+            agent.get_default_headers()
+        uncached = (time.perf_counter() - start) / number
+        start = time.perf_counter()
+        for _ in range(number):
+            agent.get_default_headers()
+        cached = (time.perf_counter() - start) / number
+        return {"headers/uncached": uncached, "headers/cached": cached}
+    finally:
+        await agent.close()
+
+
+async def bench_requests(number=1000):
+    runner, api_url = await start_server()
+    try:
+        return {
+            "close": await bench_agent(api_url, False, number),
+            "keep-alive": await bench_agent(api_url, True, number),
+        }
+    finally:
+        await runner.cleanup()
+
+
+def collect(number=1000):
+    result = asyncio.run(bench_headers())
+    for name, seconds in asyncio.run(bench_requests(number)).items():
+        result["requests/%s" % name] = seconds
+    return result
+
+
+def main(number=1000):
+    for name, seconds in asyncio.run(bench_headers()).items():
+        print("%-18s %8.2f us/call" % (name, seconds * 10 ** 6))
+    for name, seconds in asyncio.run(bench_requests(number)).items():
+        print("%-18s %8.1f us/request" % (name, seconds * 10 ** 6))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
@@ -0,0 +1,51 @@
+import sys
+import timeit
+
+from pyinstagram.agents.shared_data import (
+    find_shared_data,
+    find_shared_data_regex,
+)
+from pyinstagram.tests import payloads
+
+
+def run(function, content, number):
+    try:
+        function(content)
+    except ValueError:
+        return None
+    return min(timeit.repeat(lambda: function(content), number=number, repeat=3)) / number
+
+
+def bench_shared_data(padding=500000, number=10):
+    result = {}
+    for layout in ("multiline", "minified"):
+        content = payloads.profile_html(padding=padding, minified=layout == "minified")
+        result[layout] = {
+            "size": len(content),
+            "regex": run(find_shared_data_regex, content, number),
+            "linear": run(find_shared_data, content, number),
+        }
+    return result
+
+
+def collect(padding=500000):
+    result = {}
+    for layout, values in bench_shared_data(padding).items():
+        for name in ("regex", "linear"):
+            if values[name] is not None:
+                result["%s/%s" % (layout, name)] = values[name]
+    return result
+
+
+def main(padding=500000):
+    for layout, result in bench_shared_data(padding).items():
+        print("%s page, %.1f KiB" % (layout, result["size"] / 1024))
+        for name in ("regex", "linear"):
+            if result[name] is None:
+                print("  %-7s   failed to decode" % name)
+            else:
+                print("  %-7s %8.2f ms/page" % (name, result[name] * 1000))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500000)
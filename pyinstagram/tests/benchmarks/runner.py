@@ -0,0 +1,129 @@
+import argparse
+import importlib
+import json
+import os
+import platform
+import sys
+import time
+from typing import (
+    Iterable,
+    Optional,
+)
+
+SUITES = (
+    "bench_entities",
+    "bench_entities_memory",
+    "bench_json",
+    "bench_shared_data",
+    "bench_mobile_requests",
+    "bench_agents",
+)
+HIGHER_IS_BETTER = ("per_s",)
+RESULTS_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def get_version() -> str:
+    try:
+        from importlib import metadata
+        return metadata.version("pyinstagram")
+    except Exception:
+        return "unknown"
+
+
+def run(suites: Optional[Iterable[str]] = None) -> dict:
+    results = {}
+    for name in SUITES if suites is None else suites:
+        if name not in SUITES:
+            raise ValueError("Unknown benchmark suite '%s'" % name)
+        module = importlib.import_module("%s.%s" % (__package__, name))
+        results[name] = module.collect()
+    return {
+        "version": get_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created_at": time.time(),
+        "results": results,
+    }
+
+
+def save(report: dict, directory: str) -> str:
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, "%s-%d.json" % (report["version"], report["created_at"]))
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    return path
+
+
+def load(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def latest(directory: str) -> Optional[str]:
+    if not os.path.isdir(directory):
+        return None
+    reports = [
+        os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(".json")
+    ]
+    if not reports:
+        return None
+    return max(reports, key=lambda path: load(path)["created_at"])
+
+
+def compare(baseline: dict, report: dict, threshold: float = 0.1) -> list:
+    regressions = []
+    for suite, metrics in report["results"].items():
+        for metric, value in metrics.items():
+            previous = baseline["results"].get(suite, {}).get(metric)
+            if not previous or not value:
+                continue
+            if metric.endswith(HIGHER_IS_BETTER):
+                change = previous / value - 1
+            else:
+                change = value / previous - 1
+            if change > threshold:
+                regressions.append((suite, metric, previous, value, change))
+    return regressions
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m pyinstagram.tests.benchmarks")
+    parser.add_argument("suites", nargs="*", metavar="SUITE",
+                        help="one of %s (default: all)" % ", ".join(SUITES))
+    parser.add_argument("--output", default=RESULTS_DIRECTORY,
+                        help="directory for JSON reports (default: %(default)s)")
+    parser.add_argument("--compare", metavar="REPORT", nargs="?", const="latest",
+                        help="baseline JSON report (default: latest report in --output)")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="relative slowdown reported as regression (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    baseline = args.compare
+    if baseline == "latest":
+        baseline = latest(args.output)
+        if baseline is None:
+            parser.error("no stored report in '%s'" % args.output)
+
+    try:
+        report = run(args.suites or None)
+    except ValueError as exception:
+        parser.error(str(exception))
+    for suite, metrics in report["results"].items():
+        print(suite)
+        for metric, value in metrics.items():
+            print("  %-32s %14.6g" % (metric, value))
+    print("saved %s" % save(report, args.output))
+
+    if baseline is None:
+        return 0
+    print("compare with %s" % baseline)
+    regressions = compare(load(baseline), report, args.threshold)
+    for suite, metric, previous, value, change in regressions:
+        print("REGRESSION %s/%s: %.6g -> %.6g (%+.1f%%)" % (
+            suite, metric, previous, value, change * 100,
+        ))
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
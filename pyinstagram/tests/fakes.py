@@ -0,0 +1,81 @@
+import asyncio
+import json
+from collections import namedtuple
+from typing import Optional
+
+from pyinstagram.agents import (
+    AsyncWebAccountAgent,
+    AsyncWebAgent,
+)
+
+from . import payloads
+
+FakeRequest = namedtuple("FakeRequest", ["method", "url", "kwargs"])
+
+
+class FakeResponse:
+    def __init__(self, status: int = 200, headers: Optional[dict] = None, content=None):
+        self.status = status
+        self.headers = {} if headers is None else headers
+        self.content = "status %d" % status if content is None else content
+        self.released = False
+
+    async def text(self):
+        if isinstance(self.content, Exception):
+            raise self.content
+        return self.content
+
+    def release(self):
+        self.released = True
+
+
+class FakeSession:
+    def __init__(self, responses=None, latency: float = 0.0):
+        if callable(responses):
+            self.handler = responses
+            self.responses = None
+        else:
+            self.handler = None
+            self.responses = [] if responses is None else list(responses)
+        self.latency = latency
+        self.requests = []
+
+    @property
+    def proxies(self):
+        return [request.kwargs.get("proxy") for request in self.requests]
+
+    async def request(self, method, url, *args, **kwargs):
+        request = FakeRequest(method, url, kwargs)
+        self.requests.append(request)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.handler is not None:
+            response = self.handler(request)
+        elif self.responses:
+            response = self.responses.pop(0)
+        else:
+            response = FakeResponse()
+        if isinstance(response, Exception):
+            raise response
+        if isinstance(response, str):
+            response = FakeResponse(content=response)
+        return response
+
+
+def instagram(request):
+    if request.method == "POST":
+        return json.dumps({"status": "ok"})
+    if "graphql" in request.url:
+        return json.dumps(payloads.followers_page(0, 10, 10))
+    return payloads.profile_html("target", padding=0)
+
+
+async def create_agent(responses=None, username: Optional[str] = "user0", latency: float = 0.0,
+                       **kwargs):
+    if username is None:
+        agent = AsyncWebAgent(**kwargs)
+    else:
+        agent = AsyncWebAccountAgent(username, **kwargs)
+    await agent.close()
+    agent.session = FakeSession(responses, latency=latency)
+    return agent
@@ -1,3 +1,4 @@
+import os
 import random
 import time
 
@@ -17,7 +18,14 @@ from pyinstagram.entities import (
     Media,
     Tag,
 )
-from pyinstagram.tests import config
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "config.json")
+
+if os.path.exists(CONFIG_PATH):
+    from pyinstagram.tests import config
+else:
+    collect_ignore_glob = ["test_*.py"]
 
 
 def setup_function():
@@ -0,0 +1,263 @@
+import json
+import random
+
+
+def account_node(index: int) -> dict:
+    return {
+        "id": str(10 ** 9 + index),
+        "username": "user%d" % index,
+        "full_name": "User Number %d" % index,
+        "profile_pic_url": "https://scontent.cdninstagram.com/vp/%032x/s150x150/%d_n.jpg" % (
+            index, index),
+        "is_verified": index % 17 == 0,
+        "followed_by_viewer": False,
+        "requested_by_viewer": False,
+    }
+
+
+def media_node(index: int, owner_id: str = "1000000000", owner_username: str = "user0",
+               album: bool = False) -> dict:
+    resources = [
+        {
+            "src": "https://scontent.cdninstagram.com/vp/%032x/s%dx%d/%d_n.jpg" % (
+                index, size, size, index),
+            "config_width": size,
+            "config_height": size,
+        }
+        for size in (150, 240, 320, 480, 640)
+    ]
+    node = {
+        "__typename": "GraphSidecar" if album else "GraphImage",
+        "id": str(2 * 10 ** 18 + index),
+        "shortcode": "B%09dx" % index,
+        "dimensions": {"height": 1080, "width": 1080},
+        "display_url": "https://scontent.cdninstagram.com/vp/%032x/%d_n.jpg" % (index, index),
+        "display_resources": resources,
+        "thumbnail_src": resources[0]["src"],
+        "thumbnail_resources": resources,
+        "edge_media_to_caption": {"edges": [{"node": {
+            "text": "Caption for media %d #tag%d #instagram ❤️" % (index, index % 10),
+        }}]},
+        "edge_media_to_comment": {"count": index % 97},
+        "edge_media_preview_like": {"count": index * 7 % 1009},
+        "comments_disabled": False,
+        "taken_at_timestamp": 1500000000 + index * 3600,
+        "is_video": False,
+        "accessibility_caption": "Image may contain: %d people, outdoor" % (index % 5),
+        "owner": {"id": owner_id, "username": owner_username},
+        "location": None,
+    }
+    if album:
+        node["edge_sidecar_to_children"] = {"edges": [
+            {"node": {
+                "__typename": "GraphImage",
+                "id": str(3 * 10 ** 18 + index * 10 + child),
+                "shortcode": "C%09d%d" % (index, child),
+                "is_video": False,
+                "display_url": resources[-1]["src"],
+                "display_resources": resources,
+            }}
+            for child in range(3)
+        ]}
+    return node
+
+
+def page_info(end: int, total: int) -> dict:
+    return {
+        "has_next_page": end < total,
+        "end_cursor": "QVFD%020d" % end if end < total else None,
+    }
+
+
+def parse_cursor(cursor) -> int:
+    return int(cursor[4:]) if cursor else 0
+
+
+def account_media_page(start: int, first: int, total: int, owner_id: str = "1000000000",
+                       owner_username: str = "user0") -> dict:
+    end = min(start + first, total)
+    return {"data": {"user": {"edge_owner_to_timeline_media": {
+        "count": total,
+        "page_info": page_info(end, total),
+        "edges": [
+            {"node": media_node(index, owner_id, owner_username, album=index % 5 == 0)}
+            for index in range(start, end)
+        ],
+    }}}}
+
+
+def followers_page(start: int, first: int, total: int, edge: str = "edge_followed_by") -> dict:
+    end = min(start + first, total)
+    return {"data": {"user": {edge: {
+        "count": total,
+        "page_info": page_info(end, total),
+        "edges": [{"node": account_node(index)} for index in range(start, end)],
+    }}}}
+
+
+def follows_page(start: int, first: int, total: int) -> dict:
+    return followers_page(start, first, total, edge="edge_follow")
+
+
+def comment_node(index: int) -> dict:
+    return {
+        "id": str(4 * 10 ** 16 + index),
+        "text": "Comment number %d" % index,
+        "created_at": 1500000000 + index * 60,
+        "owner": {
+            "id": str(10 ** 9 + index),
+            "username": "user%d" % index,
+            "profile_pic_url": account_node(index)["profile_pic_url"],
+        },
+    }
+
+
+def edge_page(nodes: list, end: int, total: int) -> dict:
+    return {
+        "count": total,
+        "page_info": page_info(end, total),
+        "edges": [{"node": node} for node in nodes],
+    }
+
+
+def comments_page(start: int, first: int, total: int) -> dict:
+    end = min(start + first, total)
+    return {"data": {"shortcode_media": {"edge_media_to_comment": edge_page(
+        [comment_node(index) for index in range(start, end)], end, total,
+    )}}}
+
+
+def likes_page(start: int, first: int, total: int) -> dict:
+    end = min(start + first, total)
+    return {"data": {"shortcode_media": {"edge_liked_by": edge_page(
+        [account_node(index) for index in range(start, end)], end, total,
+    )}}}
+
+
+def location_media_page(start: int, first: int, total: int) -> dict:
+    end = min(start + first, total)
+    return {"data": {"location": {"edge_location_to_media": edge_page(
+        [media_node(index) for index in range(start, end)], end, total,
+    )}}}
+
+
+def tag_media_page(start: int, first: int, total: int) -> dict:
+    end = min(start + first, total)
+    return {"data": {"hashtag": {"edge_hashtag_to_media": edge_page(
+        [media_node(index) for index in range(start, end)], end, total,
+    )}}}
+
+
+def feed_page(start: int, first: int, total: int) -> dict:
+    end = min(start + first, total)
+    return {"data": {"user": {"edge_web_feed_timeline": edge_page(
+        [media_node(index) for index in range(start, end)], end, total,
+    )}}}
+
+
+def stories_page(count: int = 3) -> dict:
+    return {"data": {"user": {"feed_reels_tray": {"edge_reels_tray_to_reel": {"edges": [
+        {"node": {"id": str(10 ** 9 + index)}} for index in range(count)
+    ]}}}}}
+
+
+def post_media(code: str, comments_count: int = 40, likes_count: int = 100,
+               first: int = 24) -> dict:
+    node = media_node(0)
+    node.update({
+        "shortcode": code,
+        "edge_media_preview_like": {"count": likes_count},
+        "edge_media_to_comment": comments_page(0, first, comments_count)[
+            "data"]["shortcode_media"]["edge_media_to_comment"],
+    })
+    return node
+
+
+def location_data(id: str, media_count: int = 120, first: int = 24) -> dict:
+    return {
+        "id": id,
+        "slug": "location-%s" % id,
+        "name": "Location %s" % id,
+        "has_public_page": True,
+        "directory": {"country": {"id": "US"}, "city": {"id": "c1"}},
+        "lat": 40.7128,
+        "lng": -74.006,
+        "edge_location_to_media": location_media_page(0, first, media_count)[
+            "data"]["location"]["edge_location_to_media"],
+        "edge_location_to_top_posts": edge_page([media_node(index) for index in range(9)], 9, 9),
+    }
+
+
+def tag_data(name: str, media_count: int = 120, first: int = 24) -> dict:
+    return {
+        "name": name,
+        "edge_hashtag_to_media": tag_media_page(0, first, media_count)[
+            "data"]["hashtag"]["edge_hashtag_to_media"],
+        "edge_hashtag_to_top_posts": edge_page([media_node(index) for index in range(9)], 9, 9),
+    }
+
+
+def profile_user(username: str = "user0", media_count: int = 120, followers_count: int = 5000,
+                 follows_count: int = 300, first: int = 12) -> dict:
+    user = account_node(0)
+    user.update({
+        "username": username,
+        "biography": "Biography of %s" % username,
+        "connected_fb_page": None,
+        "country_block": False,
+        "external_url": None,
+        "profile_pic_url_hd": user["profile_pic_url"].replace("s150x150", "s320x320"),
+        "is_private": False,
+        "edge_follow": {"count": follows_count},
+        "edge_followed_by": {"count": followers_count},
+        "edge_owner_to_timeline_media": account_media_page(
+            0, first, media_count, user["id"], username,
+        )["data"]["user"]["edge_owner_to_timeline_media"],
+    })
+    return user
+
+
+def shared_data(entry_data: dict) -> dict:
+    return {
+        "config": {"csrf_token": "a" * 32, "viewer": None},
+        "country_code": "US",
+        "language_code": "en",
+        "locale": "en_US",
+        "entry_data": entry_data,
+        "rhx_gis": "b" * 32,
+        "nonce": "c" * 24,
+    }
+
+
+def html_page(data: dict, padding: int = 300000, minified: bool = False) -> str:
+    rng = random.Random(0)
+    filler = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz{}();= ") for _ in range(4096))
+    head = (
+        "<!DOCTYPE html>\n<html lang=\"en\" class=\"no-js not-logged-in client-root\">\n"
+        "<head><meta charset=\"utf-8\">\n<title>Instagram</title>\n"
+        "<script type=\"text/javascript\">window._config = {\"a\": 1};</script>\n"
+        "<link rel=\"stylesheet\" href=\"/static/bundles/base/ConsumerUICommons.css\" />\n"
+        "</head>\n<body class=\"\">\n<span id=\"react-root\"></span>\n"
+    )
+    script = "<script type=\"text/javascript\">window._sharedData = %s;</script>\n" % (
+        json.dumps(data),
+    )
+    tail = []
+    size = 0
+    while size < padding:
+        chunk = "<script type=\"text/javascript\">(function(){%s})();</script>\n" % filler
+        tail.append(chunk)
+        size += len(chunk)
+    content = head + script + "".join(tail) + "</body>\n</html>\n"
+    if minified:
+        content = content.replace("\n", "")
+    return content
+
+
+def profile_html(username: str = "user0", padding: int = 300000, minified: bool = False,
+                 **kwargs) -> str:
+    return html_page(
+        shared_data({"ProfilePage": [{"graphql": {"user": profile_user(username, **kwargs)}}]}),
+        padding=padding,
+        minified=minified,
+    )
@@ -0,0 +1,220 @@
+import asyncio
+import json
+import random
+import time
+from typing import Optional
+
+from aiohttp import web
+
+from . import payloads
+
+
+class FakeInstagramServer:
+    GRAPHQL_PAGES = {
+        "c6809c9c025875ac6f02619eae97a80e": ("media", payloads.account_media_page),
+        "ac38b90f0f3981c42092016a37c59bf7": ("media", payloads.location_media_page),
+        "ded47faa9a1aaded10161a2ff32abb6b": ("media", payloads.tag_media_page),
+        "1cb6ec562846122743b61e492c85999f": ("likes", payloads.likes_page),
+        "f0986789a5c5d17c2400faebf16efd0d": ("comments", payloads.comments_page),
+        "58712303d941c6855d4e888c5f0cd22f": ("follows", payloads.follows_page),
+        "37479f2b8209594dde7facb0d904896a": ("followers", payloads.followers_page),
+        "485c25657308f08317c1e4b967356828": ("media", payloads.feed_page),
+    }
+    FEED_QUERY_HASH = "485c25657308f08317c1e4b967356828"
+    STORIES_QUERY_HASH = "60b755363b5c230111347a7a4e242001"
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0,
+                 throttle: Optional[int] = None, throttle_period: float = 1.0,
+                 retry_after: int = 1, error_rate: float = 0.0, error_status: int = 502,
+                 padding: int = 0, seed: int = 0, **counts):
+        if not isinstance(latency, (int, float)):
+            raise TypeError("'latency' must be int or float type")
+        if not isinstance(throttle, int) and throttle is not None:
+            raise TypeError("'throttle' must be int type or None")
+        if not isinstance(error_rate, (int, float)):
+            raise TypeError("'error_rate' must be int or float type")
+
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.throttle = throttle
+        self.throttle_period = throttle_period
+        self.retry_after = retry_after
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.padding = padding
+        self.counts = {
+            "media": 120,
+            "likes": 100,
+            "comments": 40,
+            "follows": 300,
+            "followers": 500,
+        }
+        self.counts.update(counts)
+        self.url = None
+        self.requests = {}
+        self.throttled = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+        self._window = []
+        self._runner = None
+
+        self.app = web.Application(middlewares=[self._middleware])
+        self.app.router.add_route("GET", "/", self.main_page)
+        self.app.router.add_route("GET", "/graphql/query/", self.graphql)
+        self.app.router.add_route("GET", "/p/{code}{slash:/?}", self.post_page)
+        self.app.router.add_route("GET", "/explore/tags/{name}{slash:/?}", self.tag_page)
+        self.app.router.add_route("GET", "/explore/locations/{id}{slash:/?}", self.location_page)
+        self.app.router.add_route("GET", "/{username}{slash:/?}", self.profile_page)
+        self.app.router.add_route("POST", "/accounts/login/ajax/", self.login)
+        self.app.router.add_route("POST", "/web/comments/{media_id}/add/", self.add_comment)
+        self.app.router.add_route("POST", "/api/v1/users/{username}/usernameinfo/",
+                                  self.mobile_user_info)
+        self.app.router.add_route("POST", "/api/v1/users/{pk}/full_detail_info/",
+                                  self.mobile_user_detail)
+        self.app.router.add_route("POST", "/{tail:.*}", self.action)
+
+    async def start(self) -> str:
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        self.url = "http://%s:%d/" % (self.host, self.port)
+        return self.url
+
+    async def close(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def _is_throttled(self) -> bool:
+        if self.throttle is None:
+            return False
+        now = time.monotonic()
+        self._window = [moment for moment in self._window if moment > now - self.throttle_period]
+        if len(self._window) >= self.throttle:
+            return True
+        self._window.append(now)
+        return False
+
+    @web.middleware
+    async def _middleware(self, request, handler):
+        route = request.match_info.route.resource
+        name = request.path if route is None else route.canonical
+        self.requests[name] = self.requests.get(name, 0) + 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self._is_throttled():
+            self.throttled += 1
+            return web.json_response(
+                {"message": "Please wait a few minutes before you try again.", "status": "fail"},
+                status=429,
+                headers={"Retry-After": str(self.retry_after)},
+            )
+        if self.error_rate and self._random.random() < self.error_rate:
+            self.errors += 1
+            return web.Response(status=self.error_status, text="Injected error")
+        return await handler(request)
+
+    def _html(self, entry_data: dict) -> web.Response:
+        return web.Response(
+            text=payloads.html_page(payloads.shared_data(entry_data), padding=self.padding),
+            content_type="text/html",
+        )
+
+    async def main_page(self, request):
+        return self._html({})
+
+    async def profile_page(self, request):
+        user = payloads.profile_user(
+            request.match_info["username"],
+            media_count=self.counts["media"],
+            followers_count=self.counts["followers"],
+            follows_count=self.counts["follows"],
+        )
+        return self._html({"ProfilePage": [{"graphql": {"user": user}}]})
+
+    async def post_page(self, request):
+        media = payloads.post_media(
+            request.match_info["code"],
+            comments_count=self.counts["comments"],
+            likes_count=self.counts["likes"],
+        )
+        return self._html({"PostPage": [{"graphql": {"shortcode_media": media}}]})
+
+    async def tag_page(self, request):
+        tag = payloads.tag_data(request.match_info["name"], media_count=self.counts["media"])
+        return self._html({"TagPage": [{"graphql": {"hashtag": tag}}]})
+
+    async def location_page(self, request):
+        location = payloads.location_data(
+            request.match_info["id"],
+            media_count=self.counts["media"],
+        )
+        return self._html({"LocationsPage": [{"graphql": {"location": location}}]})
+
+    async def graphql(self, request):
+        query_hash = request.query.get("query_hash")
+        try:
+            variables = json.loads(request.query.get("variables", "{}"))
+        except ValueError:
+            return web.json_response({"message": "invalid variables", "status": "fail"},
+                                     status=400)
+        if query_hash == self.STORIES_QUERY_HASH:
+            return web.json_response(payloads.stories_page())
+        if query_hash not in self.GRAPHQL_PAGES:
+            return web.json_response({"message": "unknown query_hash", "status": "fail"},
+                                     status=400)
+        kind, page = self.GRAPHQL_PAGES[query_hash]
+        if query_hash == self.FEED_QUERY_HASH:
+            first = variables.get("fetch_media_item_count", 12)
+            start = payloads.parse_cursor(variables.get("fetch_media_item_cursor"))
+        else:
+            first = variables.get("first", 12)
+            start = payloads.parse_cursor(variables.get("after"))
+        return web.json_response(page(start, first, self.counts[kind]))
+
+    async def login(self, request):
+        await request.read()
+        return web.json_response({"authenticated": True, "user": True, "status": "ok"})
+
+    async def add_comment(self, request):
+        data = await request.post()
+        return web.json_response({
+            "id": str(5 * 10 ** 16 + self.requests.get(request.path, 0)),
+            "text": data.get("comment_text", ""),
+            "created_time": int(time.time()),
+            "status": "ok",
+        })
+
+    async def mobile_user_info(self, request):
+        await request.read()
+        user = payloads.profile_user(request.match_info["username"])
+        return web.json_response({
+            "user": {"pk": int(user["id"]), "username": user["username"]},
+            "status": "ok",
+        })
+
+    async def mobile_user_detail(self, request):
+        await request.read()
+        return web.json_response({
+            "user_detail": {"user": {
+                "pk": int(request.match_info["pk"]),
+                "media_count": self.counts["media"],
+                "follower_count": self.counts["followers"],
+                "following_count": self.counts["follows"],
+            }},
+            "status": "ok",
+        })
+
+    async def action(self, request):
+        await request.read()
+        return web.json_response({"status": "ok"})
@@ -0,0 +1,156 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+from pyinstagram.agents import (
+    AgentPool,
+    AsyncMobileAccountAgent,
+    AsyncWebAgent,
+)
+from pyinstagram.agents.pagination import Page
+from pyinstagram.exceptions import (
+    CheckpointException,
+    NoAvailableAgentException,
+    RetryException,
+)
+
+
+class FakeAgent(AsyncWebAgent):
+    def __init__(self, name, error=None, fail_after=None):
+        super().__init__()
+        self.name = name
+        self.error = error
+        self.fail_after = fail_after
+        self.calls = []
+
+    def __repr__(self):
+        return self.name
+
+    async def update(self, entity=None, settings=None):
+        self.calls.append(entity)
+        await asyncio.sleep(0.01)
+        if self.error is not None:
+            raise self.error
+        return {"agent": self.name}
+
+    async def iter_followers(self, account=None, pointer=None, count=20, limit=5, delay=0):
+        self.calls.append((pointer, count))
+        start = 0 if pointer is None else int(pointer)
+        end = min(start + count, 20)
+        while start < end:
+            if self.fail_after is not None and start >= self.fail_after:
+                raise self.error
+            stop = min(start + limit, end)
+            yield Page(range(start, stop), pointer=None if stop >= 20 else str(stop))
+            start = stop
+
+
+@pytest.mark.asyncio
+async def test_pool_routes_to_least_loaded_agent():
+    first, second = FakeAgent("first"), FakeAgent("second")
+    pool = AgentPool([first, second])
+
+    results = await asyncio.gather(*(pool.update("entity%d" % i) for i in range(4)))
+    assert sorted(result["agent"] for result in results) == ["first", "first", "second", "second"]
+    assert pool.stats()["first"]["requests"] == 2
+    assert pool.stats()["first"]["active"] == 0
+
+
+@pytest.mark.asyncio
+async def test_pool_quarantines_checkpoint_and_throttled_agents():
+    checkpoint = FakeAgent("checkpoint", CheckpointException("checkpoint", "/c/", {}, []))
+    throttled = FakeAgent("throttled", RetryException("/graphql/query/", 5, "status 429", 429))
+    healthy = FakeAgent("healthy")
+    pool = AgentPool([checkpoint, throttled, healthy], throttle_quarantine=60)
+
+    assert (await pool.update("entity"))["agent"] == "healthy"
+    assert not pool.stats()["checkpoint"]["healthy"]
+    assert not pool.stats()["throttled"]["healthy"]
+    assert (await pool.update("entity"))["agent"] == "healthy"
+    assert checkpoint.calls == ["entity"] and throttled.calls == ["entity"]
+
+    pool.remove(healthy)
+    with pytest.raises(NoAvailableAgentException):
+        await pool.update("entity")
+    pool.release(checkpoint)
+    with pytest.raises(CheckpointException):
+        await pool.update("entity")
+
+
+@pytest.mark.asyncio
+async def test_pool_propagates_other_errors_and_skips_unsupported_agents():
+    broken = FakeAgent("broken", KeyError("entry_data"))
+    pool = AgentPool([broken])
+    with pytest.raises(KeyError):
+        await pool.update("entity")
+    assert pool.stats()["broken"]["healthy"]
+
+    with pytest.raises(NoAvailableAgentException):
+        await pool.get_follows("entity")
+
+
+@pytest.mark.asyncio
+async def test_pool_iteration_resumes_on_another_agent():
+    throttled = FakeAgent(
+        "throttled",
+        RetryException("/graphql/query/", 5, "status 429", 429),
+        fail_after=10,
+    )
+    healthy = FakeAgent("healthy")
+    pool = AgentPool([throttled, healthy])
+
+    items = []
+    async for page in pool.iter_followers(count=20, limit=5):
+        items.extend(page)
+
+    assert items == list(range(20))
+    assert healthy.calls == [("10", 10)]
+
+
+@pytest.mark.asyncio
+async def test_pool_iteration_binds_positional_and_default_arguments():
+    throttled = FakeAgent(
+        "throttled",
+        aiohttp.ClientResponseError(None, (), status=429),
+        fail_after=5,
+    )
+    healthy = FakeAgent("healthy")
+    pool = AgentPool([throttled, healthy])
+
+    items = []
+    async for page in pool.iter_followers(None, None):
+        items.extend(page)
+
+    assert items == list(range(20))
+    assert throttled.calls == [(None, 20)] and healthy.calls == [("5", 15)]
+    assert not pool.stats()["throttled"]["healthy"]
+    await pool.close()
+
+
+class FakeMobileAgent(AsyncMobileAccountAgent):
+    async def update(self, entity=None):
+        return {"agent": "mobile"}
+
+
+@pytest.mark.asyncio
+async def test_pool_mixes_web_and_mobile_agents():
+    web = FakeAgent("web", RetryException("/", 1, "status 429", 429))
+    mobile = FakeMobileAgent("mobile")
+    pool = AgentPool([web, mobile])
+
+    assert (await pool.update("entity"))["agent"] == "mobile"
+    assert not pool.stats()["web"]["healthy"]
+    pool.release(web)
+    web.error = None
+    with pytest.raises(NoAvailableAgentException):
+        await pool.update("entity", settings={}, fields=None)
+    pool.release(web)
+    assert (await pool.update("entity", settings={}))["agent"] == "web"
+    pool.quarantine(web, 60)
+    with pytest.raises(NoAvailableAgentException):
+        await pool.iter_followers().__anext__()
+
+    with pytest.raises(TypeError):
+        pool.add(object())
+    await pool.close()
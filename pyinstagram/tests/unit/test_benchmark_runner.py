@@ -0,0 +1,43 @@
+import pytest
+
+from pyinstagram.tests.benchmarks import runner
+
+
+def report(results):
+    return {"version": "3.0.0", "created_at": 0, "results": results}
+
+
+def test_compare_reports_regressions_in_both_directions():
+    baseline = report({
+        "bench_agents": {"get_media/pages_per_s": 200.0, "update/page": 0.010},
+        "bench_json": {"media/json": 0.001},
+    })
+    current = report({
+        "bench_agents": {"get_media/pages_per_s": 150.0, "update/page": 0.0105},
+        "bench_json": {"media/json": 0.0008, "media/orjson": 0.0004},
+    })
+
+    regressions = runner.compare(baseline, current, threshold=0.1)
+
+    assert [(suite, metric) for suite, metric, *_ in regressions] == [
+        ("bench_agents", "get_media/pages_per_s"),
+    ]
+    assert regressions[0][4] == pytest.approx(1 / 3)
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = runner.save(report({"bench_json": {"media/json": 0.001}}), str(tmp_path / "results"))
+
+    assert runner.load(path)["results"] == {"bench_json": {"media/json": 0.001}}
+    with pytest.raises(ValueError):
+        runner.run(["bench_unknown"])
+
+
+def test_latest_report(tmp_path):
+    directory = str(tmp_path / "results")
+    assert runner.latest(directory) is None
+
+    runner.save(report({}), directory)
+    newer = dict(report({"bench_json": {}}), created_at=10)
+    path = runner.save(newer, directory)
+    assert runner.latest(directory) == path
@@ -0,0 +1,78 @@
+import pytest
+
+from pyinstagram.agents import (
+    JSONCheckpointStore,
+    MemoryCheckpointStore,
+    SQLiteCheckpointStore,
+)
+from pyinstagram.agents.checkpoints import get_entity_key
+from pyinstagram.entities import (
+    Account,
+    Media,
+)
+
+
+@pytest.fixture(params=["memory", "json", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "json":
+        store = JSONCheckpointStore(str(tmp_path / "checkpoints.json"))
+    elif request.param == "sqlite":
+        store = SQLiteCheckpointStore(str(tmp_path / "checkpoints.sqlite"))
+    else:
+        store = MemoryCheckpointStore()
+    yield store
+    store.close()
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def create_persistent_store(request, tmp_path):
+    def create():
+        if request.param == "json":
+            return JSONCheckpointStore(str(tmp_path / "checkpoints.json"))
+        return SQLiteCheckpointStore(str(tmp_path / "checkpoints.sqlite"))
+    return create
+
+
+def test_checkpoint_store(store):
+    assert store.get("Account:user0", "hash") is None
+
+    store.set("Account:user0", "hash", "QVFD1")
+    store.set("Account:user0", "hash", "QVFD2")
+    store.set("Account:user0", "other", "QVFD3")
+    assert store.get("Account:user0", "hash") == "QVFD2"
+    assert store.get("Account:user0", "other") == "QVFD3"
+
+    store.delete("Account:user0", "hash")
+    store.delete("Account:user1", "hash")
+    assert store.get("Account:user0", "hash") is None
+
+    store.clear()
+    assert store.get("Account:user0", "other") is None
+
+
+def test_checkpoint_store_persistence(create_persistent_store):
+    store = create_persistent_store()
+    store.set("Account:user0", "hash", "QVFD1")
+    store.set("Account:user0", "hash", "QVFD2")
+    store.set("Account:user0", "other", "QVFD3")
+    store.close()
+
+    store = create_persistent_store()
+    assert store.get("Account:user0", "hash") == "QVFD2"
+    assert store.get("Account:user0", "other") == "QVFD3"
+    store.close()
+
+
+def test_memory_checkpoint_store_is_not_persistent():
+    store = MemoryCheckpointStore()
+    store.set("Account:user0", "hash", "QVFD1")
+    store.close()
+
+    assert MemoryCheckpointStore().get("Account:user0", "hash") is None
+
+
+def test_get_entity_key():
+    assert get_entity_key(Account("user0")) == "Account:user0"
+    assert get_entity_key(Media("B0000")) == "Media:B0000"
+    with pytest.raises(TypeError):
+        get_entity_key("user0")
@@ -0,0 +1,63 @@
+import pytest
+
+from pyinstagram.columns import (
+    AccountColumns,
+    MediaColumns,
+)
+from pyinstagram.entities import (
+    Account,
+    Media,
+)
+
+
+def setup_function():
+    Account.clear_cache()
+    Media.clear_cache()
+
+
+def account_node(index):
+    return {
+        "id": str(10 ** 9 + index),
+        "username": "user%d" % index,
+        "full_name": "User %d" % index,
+        "profile_pic_url": "https://example.com/%d.jpg" % index,
+        "is_verified": index % 2 == 0,
+    }
+
+
+def media_node(index):
+    return {
+        "id": str(2 * 10 ** 18 + index),
+        "shortcode": "code%d" % index,
+        "owner": {"id": "42"},
+        "taken_at_timestamp": 1500000000 + index,
+        "edge_media_preview_like": {"count": index},
+        "edge_media_to_comment": {"count": 2 * index},
+        "is_video": False,
+        "display_url": "https://example.com/%d.jpg" % index,
+    }
+
+
+def test_account_columns():
+    columns = AccountColumns(account_node(index) for index in range(3))
+    assert len(columns) == 3
+    assert list(columns.id) == [10 ** 9, 10 ** 9 + 1, 10 ** 9 + 2]
+    assert columns.username == ["user0", "user1", "user2"]
+    assert len(Account.cache) == 0
+
+    account = columns[-1]
+    assert isinstance(account, Account)
+    assert account.username == "user2" and account.id == str(10 ** 9 + 2)
+    assert account.is_verified is True
+    with pytest.raises(IndexError):
+        columns[3]
+
+
+def test_media_columns_extend():
+    columns = MediaColumns([media_node(0)], pointer="a")
+    columns.extend(MediaColumns([media_node(1)]))
+    assert list(columns.likes_count) == [0, 1]
+    assert list(columns.comments_count) == [0, 2]
+    assert [media.code for media in columns] == ["code0", "code1"]
+    with pytest.raises(TypeError):
+        columns.extend(AccountColumns())
@@ -0,0 +1,61 @@
+import aiohttp
+import pytest
+from yarl import URL
+
+from pyinstagram.agents import (
+    AsyncMobileAccountAgent,
+    AsyncWebAccountAgent,
+    AsyncWebAgent,
+    ConnectionPool,
+)
+
+
+@pytest.mark.asyncio
+async def test_pool_shares_connector_and_isolates_cookies():
+    pool = ConnectionPool(limit_per_host=4)
+    first = AsyncWebAccountAgent("first", cookies={"sessionid": "1"}, connector=pool)
+    second = AsyncWebAccountAgent("second", cookies={"sessionid": "2"}, connector=pool)
+    mobile = AsyncMobileAccountAgent("mobile", connector=pool)
+
+    assert first.session.connector is second.session.connector is pool.connector
+    assert mobile._session.connector is pool.connector
+    assert pool.connector.limit_per_host == 4
+    assert first.session.cookie_jar is not second.session.cookie_jar
+    url = URL("https://www.instagram.com/")
+    assert first.session.cookie_jar.filter_cookies(url)["sessionid"].value == "1"
+    assert second.session.cookie_jar.filter_cookies(url)["sessionid"].value == "2"
+
+    await first.close()
+    assert first.session.closed
+    assert not pool.closed
+    await second.close()
+    await mobile.close()
+    await pool.close()
+    assert pool.closed
+
+
+@pytest.mark.asyncio
+async def test_agent_with_connector():
+    connector = aiohttp.TCPConnector()
+    agent = AsyncWebAgent(connector=connector)
+    assert agent.session.connector is connector
+    await agent.close()
+    assert not connector.closed
+    await connector.close()
+
+
+@pytest.mark.asyncio
+async def test_agent_with_session():
+    session = aiohttp.ClientSession()
+    agent = AsyncWebAgent(session=session)
+    assert agent.session is session
+    await agent.close()
+    assert not session.closed
+    await session.close()
+
+    with pytest.raises(ValueError):
+        AsyncWebAgent(session=session, connector=aiohttp.TCPConnector())
+    with pytest.raises(ValueError):
+        AsyncWebAgent(session=session, cookies={"sessionid": "1"})
+    with pytest.raises(TypeError):
+        AsyncWebAgent(connector="connector")
@@ -0,0 +1,41 @@
+import json
+
+import pytest
+
+from pyinstagram.agents import decoders
+
+
+def teardown_function():
+    decoders.set_backend(decoders.get_default_backend())
+
+
+def test_default_backend():
+    assert decoders.backend == decoders.get_default_backend()
+    assert decoders.loads('{"a": [1, 2]}') == {"a": [1, 2]}
+
+
+def test_set_backend():
+    decoders.set_backend("json")
+    assert decoders.loads is json.loads
+
+    calls = []
+
+    def loads(content):
+        calls.append(content)
+        return json.loads(content)
+
+    decoders.set_backend(loads)
+    assert decoders.loads("{}") == {} and calls == ["{}"]
+
+
+def test_set_unknown_backend():
+    with pytest.raises(ValueError):
+        decoders.set_backend("unknown")
+    with pytest.raises(TypeError):
+        decoders.set_backend(1)
+
+
+@pytest.mark.parametrize("name", list(decoders.BACKENDS))
+def test_backends_raise_value_error(name):
+    with pytest.raises(ValueError):
+        decoders.BACKENDS[name]("{")
@@ -1,7 +1,10 @@
 from pyinstagram.entities import Account, Comment, Location, Media, Story, Tag
+from pyinstagram.entities import EntityCache, LRUEntityCache, TTLEntityCache, WeakEntityCache
+import gc
 import pytest
 from random import randint, choice
 from string import ascii_uppercase, ascii_lowercase, digits
+import time
 
 
 def setup_function():
@@ -65,3 +68,119 @@ def test_story_creation(id):
     story = Story(id)
     assert getattr(story, story.primary_key) == id
     assert len(Story.cache) == 1 and Story.cache[id] is story
+
+
+@pytest.fixture
+def entity_caches():
+    caches = {cls: cls.cache for cls in (Account, Media)}
+    yield
+    for cls, cache in caches.items():
+        cls.cache = cache
+
+
+def test_cache_stats(entity_caches):
+    Account.set_cache(EntityCache())
+    account = Account("test")
+    assert Account("test") is account
+    assert Account.cache.stats() == {"size": 1, "hits": 1, "misses": 1, "evictions": 0}
+
+
+def test_lru_cache_eviction(entity_caches):
+    Account.set_cache(LRUEntityCache(max_size=2))
+    first = Account("first")
+    Account("second")
+    assert Account("first") is first
+    Account("third")
+    assert "first" in Account.cache and "second" not in Account.cache
+    assert Account.cache.evictions == 1
+
+
+def test_ttl_cache_expiration(monkeypatch, entity_caches):
+    now = [0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    Media.set_cache(TTLEntityCache(ttl=10))
+    media = Media("test")
+    now[0] = 5
+    assert Media("test") is media
+    now[0] = 11
+    assert len(Media.cache) == 0 and Media.cache.evictions == 1
+
+
+def test_set_cache_keeps_entities(entity_caches):
+    account = Account("test")
+    Account.set_cache(LRUEntityCache(max_size=10))
+    assert Account("test") is account
+
+
+def test_weak_cache_keeps_only_live_entities(entity_caches):
+    Account.set_cache(WeakEntityCache())
+    account = Account("test")
+    media = Media("media")
+    media.owner = Account("owner")
+    assert Account("test") is account
+    assert len(Account.cache) == 2
+    del account
+    gc.collect()
+    assert "test" not in Account.cache
+    assert Account("owner") is media.owner
+
+
+def test_compact_representation():
+    account = Account("test")
+    media = Media("test")
+    assert not hasattr(account, "__dict__") and not hasattr(media, "__dict__")
+    assert account._followers is None
+    account.followers.add(Account("follower"))
+    assert len(account.followers) == 1
+    media.album = {Media("child")}
+    assert len(media.album) == 1
+
+
+def test_lazy_media_hydration_matches_eager():
+    from pyinstagram.tests import payloads
+
+    fields = ("id", "caption", "owner", "date", "location", "likes_count", "comments_count",
+              "comments_disabled", "is_video", "video_url", "is_ad", "display_url", "resources",
+              "is_album")
+    node = payloads.media_node(3, album=True)
+    eager = Media.from_web_data(node)
+    expected = {name: getattr(eager, name) for name in fields}
+    expected["album"] = {child.code for child in eager.album}
+    Media.clear_cache()
+
+    lazy = Media.from_web_data(node, lazy=True)
+    assert len(Media.cache) == 1 and lazy.date == node["taken_at_timestamp"]
+    lazy.owner = Account("parent")
+    assert lazy.is_album and {child.code for child in lazy.album} == expected["album"]
+    assert len(Media.cache) == 4
+
+    lazy.hydrate()
+    assert lazy._web_data is None and lazy.owner is Account("parent")
+    assert {name: getattr(lazy, name) for name in fields if name != "owner"} == \
+        {name: value for name, value in expected.items() if name not in ("owner", "album")}
+    with pytest.raises(AttributeError):
+        lazy.unknown
+
+
+def test_lazy_media_eager_refresh_sets_every_field():
+    from pyinstagram.tests import payloads
+
+    node = payloads.media_node(5)
+    media = Media.from_web_data(node, lazy=True)
+    refreshed = dict(node, owner={"id": node["owner"]["id"]})
+    del refreshed["location"]
+    media.set_web_data(refreshed)
+
+    assert media._web_data is None
+    assert media.owner is Account("user0")
+    assert media.location is None and media.is_ad is None and media.video_url is None
+    assert media.likes_count == node["edge_media_preview_like"]["count"]
+
+
+def test_lazy_media_reuses_cached_entity():
+    from pyinstagram.tests import payloads
+
+    media = Media("B000000007x")
+    media.caption = "old"
+    assert Media.from_web_data(payloads.media_node(7), lazy=True) is media
+    assert media.caption.startswith("Caption for media 7")
@@ -0,0 +1,31 @@
+import pytest
+
+from pyinstagram.agents import AsyncMobileAccountAgent
+
+
+@pytest.mark.asyncio
+async def test_default_headers_close_connection():
+    agent = AsyncMobileAccountAgent("user0")
+    headers = agent.get_default_headers()
+    await agent.close()
+
+    assert headers["Connection"] == "close"
+    assert headers["User-Agent"] == agent.get_user_agent()
+    assert headers["X-IG-Connection-Speed"].endswith("kbps")
+
+
+@pytest.mark.asyncio
+async def test_default_headers_keep_alive_are_cached():
+    agent = AsyncMobileAccountAgent("user0", keep_alive=True)
+    first = agent.get_default_headers()
+    second = agent.get_default_headers()
+    first["X-Custom"] = "1"
+    await agent.close()
+
+    assert second["Connection"] == "keep-alive"
+    assert "X-Custom" not in agent.get_default_headers()
+    assert agent.get_static_headers() is agent.get_static_headers()
+    assert "X-IG-Connection-Speed" not in agent.get_static_headers()
+
+    with pytest.raises(TypeError):
+        AsyncMobileAccountAgent("user0", keep_alive=1)
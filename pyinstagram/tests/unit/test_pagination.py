@@ -0,0 +1,226 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from pyinstagram.agents import (
+    AsyncWebAgent,
+    MemoryCheckpointStore,
+    Page,
+)
+from pyinstagram.agents.pagination import prefetch
+from pyinstagram.columns import AccountColumns
+from pyinstagram.entities import (
+    Account,
+    Media,
+)
+from pyinstagram.exceptions import UnexpectedResponse
+from pyinstagram.tests.server import FakeInstagramServer
+
+
+def setup_function():
+    Account.clear_cache()
+    Media.clear_cache()
+
+
+def likes_page(start, size, total):
+    end = min(start + size, total)
+    return json.dumps({"data": {"shortcode_media": {"edge_liked_by": {
+        "count": total,
+        "page_info": {
+            "has_next_page": end < total,
+            "end_cursor": str(end) if end < total else None,
+        },
+        "edges": [
+            {"node": {
+                "id": str(index),
+                "username": "user%d" % index,
+                "full_name": "User %d" % index,
+                "profile_pic_url": "https://example.com/%d.jpg" % index,
+                "is_verified": False,
+            }}
+            for index in range(start, end)
+        ],
+    }}}})
+
+
+class FakeAgent(AsyncWebAgent):
+    def __init__(self, total, prefetch=0, checkpoints=None):
+        super().__init__(prefetch=prefetch, checkpoints=checkpoints)
+        self.total = total
+        self.requests = []
+
+    async def _graphql_request(self, query_hash, variables, referer_path, settings=None):
+        variables = json.loads(variables)
+        self.requests.append(variables)
+        start = int(variables.get("after", 0))
+        return likes_page(start, variables["first"], self.total)
+
+
+@pytest.mark.asyncio
+async def test_iter_likes_yields_pages_with_pointer():
+    agent = FakeAgent(total=25)
+    media = Media("test")
+    media.id = "1"
+
+    pages = [page async for page in agent.iter_likes(media, count=25, limit=10)]
+    await agent.session.close()
+
+    assert all(isinstance(page, Page) for page in pages)
+    assert [len(page) for page in pages] == [10, 10, 5]
+    assert [page.pointer for page in pages] == ["10", "20", None]
+    assert media.likes_count == 25
+    assert len(media.likes) == 25
+
+
+@pytest.mark.asyncio
+async def test_get_likes_collects_all_pages():
+    agent = FakeAgent(total=100)
+    media = Media("test")
+    media.id = "1"
+
+    likes, pointer = await agent.get_likes(media, count=30, limit=20)
+    await agent.session.close()
+
+    assert [account.username for account in likes] == ["user%d" % i for i in range(30)]
+    assert pointer == "30"
+    assert [request["first"] for request in agent.requests] == [20, 10]
+
+
+@pytest.mark.asyncio
+async def test_iter_likes_resumes_from_pointer():
+    agent = FakeAgent(total=50)
+    media = Media("test")
+    media.id = "1"
+
+    likes, pointer = await agent.get_likes(media, pointer="40", count=20, limit=50)
+    await agent.session.close()
+
+    assert [account.username for account in likes] == ["user%d" % i for i in range(40, 50)]
+    assert pointer is None
+
+
+async def crawl_with_work(server, prefetch, work=0.1):
+    agent = AsyncWebAgent(api_url=server.url, prefetch=prefetch)
+    account = Account("target")
+    try:
+        await agent.update(account)
+        start = time.perf_counter()
+        pages = 0
+        async for page in agent.iter_media(account, count=50, limit=10):
+            pages += 1
+            await asyncio.sleep(work)
+        return pages, time.perf_counter() - start
+    finally:
+        await agent.close()
+
+
+@pytest.mark.asyncio
+async def test_prefetch_overlaps_requests_with_parsing():
+    async with FakeInstagramServer(latency=0.1, media=50) as server:
+        pages, sequential = await crawl_with_work(server, prefetch=0)
+        assert pages == 5 and sequential >= 1.0
+        for depth in (1, 2):
+            pages, overlapped = await crawl_with_work(server, prefetch=depth)
+            assert pages == 5 and overlapped < 0.8
+    assert server.requests["/graphql/query/"] == 12
+
+
+@pytest.mark.asyncio
+async def test_prefetch_propagates_errors():
+    agent = FakeAgent(total=30, prefetch=2)
+    media = Media("test")
+    media.id = "1"
+
+    async def broken(*args, **kwargs):
+        return "{}"
+
+    agent._graphql_request = broken
+    with pytest.raises(UnexpectedResponse):
+        await agent.get_likes(media, count=30, limit=10)
+    await agent.session.close()
+
+
+@pytest.mark.asyncio
+async def test_get_likes_columnar():
+    agent = FakeAgent(total=25)
+    media = Media("test")
+    media.id = "1"
+
+    likes, pointer = await agent.get_likes(media, count=25, limit=10, columnar=True)
+    await agent.session.close()
+
+    assert isinstance(likes, AccountColumns)
+    assert len(likes) == 25 and pointer is None
+    assert len(Account.cache) == 0
+    assert likes[3].username == "user3"
+
+
+@pytest.mark.asyncio
+async def test_checkpoints_resume_interrupted_crawl():
+    checkpoints = MemoryCheckpointStore()
+    agent = FakeAgent(total=50, checkpoints=checkpoints)
+    media = Media("test")
+    media.id = "1"
+    graphql_request = agent._graphql_request
+
+    async def broken(query_hash, variables, referer_path, settings=None):
+        if json.loads(variables).get("after") == "20":
+            raise ConnectionResetError()
+        return await graphql_request(query_hash, variables, referer_path, settings)
+
+    agent._graphql_request = broken
+    with pytest.raises(ConnectionResetError):
+        await agent.get_likes(media, count=50, limit=10)
+    assert checkpoints.get("Media:test", "1cb6ec562846122743b61e492c85999f") == "20"
+
+    agent._graphql_request = graphql_request
+    agent.requests.clear()
+    likes, pointer = await agent.get_likes(media, count=50, limit=10)
+    await agent.session.close()
+
+    assert agent.requests[0]["after"] == "20"
+    assert [account.username for account in likes][0] == "user20"
+    assert pointer is None
+    assert len(checkpoints) == 0
+
+
+@pytest.mark.asyncio
+async def test_checkpoints_do_not_change_completed_calls():
+    checkpoints = MemoryCheckpointStore()
+    agent = FakeAgent(total=50, checkpoints=checkpoints)
+    media = Media("test")
+    media.id = "1"
+
+    first, _ = await agent.get_likes(media, count=10, limit=10)
+    second, _ = await agent.get_likes(media, count=10, limit=10)
+    pages = agent.iter_likes(media, count=50, limit=10)
+    await pages.__anext__()
+    await pages.aclose()
+    third, _ = await agent.get_likes(media, count=10, limit=10)
+    await agent.session.close()
+
+    assert [a.username for a in first] == [a.username for a in second] == \
+        [a.username for a in third] == ["user%d" % index for index in range(10)]
+    assert len(checkpoints) == 0
+
+
+@pytest.mark.asyncio
+async def test_prefetch_cleans_up_on_early_exit():
+    closed = []
+
+    async def pages():
+        try:
+            for index in range(10):
+                await asyncio.sleep(0)
+                yield index
+        finally:
+            closed.append(True)
+
+    iterator = prefetch(pages(), depth=2)
+    assert await iterator.__anext__() == 0
+    await iterator.aclose()
+
+    assert closed == [True]
+    assert not [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
@@ -0,0 +1,105 @@
+import pytest
+
+from pyinstagram.agents import (
+    AsyncWebAccountAgent,
+    AsyncWebAgent,
+)
+from pyinstagram.entities import (
+    Account,
+    Location,
+    Media,
+    Tag,
+)
+from pyinstagram.records import (
+    MEDIA_FIELDS,
+    Projection,
+)
+from pyinstagram.tests import payloads
+from pyinstagram.tests.server import FakeInstagramServer
+
+
+def setup_function():
+    for cls in (Account, Media, Location, Tag):
+        cls.clear_cache()
+
+
+def test_projection_record_and_validation():
+    projection = Projection(Account, ["username", "id"])
+    node = {"id": "1", "username": "user", "full_name": "User", "is_verified": False}
+
+    assert projection.record(node) == {"username": "user", "id": "1"}
+    assert "username" in projection and "full_name" not in projection
+    with pytest.raises(ValueError, match="not available"):
+        Projection(Account, ["username", "followers_count"])
+    with pytest.raises(ValueError, match="Unknown Account fields"):
+        Projection(Account, ["username", "owner_id"])
+    with pytest.raises(TypeError):
+        Projection(Account, "username")
+    assert set(MEDIA_FIELDS) == set(Media.web_fields)
+    with pytest.raises(ValueError, match="Unknown Media fields"):
+        Media.get_web_fields(["_album"])
+
+
+def test_set_web_data_fields():
+    media = Media.from_web_data(payloads.media_node(0), fields=["date", "likes_count"])
+
+    assert media.code == payloads.media_node(0)["shortcode"]
+    assert media.likes_count is not None and media.date is not None
+    assert media.caption is None and media.display_url is None
+    with pytest.raises(ValueError):
+        Media.get_web_fields(["followers_count"])
+
+
+def test_lazy_web_data_fields():
+    node = payloads.media_node(1, album=True)
+    media = Media.from_web_data(node, lazy=True, fields=["date", "album"])
+
+    assert media.date == node["taken_at_timestamp"] and len(media.album) == 3
+    assert media.caption is None and media.likes_count is None
+    media.hydrate()
+    assert media.display_url is None and media.resources is None
+
+    media = Media.from_web_data(node, lazy=True, fields=["caption"])
+    assert media.caption is not None and media.date == node["taken_at_timestamp"]
+
+
+@pytest.mark.asyncio
+async def test_agents_fields_and_records():
+    async with FakeInstagramServer(media=30, followers=40) as server:
+        agent = AsyncWebAgent(api_url=server.url)
+        account_agent = AsyncWebAccountAgent("viewer", api_url=server.url)
+        account = Account("target")
+        try:
+            await agent.update(account, fields=["followers_count"])
+            assert account.followers_count == 40 and account.full_name is None
+
+            medias, _ = await agent.get_media(account, count=30, fields=["date", "likes_count"])
+            assert len(medias) == 30
+            assert all(m.date is not None and m.caption is None for m in medias)
+
+            records, _ = await agent.get_media(account, count=30, records=True,
+                                               fields=["code", "date", "likes_count"])
+            assert len(records) == 30
+            assert set(records[0]) == {"code", "date", "likes_count"}
+
+            followers, _ = await account_agent.get_followers(
+                account, count=40, fields=["username", "id"], records=True,
+            )
+            assert len(followers) == 40
+            assert all(set(record) == {"username", "id"} for record in followers)
+            assert not account.followers
+
+            followers, _ = await account_agent.get_followers(account, count=40,
+                                                             fields=["id"])
+            assert all(a.id is not None and a.full_name is None for a in followers)
+            assert len(account.followers) == 40
+
+            with pytest.raises(ValueError):
+                await agent.get_media(account, fields=["followers_count"])
+            with pytest.raises(ValueError):
+                await agent.get_media(account, columnar=True, records=True)
+            with pytest.raises(ValueError):
+                await agent.update(account, fields=["media_count", "code"])
+        finally:
+            await agent.close()
+            await account_agent.close()
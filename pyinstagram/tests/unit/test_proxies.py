@@ -0,0 +1,83 @@
+import aiohttp
+import pytest
+
+from pyinstagram.agents import (
+    ProxyRotator,
+    RetryPolicy,
+)
+from pyinstagram.tests.fakes import create_agent
+
+
+def test_rotator_sticky_assignment_and_eviction():
+    rotator = ProxyRotator(["http://a:1", "http://b:1", "http://c:1"], max_errors=2, eviction=60)
+
+    first = rotator.get("user0")
+    second = rotator.get("user1")
+    assert first != second
+    assert rotator.get("user0") == first
+
+    rotator.report(first, 0.1, error=True)
+    rotator.report(first, 0.1, error=True)
+    assert not rotator.stats()[first]["healthy"]
+    replacement = rotator.get("user0")
+    assert replacement not in (first, second)
+
+    rotator.restore(first)
+    assert rotator.stats()[first]["healthy"]
+    assert rotator.stats()[first]["error_rate"] == 1.0
+    assert rotator.stats()[first]["average_latency"] == pytest.approx(0.1)
+
+
+def test_rotator_round_robin_skips_evicted():
+    rotator = ProxyRotator(["http://a:1", "http://b:1"])
+    rotator.evict("http://a:1")
+    assert [rotator.get() for _ in range(3)] == ["http://b:1"] * 3
+    rotator.evict("http://b:1", 600)
+    assert rotator.get() == "http://a:1"
+
+    with pytest.raises(ValueError):
+        ProxyRotator([])
+
+
+def refuse(proxy):
+    def handler(request):
+        if request.kwargs.get("proxy") == proxy:
+            return aiohttp.ClientConnectionError("refused")
+        return "ok"
+
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_agent_reports_to_rotator():
+    rotator = ProxyRotator(["http://a:1", "http://b:1"], max_errors=1)
+    broken = rotator.get("user0")
+    agent = await create_agent(refuse(broken), proxy=rotator)
+
+    with pytest.raises(aiohttp.ClientError):
+        await agent._get_request("user0/")
+    assert await agent._get_request("user0/") == "ok"
+
+    assert agent.session.proxies[0] == broken
+    assert agent.session.proxies[1] != broken
+    assert rotator.stats()[broken]["errors"] == 1
+    assert rotator.stats()[agent.session.proxies[1]]["requests"] == 1
+
+
+@pytest.mark.asyncio
+async def test_agent_retry_rotates_evicted_proxy():
+    rotator = ProxyRotator(["http://a:1", "http://b:1"], max_errors=1)
+    broken = rotator.get("user0")
+    agent = await create_agent(refuse(broken), proxy=rotator,
+                               retry_policy=RetryPolicy(attempts=2, backoff=0, jitter=0))
+
+    assert await agent._get_request("user0/") == "ok"
+    assert agent.session.proxies[0] == broken
+    assert agent.session.proxies[1] not in (None, broken)
+
+
+@pytest.mark.asyncio
+async def test_agent_static_proxy():
+    agent = await create_agent(proxy="http://static:1")
+    await agent._get_request("user0/")
+    assert agent.session.proxies == ["http://static:1"]
@@ -0,0 +1,76 @@
+import pytest
+
+from pyinstagram.agents import (
+    AsyncWebAccountAgent,
+    Rate,
+    RateLimiter,
+)
+from pyinstagram.tests.fakes import create_agent
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_delays_after_burst(monkeypatch):
+    delays = []
+
+    async def sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr("pyinstagram.agents.rate_limiter.asyncio.sleep", sleep)
+    limiter = RateLimiter(endpoints={"graphql": Rate(10, 1, burst=2)})
+
+    for _ in range(4):
+        await limiter.acquire("graphql:abc", account="user0")
+    await limiter.acquire("graphql:abc", account="user1")
+    await limiter.acquire("page", account="user0")
+
+    assert delays[:2] == [pytest.approx(0.1, abs=0.01), pytest.approx(0.2, abs=0.01)]
+    assert len(delays) == 2
+    assert limiter.stats()["requests"] == 6
+    assert limiter.stats()["delayed"] == 2
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_query_hash_override_and_penalty(monkeypatch):
+    delays = []
+
+    async def sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr("pyinstagram.agents.rate_limiter.asyncio.sleep", sleep)
+    limiter = RateLimiter(
+        ip=Rate(1000, 1, burst=1000),
+        endpoints={"graphql": Rate(1, 1, burst=5), "graphql:slow": Rate(1, 10)},
+    )
+
+    await limiter.acquire("graphql:slow", ip="1.1.1.1")
+    await limiter.acquire("graphql:slow", ip="1.1.1.1")
+    assert delays == [pytest.approx(10, abs=0.01)]
+
+    limiter.penalize(30, "graphql:fast", ip="1.1.1.1")
+    await limiter.acquire("graphql:fast", ip="1.1.1.1")
+    assert delays[-1] == pytest.approx(30, abs=0.01)
+
+
+@pytest.mark.asyncio
+async def test_agent_uses_account_and_ip(monkeypatch):
+    calls = []
+
+    async def acquire(endpoint, account=None, ip=None):
+        calls.append((endpoint, account, ip))
+        return 0
+
+    limiter = RateLimiter()
+    monkeypatch.setattr(limiter, "acquire", acquire)
+    agent = await create_agent(rate_limiter=limiter, ip="10.0.0.1")
+
+    await agent._graphql_request("hash", "{}", "")
+    await agent._get_request("user0/")
+    await agent._action_request("web/likes/1/like/", "")
+
+    assert calls == [
+        ("graphql:hash", "user0", "10.0.0.1"),
+        ("page", "user0", "10.0.0.1"),
+        ("action", "user0", "10.0.0.1"),
+    ]
+    with pytest.raises(TypeError):
+        AsyncWebAccountAgent("user0", rate_limiter="limiter")
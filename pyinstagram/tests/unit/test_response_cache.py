@@ -0,0 +1,93 @@
+import pytest
+
+from pyinstagram.agents import (
+    MemoryResponseCacheBackend,
+    ResponseCache,
+    SQLiteResponseCacheBackend,
+)
+from pyinstagram.entities import (
+    Account,
+    Media,
+)
+from pyinstagram.tests import payloads
+from pyinstagram.tests.fakes import (
+    create_agent,
+    instagram,
+)
+
+
+def setup_function():
+    Account.clear_cache()
+    Media.clear_cache()
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "sqlite":
+        backend = SQLiteResponseCacheBackend(str(tmp_path / "responses.sqlite"))
+        yield backend
+        backend.close()
+    else:
+        yield MemoryResponseCacheBackend(max_size=2)
+
+
+def test_response_cache_backends(backend):
+    cache = ResponseCache(backend=backend, ttls={"Tag": 0})
+    cache.set("Account", "https://www.instagram.com/user0/", "page")
+    cache.set("Account", "https://www.instagram.com/user0", "likes", "hash", '{"first":10}')
+    cache.set("Tag", "https://www.instagram.com/explore/tags/cats", "tag")
+
+    assert cache.get("Account", "https://www.instagram.com/user0") == "page"
+    assert cache.get("Account", "https://www.instagram.com/user0", "hash", '{"first":10}') == \
+        "likes"
+    assert cache.get("Account", "https://www.instagram.com/user01") is None
+    assert cache.get("Tag", "https://www.instagram.com/explore/tags/cats") is None
+    assert cache.stats()["hit_ratio"] == pytest.approx(2 / 3)
+
+    assert cache.invalidate("https://www.instagram.com/user0/") == 2
+    assert cache.get("Account", "https://www.instagram.com/user0") is None
+
+
+def test_memory_backend_expires_and_evicts():
+    backend = MemoryResponseCacheBackend(max_size=2)
+    backend.set("a", "1", ttl=-1)
+    backend.set("b", "2", ttl=60)
+    backend.set("c", "3", ttl=60)
+    backend.set("d", "4", ttl=60)
+    assert backend.get("a") is None and backend.get("b") is None
+    assert backend.get("c") == "3" and len(backend) == 2
+
+
+@pytest.mark.asyncio
+async def test_agent_caches_pages_and_invalidates_after_actions():
+    cache = ResponseCache()
+    agent = await create_agent(instagram, response_cache=cache)
+    account = Account("target")
+
+    await agent.update(account)
+    await agent.update(account)
+    await agent.get_followers(account, count=10)
+    await agent.get_followers(account, count=10)
+    assert len(agent.session.requests) == 2
+    assert cache.stats()["hits"] == 2
+
+    await agent.follow(account)
+    await agent.update(account)
+    assert [request.method for request in agent.session.requests] == ["GET", "GET", "POST", "GET"]
+
+
+@pytest.mark.asyncio
+async def test_agent_keeps_session_tokens_on_cache_hits():
+    cache = ResponseCache()
+    cache.set("Account", "https://www.instagram.com/target", payloads.profile_html("target", padding=0))
+    agent = await create_agent(instagram, response_cache=cache)
+    agent.rhx_gis, agent.csrf_token = "own-rhx", "own-csrf"
+
+    await agent.update(Account("target"))
+    assert (agent.rhx_gis, agent.csrf_token) == ("own-rhx", "own-csrf")
+    assert agent.session.requests == []
+
+    await agent.update()
+    await agent.update()
+    assert len(agent.session.requests) == 2
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 0)
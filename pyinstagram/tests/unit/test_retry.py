@@ -0,0 +1,117 @@
+import aiohttp
+import pytest
+
+from pyinstagram.agents import (
+    Rate,
+    RateLimiter,
+    RetryPolicy,
+)
+from pyinstagram.exceptions import RetryException
+from pyinstagram.tests.fakes import (
+    FakeResponse,
+    create_agent,
+)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    result = []
+
+    async def sleep(delay):
+        result.append(delay)
+
+    monkeypatch.setattr("pyinstagram.agents.async_web_agent.asyncio.sleep", sleep)
+    monkeypatch.setattr("pyinstagram.agents.rate_limiter.asyncio.sleep", sleep)
+    return result
+
+
+def test_retry_policy_delay():
+    policy = RetryPolicy(backoff=1, max_backoff=10, jitter=0)
+    assert [policy.get_delay(attempt) for attempt in range(5)] == [1, 2, 4, 8, 10]
+    assert policy.get_delay(0, retry_after=30) == 30
+    assert policy.parse_retry_after("12") == 12
+    assert policy.parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert policy.parse_retry_after("soon") is None
+
+
+@pytest.mark.asyncio
+async def test_get_request_retries_transient_errors(sleeps):
+    responses = [
+        aiohttp.ServerDisconnectedError(),
+        FakeResponse(502),
+        FakeResponse(429, {"Retry-After": "7"}),
+        FakeResponse(200),
+    ]
+    agent = await create_agent(responses, retry_policy=RetryPolicy(backoff=1, jitter=0))
+
+    assert await agent._get_request("user0/") == "status 200"
+    assert len(agent.session.requests) == 4
+    assert sleeps == [1, 2, 7]
+
+
+@pytest.mark.asyncio
+async def test_get_request_retries_body_read_errors(sleeps):
+    responses = [
+        FakeResponse(200, content=aiohttp.ClientPayloadError("truncated body")),
+        FakeResponse(200),
+    ]
+    agent = await create_agent(responses, retry_policy=RetryPolicy(backoff=1, jitter=0))
+
+    assert await agent._get_request("user0/") == "status 200"
+    assert len(agent.session.requests) == 2
+    assert sleeps == [1]
+
+
+@pytest.mark.asyncio
+async def test_throttling_penalizes_rate_limiter(sleeps):
+    limiter = RateLimiter(account=Rate(100, 1, burst=100))
+    agent = await create_agent(
+        [FakeResponse(429, {"Retry-After": "5"}), FakeResponse(200)],
+        retry_policy=RetryPolicy(),
+        rate_limiter=limiter,
+    )
+
+    assert await agent._graphql_request("hash", "{}", "") == "status 200"
+    assert sleeps == [pytest.approx(5, abs=0.01)]
+    assert limiter.get_buckets("graphql", account="user0")[0].factor < 1
+
+
+@pytest.mark.asyncio
+async def test_throttling_without_matching_bucket_backs_off(sleeps):
+    limiter = RateLimiter(endpoints={"page": Rate(100, 1, burst=100)})
+    agent = await create_agent(
+        [FakeResponse(429, {"Retry-After": "5"}), FakeResponse(200)],
+        retry_policy=RetryPolicy(),
+        rate_limiter=limiter,
+    )
+
+    assert await agent._graphql_request("hash", "{}", "") == "status 200"
+    assert sleeps == [5]
+    assert not limiter.penalize(5, "graphql", account="user0")
+
+
+@pytest.mark.asyncio
+async def test_actions_are_not_retried_without_opt_in(sleeps):
+    agent = await create_agent([FakeResponse(503), FakeResponse(200)], retry_policy=RetryPolicy())
+    with pytest.raises(RetryException) as error:
+        await agent._action_request("web/likes/1/like/", "")
+    assert error.value.attempts == 1
+    assert sleeps == []
+
+    agent = await create_agent(
+        [FakeResponse(503), FakeResponse(200)],
+        retry_policy=RetryPolicy(retry_actions=True, jitter=0),
+    )
+    assert await agent._action_request("web/likes/1/like/", "") == "status 200"
+
+
+@pytest.mark.asyncio
+async def test_retries_exhausted(sleeps):
+    responses = [FakeResponse(500) for _ in range(3)]
+    agent = await create_agent(responses, retry_policy=RetryPolicy(attempts=3))
+    with pytest.raises(RetryException) as error:
+        await agent._get_request("user0/")
+    assert error.value.attempts == 3
+    assert len(sleeps) == 2
+    assert all(response.released for response in responses)
+
@@ -0,0 +1,85 @@
+import pytest
+
+from pyinstagram.agents import (
+    AsyncWebAccountAgent,
+    AsyncWebAgent,
+    RetryPolicy,
+)
+from pyinstagram.entities import (
+    Account,
+    Location,
+    Media,
+    Tag,
+)
+from pyinstagram.exceptions import RetryException
+from pyinstagram.tests.server import FakeInstagramServer
+
+
+def setup_function():
+    for cls in (Account, Media, Location, Tag):
+        cls.clear_cache()
+
+
+@pytest.mark.asyncio
+async def test_agent_against_fake_server():
+    async with FakeInstagramServer(media=30, likes=25, comments=10) as server:
+        agent = AsyncWebAgent(api_url=server.url)
+        account = Account("target")
+        media = Media("Bcode")
+        tag = Tag("sunset")
+        location = Location("1234")
+        try:
+            await agent.update(account)
+            await agent.update(tag)
+            await agent.update(location)
+            assert account.media_count == 30 and tag.media_count == 30
+            assert location.name == "Location 1234"
+            medias, _ = await agent.get_media(account, count=30)
+            likes, _ = await agent.get_likes(media, count=30)
+            comments, _ = await agent.get_comments(media, count=30)
+        finally:
+            await agent.close()
+
+    assert len(medias) == 30 and len(likes) == 25 and len(comments) == 10
+    assert server.requests["/graphql/query/"] == 2
+
+
+@pytest.mark.asyncio
+async def test_account_agent_against_fake_server():
+    async with FakeInstagramServer(followers=70, follows=5, media=100) as server:
+        agent = AsyncWebAccountAgent("target", api_url=server.url)
+        try:
+            await agent.update()
+            followers, _ = await agent.get_followers(count=100)
+            follows, _ = await agent.get_follows(count=100)
+            feed, _ = await agent.feed(count=100)
+            stories = await agent.stories()
+            liked = await agent.like(Media("Bcode"))
+        finally:
+            await agent.close()
+
+    assert len(followers) == 70 and len(follows) == 5 and len(feed) == 100
+    assert len(stories) == 3 and liked
+    assert server.requests["/graphql/query/"] == 7
+
+
+@pytest.mark.asyncio
+async def test_fake_server_throttling_and_errors():
+    async with FakeInstagramServer(throttle=1, throttle_period=60, retry_after=7) as server:
+        agent = AsyncWebAgent(api_url=server.url, retry_policy=RetryPolicy(attempts=1))
+        try:
+            await agent.update(Account("target"))
+            with pytest.raises(RetryException) as info:
+                await agent.update(Account("other"))
+        finally:
+            await agent.close()
+    assert info.value.status == 429 and server.throttled == 1
+
+    async with FakeInstagramServer(error_rate=1.0, error_status=503) as server:
+        agent = AsyncWebAgent(api_url=server.url, retry_policy=RetryPolicy(attempts=2, backoff=0))
+        try:
+            with pytest.raises(RetryException) as info:
+                await agent.update(Account("target"))
+        finally:
+            await agent.close()
+    assert info.value.status == 503 and server.errors == 2
@@ -0,0 +1,71 @@
+import pytest
+
+from pyinstagram.agents import AsyncWebAgent
+from pyinstagram.agents.shared_data import (
+    SharedDataReader,
+    find_shared_data,
+    find_shared_data_regex,
+)
+from pyinstagram.entities import Account
+from pyinstagram.tests import payloads
+from pyinstagram.tests.server import FakeInstagramServer
+
+
+def test_find_shared_data():
+    content = payloads.profile_html(padding=10000)
+    data = find_shared_data(content)
+    assert data == find_shared_data_regex(content)
+    assert data["entry_data"]["ProfilePage"][0]["graphql"]["user"]["username"] == "user0"
+
+
+def test_find_shared_data_minified():
+    content = payloads.profile_html(padding=10000, minified=True)
+    assert find_shared_data(content)["config"]["csrf_token"] == "a" * 32
+
+
+def test_find_shared_data_with_script_end_in_string():
+    data = payloads.shared_data({"text": "</script>;"})
+    assert find_shared_data(payloads.html_page(data, padding=1000)) == data
+
+
+def test_find_shared_data_missing():
+    assert find_shared_data("<html><body></body></html>") is None
+
+
+def test_shared_data_reader_stops_after_script():
+    data = payloads.shared_data({"text": "</script>;"})
+    content = payloads.html_page(data, padding=100000)
+    reader = SharedDataReader()
+    window = 0
+    for index in range(0, len(content), 7):
+        if reader.feed(content[index:index + 7]):
+            break
+        window = max(window, len(reader.window))
+    assert reader.data == data
+    assert window < 100
+    assert len(reader.content) < len(content) // 10
+    assert find_shared_data(reader.content) == data
+
+
+def test_shared_data_reader_missing():
+    reader = SharedDataReader()
+    assert not reader.feed("<html><body>window._shared")
+    assert not reader.feed("</body></html>")
+    assert reader.data is None
+
+
+@pytest.mark.asyncio
+async def test_stream_update_parses_shared_data_once(monkeypatch):
+    def parse(content):
+        raise AssertionError("shared data parsed twice")
+
+    monkeypatch.setattr(AsyncWebAgent, "_get_shared_data", staticmethod(parse))
+    async with FakeInstagramServer() as server:
+        agent = AsyncWebAgent(api_url=server.url, stream=True)
+        account = Account("target")
+        try:
+            data = await agent.update(account)
+        finally:
+            await agent.close()
+    assert data["username"] == "target" and account.media_count is not None
+    Account.clear_cache()
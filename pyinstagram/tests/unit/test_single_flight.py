@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+
+from pyinstagram.entities import Account
+from pyinstagram.tests import (
+    fakes,
+    payloads,
+)
+
+
+def setup_function():
+    Account.clear_cache()
+
+
+async def create_agent(error=None):
+    def handler(request):
+        return error if error is not None else payloads.profile_html("target", padding=0)
+
+    return await fakes.create_agent(handler, username=None, latency=0.01)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_updates_share_one_request():
+    agent = await create_agent()
+    results = await asyncio.gather(*(agent.update(Account("target")) for _ in range(5)))
+
+    assert len(agent.session.requests) == 1
+    assert all(result["username"] == "target" for result in results)
+    assert Account("target") is Account.cache["target"]
+    assert agent._in_flight == {}
+
+    await agent.update(Account("target"))
+    assert len(agent.session.requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_different_params_are_not_coalesced():
+    agent = await create_agent()
+    await asyncio.gather(
+        agent._get_request("/graphql/query/", params={"variables": "1"}),
+        agent._get_request("/graphql/query/", params={"variables": "2"}),
+        agent._get_request("/graphql/query/", params={"variables": "2"}),
+    )
+    assert len(agent.session.requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_errors_and_cancellation_are_isolated():
+    agent = await create_agent(error=KeyError("broken"))
+    results = await asyncio.gather(
+        agent._get_request("target"),
+        agent._get_request("target"),
+        return_exceptions=True,
+    )
+    assert all(isinstance(result, KeyError) for result in results)
+    assert len(agent.session.requests) == 1
+
+    agent = await create_agent()
+    leader = asyncio.ensure_future(agent._get_request("target"))
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(agent._get_request("target"))
+    await asyncio.sleep(0)
+    leader.cancel()
+    assert "window._sharedData" in await follower
+    assert len(agent.session.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_request_is_cancelled_with_last_waiter():
+    responses = []
+
+    def handler(request):
+        responses.append(request)
+        return payloads.profile_html("target", padding=0)
+
+    agent = await fakes.create_agent(handler, username=None, latency=0.05)
+    waiters = [asyncio.ensure_future(agent._get_request("target")) for _ in range(2)]
+    await asyncio.sleep(0.01)
+    waiters[0].cancel()
+    await asyncio.sleep(0)
+    assert len(agent._in_flight) == 1
+
+    waiters[1].cancel()
+    await asyncio.gather(*waiters, return_exceptions=True)
+    assert agent._in_flight == {}
+    await asyncio.sleep(0.1)
+    assert len(agent.session.requests) == 1 and responses == []
+
+    assert "window._sharedData" in await agent._get_request("target")
+    assert len(responses) == 1
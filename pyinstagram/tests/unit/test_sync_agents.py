@@ -0,0 +1,100 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from pyinstagram.agents import (
+    ConnectionPool,
+    LoopThread,
+    MobileAccountAgent,
+    WebAccountAgent,
+    WebAgent,
+)
+from pyinstagram.entities import (
+    Account,
+    Media,
+)
+from pyinstagram.tests.server import FakeInstagramServer
+
+
+@pytest.fixture
+def server():
+    thread = LoopThread(name="fake-server")
+    server = FakeInstagramServer(media=30, followers=30)
+    thread.run(server.start())
+    yield server
+    thread.run(server.close())
+    thread.stop()
+
+
+def setup_function():
+    Account.clear_cache()
+    Media.clear_cache()
+
+
+def test_sync_agent_is_shared_between_threads(server):
+    with WebAgent(api_url=server.url) as agent:
+        with ThreadPoolExecutor(4) as executor:
+            results = list(executor.map(
+                lambda index: agent.update(Account("user%d" % index)),
+                range(8),
+            ))
+        medias, pointer = agent.get_media(Account("user0"), count=20)
+
+        assert [data["username"] for data in results] == ["user%d" % index for index in range(8)]
+        assert len(medias) == 20 and pointer is not None
+        assert agent.session._loop is agent.loop_thread.loop
+    assert agent.loop_thread.closed and agent.session.closed
+
+
+def test_sync_agents_share_loop_thread_and_pool(server):
+    thread = LoopThread()
+    pool = ConnectionPool()
+    first = WebAgent(api_url=server.url, connector=pool, loop_thread=thread)
+    second = WebAccountAgent("viewer", api_url=server.url, connector=pool, loop_thread=thread)
+    try:
+        first.update(Account("target"))
+        followers, _ = second.get_followers(Account("target"), count=30)
+
+        assert len(followers) == 30
+        assert first.session.connector is second.session.connector
+    finally:
+        first.close()
+        second.close()
+        thread.run(pool.close())
+
+    assert not thread.closed
+    thread.stop()
+    with pytest.raises(RuntimeError):
+        thread.submit(pool.close())
+    with pytest.raises(TypeError):
+        WebAgent(loop_thread=thread.loop)
+
+
+def test_sync_map_methods_keep_input_order(server):
+    server.latency = 0.01
+    accounts = [Account("user%d" % index) for index in (5, 1, 4, 2, 3)]
+    with WebAgent(api_url=server.url) as agent:
+        results = agent.map_update(accounts + ["broken"], workers=3, return_exceptions=True)
+        medias = agent.map_get_media(accounts[:2], count=15, workers=2)
+        with pytest.raises(TypeError):
+            agent.map_update(["broken"])
+        with pytest.raises(ValueError):
+            agent.map_update(accounts, workers=0)
+
+    assert [data["username"] for data in results[:-1]] == [str(account) for account in accounts]
+    assert isinstance(results[-1], TypeError)
+    assert [len(items) for items, _ in medias] == [15, 15]
+    assert {media.owner for media in medias[1][0]} == {accounts[1]}
+
+
+def test_sync_mobile_account_agent(server):
+    thread = LoopThread()
+    with MobileAccountAgent("viewer", api_url=server.url + "api/", loop_thread=thread) as agent:
+        assert agent.login("password")["status"] == "ok"
+        response = agent.update(Account("target"))
+        assert agent._session._loop is thread.loop
+
+    assert response["user_detail"]["user"]["media_count"] == 30
+    assert server.requests["/api/v1/users/{username}/usernameinfo/"] == 1
+    assert agent._session.closed and not thread.closed
+    thread.stop()
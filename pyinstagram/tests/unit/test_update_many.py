@@ -0,0 +1,91 @@
+import asyncio
+import time
+
+import pytest
+
+from pyinstagram.agents import AsyncWebAgent
+from pyinstagram.entities import Account
+
+
+def setup_function():
+    Account.clear_cache()
+
+
+class FakeAgent(AsyncWebAgent):
+    def __init__(self, delays):
+        super().__init__()
+        self.delays = delays
+        self.running = 0
+        self.max_running = 0
+        self.completed = 0
+
+    async def update(self, entity=None, settings=None, fields=None):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(self.delays[entity.username])
+            if entity.username == "broken":
+                raise KeyError("entry_data")
+            entity.updated_at = time.time()
+            return {"username": entity.username}
+        finally:
+            self.running -= 1
+            self.completed += 1
+
+
+@pytest.mark.asyncio
+async def test_update_many_completion_order_and_errors():
+    agent = FakeAgent({"slow": 0.03, "broken": 0.01, "fast": 0, "other": 0.05})
+    accounts = [Account(name) for name in ("slow", "broken", "fast", "other")]
+
+    results = [result async for result in agent.update_many(accounts, concurrency=2)]
+    await agent.close()
+
+    assert [entity.username for entity, _, _ in results] == ["broken", "fast", "slow", "other"]
+    assert isinstance(results[0][2], KeyError) and results[0][1] is None
+    assert results[1][1] == {"username": "fast"} and results[1][2] is None
+    assert agent.max_running == 2
+
+
+@pytest.mark.asyncio
+async def test_update_many_skips_fresh_entities():
+    agent = FakeAgent({"fresh": 0, "stale": 0, "new": 0})
+    fresh, stale, new = Account("fresh"), Account("stale"), Account("new")
+    fresh.updated_at = time.time()
+    stale.updated_at = time.time() - 3600
+
+    results = [result async for result in agent.update_many([fresh, stale, new], fresh=60)]
+    await agent.close()
+
+    assert sorted(entity.username for entity, _, _ in results) == ["new", "stale"]
+    with pytest.raises(ValueError):
+        await agent.update_many([], concurrency=0).__anext__()
+
+
+@pytest.mark.asyncio
+async def test_map_keeps_a_bounded_window_of_tasks():
+    agent = FakeAgent({"user%d" % index: 0.01 * (index % 3) for index in range(20)})
+
+    def accounts():
+        for index in range(20):
+            assert agent.completed >= index - 3
+            yield Account("user%d" % index)
+
+    results = await agent.map_update(accounts(), workers=3)
+    await agent.close()
+
+    assert [data["username"] for data in results] == ["user%d" % index for index in range(20)]
+    assert agent.max_running == 3
+
+
+@pytest.mark.asyncio
+async def test_map_cancels_pending_tasks_on_error():
+    agent = FakeAgent({"broken": 0, "slow": 1, "other": 1})
+    started = time.monotonic()
+    with pytest.raises(KeyError):
+        await agent.map_update([Account("slow"), Account("broken"), Account("other")], workers=2)
+    await asyncio.sleep(0)
+    await agent.close()
+
+    assert time.monotonic() - started < 0.5
+    assert agent.running == 0
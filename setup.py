@@ -12,6 +12,7 @@ setup(
     long_description=open(join(dirname(__file__), "README.md")).read(),
     packages=find_packages(),
     install_requires=["aiohttp"],
+    extras_require={"orjson": ["orjson"], "ujson": ["ujson"]},
     tests_require=["pytest", "pytest-asyncio", "pytest-random-order"],
     test_suite="pyinstagram.tests",
 )